@@ -0,0 +1,23 @@
+import hmac
+from typing import Optional
+from uuid import UUID
+
+from fastapi import Header, HTTPException
+
+from app.core.config import settings
+
+
+def get_current_user_id(x_user_id: str = Header(...)) -> UUID:
+    """Stub authentication - extracts user_id from header"""
+    try:
+        return UUID(x_user_id)
+    except (ValueError, AttributeError):
+        raise HTTPException(status_code=401, detail="Invalid user ID")
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Admin endpoints require X-Admin-Token to match ADMIN_TOKEN"""
+    if not settings.admin_token or x_admin_token is None or not hmac.compare_digest(
+        x_admin_token.encode(), settings.admin_token.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Admin token required")
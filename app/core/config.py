@@ -0,0 +1,182 @@
+"""
+Application settings.
+
+All configuration is read from environment variables (optionally via a
+.env file). Database engine tuning is grouped into per-environment
+profiles so dev, test and prod can differ without code changes.
+"""
+import os
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    """Connection pool and logging settings for a SQLAlchemy engine"""
+    echo: bool
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float  # Seconds to wait for a free connection
+    pool_recycle: int  # Seconds before a connection is replaced (-1 = never)
+    pool_pre_ping: bool
+    statement_timeout_ms: Optional[int]  # Postgres only; None = server default
+
+
+# Baseline profiles per environment. Individual values can be overridden
+# with DB_* environment variables (see _apply_overrides).
+ENGINE_PROFILES = {
+    "dev": EngineProfile(
+        echo=True,
+        pool_size=5,
+        max_overflow=5,
+        pool_timeout=30,
+        pool_recycle=-1,
+        pool_pre_ping=False,
+        statement_timeout_ms=None,
+    ),
+    "test": EngineProfile(
+        echo=False,
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=5,
+        pool_recycle=-1,
+        pool_pre_ping=False,
+        statement_timeout_ms=5000,
+    ),
+    "prod": EngineProfile(
+        echo=False,
+        pool_size=10,
+        max_overflow=10,
+        pool_timeout=10,
+        pool_recycle=1800,  # Below typical load balancer idle timeouts
+        pool_pre_ping=True,
+        statement_timeout_ms=15000,
+    ),
+}
+
+
+def _env_bool(name: str) -> Optional[bool]:
+    value = os.getenv(name)
+    if value is None:
+        return None
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: Optional[int] = None) -> Optional[int]:
+    """The variable as an int, or default when unset/empty (an explicit 0 is kept)"""
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: Optional[float] = None) -> Optional[float]:
+    """The variable as a float, or default when unset/empty (an explicit 0 is kept)"""
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _positive(name: str, value):
+    """Reject settings where 0 or less would stall or spin a loop"""
+    if value <= 0:
+        raise RuntimeError(f"{name} must be greater than 0, got {value}")
+    return value
+
+
+def _env_int_list(name: str, default: tuple[int, ...]) -> tuple[int, ...]:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return tuple(int(part) for part in value.split(",") if part.strip())
+
+
+def _apply_overrides(profile: EngineProfile) -> EngineProfile:
+    """Apply DB_* environment overrides on top of a profile"""
+    overrides = {
+        "echo": _env_bool("DB_ECHO"),
+        "pool_size": _env_int("DB_POOL_SIZE"),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW"),
+        "pool_timeout": _env_float("DB_POOL_TIMEOUT"),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE"),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING"),
+        "statement_timeout_ms": _env_int("DB_STATEMENT_TIMEOUT_MS"),
+    }
+    return replace(profile, **{k: v for k, v in overrides.items() if v is not None})
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Process-wide settings resolved once at import time"""
+    environment: str
+    database_url: Optional[str]
+    engine_profile: EngineProfile
+    db_session_mode: str  # "sync" (threadpool) or "async" (AsyncSession)
+    database_replica_url: Optional[str]  # Optional read replica for list/get endpoints
+    replica_read_your_writes_seconds: float  # Pin a user to the primary after writes
+    alerts_enabled: bool  # Run the expiry alert scheduler in this process (enable in one worker only)
+    expiry_alert_days: tuple[int, ...]  # Default days-before-expiry to alert at
+    expiry_alert_hour_utc: int  # Hour of day (UTC) alerts are sent
+    alert_resync_seconds: int  # Full reload of alert state from the database
+    alert_notifier: str  # Notifier backend, see app.services.alerts.notifiers
+    recipes_path: Optional[str]  # Recipe corpus JSON; None = bundled sample corpus
+    draft_ttl_days: int  # Drafts untouched this long are purged (0 = never)
+    draft_purge_batch_size: int  # Rows deleted per transaction
+    draft_purge_interval_seconds: int  # Pause between purge runs
+    expiry_prediction_cache_size: int  # Cached predictions per process (0 = off)
+    expiry_strategy_budget_ms: float  # Default per-strategy deadline when comparing
+    expiry_model_path: Optional[str]  # Trained regression model; None = bundled data dir
+    shelf_life_rules_path: Optional[str]  # External shelf-life rule file; None = built-in rules
+    rules_reload_seconds: int  # How often the rule file is checked for changes
+    admin_token: Optional[str]  # Shared secret for admin endpoints; None = admin endpoints disabled
+    user_adjustment_refresh_seconds: float  # Trust cached per-user shelf-life adjustments this long
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        environment = os.getenv("APP_ENV", "dev").strip().lower()
+        if environment not in ENGINE_PROFILES:
+            raise RuntimeError(
+                f"Unknown APP_ENV '{environment}'. "
+                f"Expected one of: {', '.join(ENGINE_PROFILES)}"
+            )
+
+        db_session_mode = os.getenv("DB_SESSION_MODE", "sync").strip().lower()
+        if db_session_mode not in ("sync", "async"):
+            raise RuntimeError(
+                f"Unknown DB_SESSION_MODE '{db_session_mode}'. Expected 'sync' or 'async'"
+            )
+
+        alert_hour = _env_int("EXPIRY_ALERT_HOUR_UTC", 9)
+        if not 0 <= alert_hour <= 23:
+            raise RuntimeError(f"EXPIRY_ALERT_HOUR_UTC must be 0-23, got {alert_hour}")
+
+        return cls(
+            environment=environment,
+            database_url=os.getenv("DATABASE_URL"),
+            engine_profile=_apply_overrides(ENGINE_PROFILES[environment]),
+            db_session_mode=db_session_mode,
+            database_replica_url=os.getenv("DATABASE_REPLICA_URL") or None,
+            replica_read_your_writes_seconds=_env_float("REPLICA_READ_YOUR_WRITES_SECONDS", 5.0),
+            alerts_enabled=_env_bool("ALERTS_ENABLED") is True,
+            expiry_alert_days=_env_int_list("EXPIRY_ALERT_DAYS", (3, 1, 0)),
+            expiry_alert_hour_utc=alert_hour,
+            alert_resync_seconds=_positive("ALERT_RESYNC_SECONDS", _env_int("ALERT_RESYNC_SECONDS", 3600)),
+            alert_notifier=os.getenv("ALERT_NOTIFIER", "log").strip().lower(),
+            recipes_path=os.getenv("RECIPES_PATH") or None,
+            draft_ttl_days=_env_int("DRAFT_TTL_DAYS", 30),
+            draft_purge_batch_size=_positive("DRAFT_PURGE_BATCH_SIZE", _env_int("DRAFT_PURGE_BATCH_SIZE", 500)),
+            draft_purge_interval_seconds=_positive(
+                "DRAFT_PURGE_INTERVAL_SECONDS", _env_int("DRAFT_PURGE_INTERVAL_SECONDS", 3600)
+            ),
+            expiry_prediction_cache_size=_env_int("EXPIRY_PREDICTION_CACHE_SIZE", 10_000),
+            expiry_strategy_budget_ms=_env_float("EXPIRY_STRATEGY_BUDGET_MS", 50.0),
+            expiry_model_path=os.getenv("EXPIRY_MODEL_PATH") or None,
+            shelf_life_rules_path=os.getenv("SHELF_LIFE_RULES_PATH") or None,
+            rules_reload_seconds=_positive("RULES_RELOAD_SECONDS", _env_int("RULES_RELOAD_SECONDS", 30)),
+            admin_token=os.getenv("ADMIN_TOKEN") or None,
+            user_adjustment_refresh_seconds=_env_float("USER_ADJUSTMENT_REFRESH_SECONDS", 30.0),
+        )
+
+
+settings = Settings.from_env()
@@ -1,29 +1,398 @@
-import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+from uuid import UUID
+
+from fastapi import Depends
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from dotenv import load_dotenv
+from starlette.concurrency import run_in_threadpool
 
-load_dotenv()
+from app.core.auth import get_current_user_id
+from app.core.config import settings, EngineProfile
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_URL = settings.database_url
 
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL is not set")
 
-engine = create_engine(DATABASE_URL, echo=True)
+# Async drivers used when DB_SESSION_MODE=async
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Rewrite a sync database URL to use the matching async driver"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver configured for '{backend}'")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(
+        hide_password=False
+    )
+
+
+def engine_kwargs(url: str, profile: EngineProfile) -> dict:
+    """
+    Translate an engine profile into create_engine() keyword arguments.
+
+    SQLite (used for local tests) does not support server-side pool sizing
+    or statement timeouts, so only the options it understands are passed.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+
+    if backend == "sqlite":
+        return {
+            "echo": profile.echo,
+            "connect_args": {"check_same_thread": False},
+        }
+
+    kwargs = {
+        "echo": profile.echo,
+        "pool_size": profile.pool_size,
+        "max_overflow": profile.max_overflow,
+        "pool_timeout": profile.pool_timeout,
+        "pool_recycle": profile.pool_recycle,
+        "pool_pre_ping": profile.pool_pre_ping,
+    }
+    if backend == "postgresql" and profile.statement_timeout_ms is not None:
+        if parsed.get_driver_name() == "asyncpg":
+            kwargs["connect_args"] = {
+                "server_settings": {"statement_timeout": str(profile.statement_timeout_ms)}
+            }
+        else:
+            kwargs["connect_args"] = {
+                "options": f"-c statement_timeout={profile.statement_timeout_ms}"
+            }
+    return kwargs
+
 
+class PoolMetrics:
+    """
+    Live connection pool statistics for capacity planning.
+
+    Checked-out/overflow counts come straight from the pool; wait time is
+    measured around connection acquisition when a session is opened, which
+    is where a request blocks when the pool is exhausted.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._checkouts += 1
+            self._wait_total += seconds
+            self._wait_max = max(self._wait_max, seconds)
+
+    def snapshot(self) -> dict:
+        pool = self.engine.pool
+        with self._lock:
+            checkouts = self._checkouts
+            wait_total = self._wait_total
+            wait_max = self._wait_max
+
+        return {
+            "pool_class": type(pool).__name__,
+            # Not every pool implementation (e.g. SQLite's) tracks these
+            "size": pool.size() if hasattr(pool, "size") else None,
+            "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+            "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+            "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+            "checkouts": checkouts,
+            "wait_avg_ms": (wait_total / checkouts * 1000) if checkouts else 0.0,
+            "wait_max_ms": wait_max * 1000,
+        }
+
+
+engine = create_engine(DATABASE_URL, **engine_kwargs(DATABASE_URL, settings.engine_profile))
+
+# expire_on_commit=False matches the async session: objects returned by
+# RETURNING stay usable after commit without a reload per row.
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False,
     bind=engine
 )
 
+# The async engine is only created in async mode so the async driver
+# (asyncpg) is not required for sync deployments.
+if settings.db_session_mode == "async":
+    ASYNC_DATABASE_URL = async_database_url(DATABASE_URL)
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        **engine_kwargs(ASYNC_DATABASE_URL, settings.engine_profile)
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        autoflush=False,
+        expire_on_commit=False
+    )
+    pool_metrics = PoolMetrics(async_engine.sync_engine)
+else:
+    async_engine = None
+    AsyncSessionLocal = None
+    pool_metrics = PoolMetrics(engine)
+
 Base = declarative_base()
 
 
+class _StreamResultAdapter:
+    """Async iteration over a sync Result, one partition per threadpool hop"""
+
+    def __init__(self, result):
+        self._result = result
+
+    async def partitions(self, size: Optional[int] = None):
+        iterator = self._result.partitions(size)
+        while True:
+            partition = await run_in_threadpool(next, iterator, None)
+            if partition is None:
+                break
+            yield partition
+
+
+class SyncSessionAdapter:
+    """
+    Exposes a sync Session through the awaitable AsyncSession interface.
+
+    Routers are written once against the AsyncSession API. In sync mode
+    each database call is pushed to the threadpool so the event loop is
+    never blocked by psycopg2, matching what FastAPI does for `def` routes.
+    """
+
+    def __init__(self, session):
+        self.sync_session = session
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances) -> None:
+        self.sync_session.add_all(instances)
+
+    def get_bind(self):
+        return self.sync_session.get_bind()
+
+    async def connection(self):
+        return await run_in_threadpool(self.sync_session.connection)
+
+    @staticmethod
+    def _buffered(kwargs: dict) -> dict:
+        # Fetch all rows inside the worker thread, as AsyncSession does;
+        # otherwise .all() would read from the cursor on the event loop.
+        options = dict(kwargs.pop("execution_options", None) or {})
+        options["prebuffer_rows"] = True
+        return {**kwargs, "execution_options": options}
+
+    async def execute(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(
+            self.sync_session.execute, statement, params, **self._buffered(kwargs)
+        )
+
+    async def scalar(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, params, **kwargs)
+
+    async def scalars(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(
+            self.sync_session.scalars, statement, params, **self._buffered(kwargs)
+        )
+
+    async def stream(self, statement, params=None, **kwargs):
+        """Server-side cursor result; rows are fetched as partitions are consumed"""
+        result = await run_in_threadpool(
+            self.sync_session.execute,
+            statement.execution_options(stream_results=True),
+            params,
+            **kwargs
+        )
+        return _StreamResultAdapter(result)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def delete(self, instance) -> None:
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def refresh(self, instance) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+
+class ReadRouting:
+    """
+    Routes read-only sessions to an optional replica.
+
+    Replicas lag the primary, so a user who has just written (created,
+    confirmed, updated or deleted something) is pinned to the primary for
+    a short window; otherwise a freshly confirmed item could vanish from
+    the list they are redirected to. The window is tracked per process,
+    so it protects the common case of a client talking to one worker.
+    """
+
+    # Forget writers older than the window once this many are tracked
+    PRUNE_THRESHOLD = 10_000
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self.engine = None
+        self._session_factory = None
+        self._recent_writes: dict[UUID, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._session_factory is not None
+
+    def configure(self, url: Optional[str]) -> None:
+        """Point read-only sessions at a replica URL (None disables routing)"""
+        if self.engine is not None:
+            self.engine.dispose()
+        self.engine = None
+        self._session_factory = None
+        if not url:
+            return
+
+        if settings.db_session_mode == "async":
+            async_url = async_database_url(url)
+            async_replica = create_async_engine(
+                async_url, **engine_kwargs(async_url, settings.engine_profile)
+            )
+            self.engine = async_replica.sync_engine
+            factory = async_sessionmaker(async_replica, autoflush=False, expire_on_commit=False)
+            self._session_factory = factory
+        else:
+            self.engine = create_engine(url, **engine_kwargs(url, settings.engine_profile))
+            factory = sessionmaker(
+                autocommit=False, autoflush=False, expire_on_commit=False, bind=self.engine
+            )
+            self._session_factory = lambda: SyncSessionAdapter(factory())
+
+    def mark_write(self, user_id: UUID) -> None:
+        """Record that a user wrote to the primary just now"""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._recent_writes[user_id] = now
+            if len(self._recent_writes) > self.PRUNE_THRESHOLD:
+                cutoff = now - self.window_seconds
+                self._recent_writes = {
+                    uid: ts for uid, ts in self._recent_writes.items() if ts >= cutoff
+                }
+
+    def use_replica(self, user_id: Optional[UUID]) -> bool:
+        """True if reads for this user may be served by the replica"""
+        if not self.enabled:
+            return False
+        if user_id is None:
+            return True
+        with self._lock:
+            last_write = self._recent_writes.get(user_id)
+        return last_write is None or time.monotonic() - last_write > self.window_seconds
+
+    def open_session(self):
+        return self._session_factory()
+
+
+read_routing = ReadRouting(settings.replica_read_your_writes_seconds)
+read_routing.configure(settings.database_replica_url)
+
+
+def mark_user_write(user_id: UUID) -> None:
+    """Pin the user's reads to the primary for the read-your-writes window"""
+    read_routing.mark_write(user_id)
+
+
+@asynccontextmanager
+async def session_scope(read_only: bool = False, user_id: Optional[UUID] = None):
+    """
+    Open a database session for the configured DB_SESSION_MODE.
+
+    Yields an AsyncSession in async mode, or a SyncSessionAdapter wrapping
+    a regular Session in sync mode. Both expose the same awaitable API.
+
+    With read_only=True the session may be served by the read replica,
+    unless the user wrote recently (see ReadRouting).
+    """
+    use_replica = read_only and read_routing.use_replica(user_id)
+    if use_replica:
+        db = read_routing.open_session()
+    elif AsyncSessionLocal is not None:
+        db = AsyncSessionLocal()
+    else:
+        db = SyncSessionAdapter(SessionLocal())
+
+    try:
+        # Acquire the connection up front so pool wait time is measurable
+        start = time.perf_counter()
+        await db.connection()
+        if not use_replica:
+            pool_metrics.record_wait(time.perf_counter() - start)
+        yield db
+    finally:
+        await db.close()
+
+
+async def get_session():
+    """FastAPI dependency yielding a session for the configured mode"""
+    async with session_scope() as db:
+        yield db
+
+
+async def get_read_db(user_id: UUID = Depends(get_current_user_id)):
+    """
+    FastAPI dependency for read-only endpoints.
+    Uses the replica when configured, except right after the user's own writes.
+    """
+    async with session_scope(read_only=True, user_id=user_id) as db:
+        yield db
+
+
 def get_db():
+    """Plain synchronous session, for scripts and sync-only code paths"""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def dialect_insert(db):
+    """
+    The dialect-specific INSERT (with on_conflict_do_update) for the
+    session's database, for upserts
+    """
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise RuntimeError(f"No upsert support for dialect '{dialect_name}'")
+    return insert
@@ -0,0 +1,103 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Pages are ordered by a unique column tuple such as (expiry_date, id). The
+cursor is an opaque base64 token holding the sort key of the last row on
+the previous page, so fetching the next page is an index range scan
+(`WHERE (expiry_date, id) > (:d, :id) ORDER BY expiry_date, id LIMIT n`)
+instead of an OFFSET that re-reads every skipped row.
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Select, tuple_
+
+# Response header carrying the cursor for the next page (absent on last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client sends a cursor that cannot be decoded"""
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode a row's sort key as an opaque, URL-safe cursor"""
+    payload = json.dumps([_to_json(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, parsers: Sequence[Callable[[Any], Any]]) -> tuple:
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Args:
+        cursor: Opaque cursor from the client
+        parsers: One callable per sort column converting the JSON value back
+                 (e.g. date.fromisoformat, UUID)
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError("cursor has wrong shape")
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(str(e)) from e
+
+
+def apply_keyset(
+    query: Select,
+    order_columns: Sequence[Any],
+    after: Optional[tuple],
+    limit: Optional[int]
+) -> Select:
+    """
+    Order a query by the keyset columns and seek past the previous page.
+
+    Fetches one extra row so split_page() can tell whether a next page exists.
+    """
+    if after is not None:
+        bound = tuple_(*after, types=[column.type for column in order_columns])
+        query = query.where(tuple_(*order_columns) > bound)
+
+    query = query.order_by(*order_columns)
+
+    if limit is not None:
+        query = query.limit(limit + 1)
+
+    return query
+
+
+def split_page(
+    rows: Sequence[Any],
+    limit: Optional[int],
+    sort_key: Callable[[Any], Sequence[Any]]
+) -> tuple[list, Optional[str]]:
+    """
+    Trim the look-ahead row and build the next cursor.
+
+    Returns:
+        (rows for this page, cursor for the next page or None)
+    """
+    rows = list(rows)
+    if limit is None or len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor(sort_key(rows[-1]))
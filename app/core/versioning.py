@@ -0,0 +1,80 @@
+"""
+Per-user collection versions and ETags for conditional GET.
+
+Each user row carries an inventory_version and a drafts_version. Every
+write to those collections bumps the matching counter inside the same
+transaction, so the version changes exactly when the list contents do.
+List endpoints expose it as an ETag and answer If-None-Match with 304
+after a single primary-key lookup, without loading any rows.
+
+shelf_life_version works the same way for per-user shelf-life
+adjustments, which workers cache in memory (see
+app.services.expiry_prediction.personalization).
+"""
+from typing import Collection, Optional
+from uuid import UUID
+
+from sqlalchemy import select, update
+
+from app.models.user import User
+
+INVENTORY = "inventory"
+DRAFTS = "drafts"
+SHELF_LIFE = "shelf_life"
+
+_VERSION_COLUMNS = {
+    INVENTORY: User.inventory_version,
+    DRAFTS: User.drafts_version,
+    SHELF_LIFE: User.shelf_life_version,
+}
+
+
+async def bump_versions(db, user_id: UUID, *collections: str) -> None:
+    """Increment the given collection versions (call before commit)"""
+    await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values({
+            _VERSION_COLUMNS[name]: _VERSION_COLUMNS[name] + 1
+            for name in collections
+        })
+    )
+
+
+async def bump_versions_for_users(db, user_ids: Collection[UUID], *collections: str) -> None:
+    """Increment collection versions for several users in one statement"""
+    if not user_ids:
+        return
+    await db.execute(
+        update(User)
+        .where(User.id.in_(sorted(user_ids)))
+        .values({
+            _VERSION_COLUMNS[name]: _VERSION_COLUMNS[name] + 1
+            for name in collections
+        })
+    )
+
+
+async def get_version(db, user_id: UUID, collection: str) -> Optional[int]:
+    """Current version of a collection, or None if the user row is missing"""
+    return await db.scalar(
+        select(_VERSION_COLUMNS[collection]).where(User.id == user_id)
+    )
+
+
+def make_etag(collection: str, version: int) -> str:
+    # Weak: the same version may be serialized differently (e.g. paging)
+    return f'W/"{collection}-{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or opaque(etag) in {opaque(tag) for tag in candidates}
@@ -1,16 +1,36 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Depends
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
-from app.core.database import engine, Base, get_db
-from app.models import user, draft_item, inventory_item  # noqa: F401
-from app.routers import draft_items, inventory_items, expiry_prediction, ingestion
+from app.core.config import settings
+from app.core.database import engine, Base, get_db, pool_metrics
+from app.models import user, draft_item, inventory_item, inventory_summary, inventory_event, shelf_life_adjustment  # noqa: F401
+from app.routers import draft_items, inventory_items, expiry_prediction, ingestion, insights, alerts, recipes
+from app.services.alerts import alert_scheduler
+from app.services.expiry_prediction import expiry_prediction_service, rules_reloader
+from app.services.expiry_prediction.personalization import user_adjustments
+from app.services.maintenance.draft_purge import draft_purger
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.alerts_enabled:
+        await alert_scheduler.start()
+    draft_purger.start()
+    rules_reloader.start()
+    yield
+    await rules_reloader.stop()
+    await draft_purger.stop()
+    await alert_scheduler.stop()
 
 
 app = FastAPI(
     title="SnapShelf Backend",
     version="0.1.0",
-    description="AI-assisted food waste reduction through trusted inventory management"
+    description="AI-assisted food waste reduction through trusted inventory management",
+    lifespan=lifespan
 )
 
 # Register routers
@@ -18,6 +38,9 @@ app.include_router(draft_items.router, prefix="/api")
 app.include_router(inventory_items.router, prefix="/api")
 app.include_router(expiry_prediction.router, prefix="/api")
 app.include_router(ingestion.router, prefix="/api")
+app.include_router(insights.router, prefix="/api")
+app.include_router(alerts.router, prefix="/api")
+app.include_router(recipes.router, prefix="/api")
 
 
 @app.get("/health")
@@ -29,3 +52,34 @@ def db_test(db: Session = Depends(get_db)):
     result = db.execute(text("SELECT 1")).scalar()
     return {"db_response": result}
 
+
+@app.get("/health/db-pool")
+def db_pool_stats():
+    """Connection pool statistics for sizing pools against worker count"""
+    return {
+        "environment": settings.environment,
+        "pool": pool_metrics.snapshot(),
+    }
+
+
+@app.get("/health/alerts")
+def alert_scheduler_stats():
+    """Expiry alert scheduler state (heap size, fired alerts, resyncs)"""
+    return alert_scheduler.snapshot()
+
+
+@app.get("/health/expiry-prediction")
+def expiry_prediction_cache_stats():
+    """Expiry prediction cache, strategy latency, rule file and per-user adjustment state"""
+    return {
+        "cache": expiry_prediction_service.cache_stats(),
+        "strategies": expiry_prediction_service.strategy_stats(),
+        "rules": rules_reloader.snapshot(),
+        "user_adjustments": user_adjustments.snapshot(),
+    }
+
+
+@app.get("/health/draft-purge")
+def draft_purge_stats():
+    """Stale draft purge settings and the outcome of its last run"""
+    return draft_purger.snapshot()
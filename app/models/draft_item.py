@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Numeric, Date, Float, Text, ForeignKey
+from sqlalchemy import Column, String, DateTime, Numeric, Date, Float, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -11,6 +11,12 @@ class DraftItem(Base):
     Must be explicitly promoted to InventoryItem by user confirmation.
     """
     __tablename__ = "draft_items"
+    __table_args__ = (
+        # Keyset pagination: WHERE user_id = ? AND (created_at, id) > (?, ?)
+        Index("ix_draft_items_user_created_id", "user_id", "created_at", "id"),
+        # Stale draft purge: WHERE updated_at < cutoff ORDER BY updated_at LIMIT n
+        Index("ix_draft_items_updated_at", "updated_at"),
+    )
 
     # Identity
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, String, DateTime, Numeric, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+from app.core.database import Base
+
+
+class InventoryEvent(Base):
+    """
+    Append-only history of inventory quantity changes and removals.
+
+    Written in the same transaction as quantity updates and deletes, so
+    consumption and waste can be analysed after the item itself is gone.
+    Item fields are copied in because the item row may no longer exist.
+    Rows are never updated or deleted (except with the owning user).
+    """
+    __tablename__ = "inventory_events"
+    __table_args__ = (
+        # Insights load one user's events in time order
+        Index("ix_inventory_events_user_occurred", "user_id", "occurred_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    item_id = Column(UUID(as_uuid=True), nullable=False)  # No FK: the item may be deleted
+
+    # Snapshot of the item at the time of the event
+    category = Column(String, nullable=False)
+    storage_location = Column(String, nullable=False)
+    item_created_at = Column(DateTime(timezone=True), nullable=False)
+
+    reason = Column(String, nullable=False)  # "consumed", "wasted" or "adjusted"
+    quantity_before = Column(Numeric(10, 2), nullable=False)
+    quantity_after = Column(Numeric(10, 2), nullable=False)  # 0 when the item was deleted
+
+    occurred_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
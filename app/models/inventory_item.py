@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Numeric, Date, ForeignKey
+from sqlalchemy import Column, String, DateTime, Numeric, Date, ForeignKey, Index, SmallInteger
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -12,6 +12,10 @@ class InventoryItem(Base):
     Used for alerts, analytics, and recipe recommendations.
     """
     __tablename__ = "inventory_items"
+    __table_args__ = (
+        # Keyset pagination: WHERE user_id = ? AND (expiry_date, id) > (?, ?)
+        Index("ix_inventory_items_user_expiry_id", "user_id", "expiry_date", "id"),
+    )
 
     # Identity
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
@@ -25,6 +29,9 @@ class InventoryItem(Base):
     storage_location = Column(String, nullable=False)  # e.g., "fridge", "pantry", "freezer"
     expiry_date = Column(Date, nullable=False)  # User-confirmed or accepted prediction
 
+    # Most urgent expiry alert threshold already sent (None = none yet)
+    alerted_days_before = Column(SmallInteger, nullable=True)
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     # Note: No updated_at - core fields are immutable after creation (except quantity)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class UserInventorySummary(Base):
+    """
+    Per-user item counts for the dashboard, one row per (dimension, key),
+    e.g. ("category", "dairy") or ("storage_location", "fridge").
+
+    Maintained incrementally in the same transaction as every inventory
+    write (see app.services.inventory_summary), so reading the dashboard
+    never scans inventory_items. Rows whose count drops to zero are kept
+    and filtered out on read.
+    """
+    __tablename__ = "user_inventory_summary"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    dimension = Column(String, primary_key=True)  # "category" or "storage_location"
+    key = Column(String, primary_key=True)
+    item_count = Column(Integer, nullable=False, default=0)
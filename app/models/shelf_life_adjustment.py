@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, Integer, Float, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class UserShelfLifeAdjustment(Base):
+    """
+    How many days later (positive) or earlier than predicted a user's
+    food actually expires, per (category, storage_location).
+
+    A running mean over the user's confirmed expiry dates, updated in the
+    same transaction as each confirmation (see
+    app.services.expiry_prediction.personalization). Keys are the
+    canonical rule labels, so "Refrigerator" and "fridge" share a row.
+    """
+    __tablename__ = "user_shelf_life_adjustments"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    category = Column(String, primary_key=True)
+    storage_location = Column(String, primary_key=True)
+    mean_offset_days = Column(Float, nullable=False, default=0.0)
+    samples = Column(Integer, nullable=False, default=0)
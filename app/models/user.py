@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Integer, JSON
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -11,3 +11,15 @@ class User(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Collection versions, bumped in the same transaction as every write to
+    # the user's inventory/drafts. Exposed as ETags on the list endpoints.
+    inventory_version = Column(Integer, nullable=False, default=0, server_default="0")
+    drafts_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Bumped whenever the user's shelf-life adjustments change, so every
+    # worker can tell its cached copy is stale with one primary-key lookup
+    shelf_life_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Days before expiry to send alerts at, e.g. [3, 1, 0]; NULL = app default
+    expiry_alert_days = Column(JSON(none_as_null=True), nullable=True)
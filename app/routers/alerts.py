@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+
+from app.core.auth import get_current_user_id
+from app.core.database import get_session
+from app.models.user import User
+from app.schemas.alerts import AlertSettingsResponse, AlertSettingsUpdate
+from app.services.alerts import MAX_ALERT_DAYS, alert_scheduler, normalize_alert_days
+
+router = APIRouter(prefix="/alerts", tags=["alerts"])
+
+
+def _settings_response(days) -> AlertSettingsResponse:
+    if days is None:
+        return AlertSettingsResponse(
+            expiry_alert_days=list(alert_scheduler.default_days), is_default=True
+        )
+    return AlertSettingsResponse(expiry_alert_days=list(days), is_default=False)
+
+
+@router.get("/settings", response_model=AlertSettingsResponse)
+async def get_alert_settings(
+    db: AsyncSession = Depends(get_session),
+    user_id: UUID = Depends(get_current_user_id)
+):
+    """Alert thresholds (days before expiry) for the current user"""
+    days = await db.scalar(select(User.expiry_alert_days).where(User.id == user_id))
+    return _settings_response(days)
+
+
+@router.put("/settings", response_model=AlertSettingsResponse)
+async def update_alert_settings(
+    alert_settings: AlertSettingsUpdate,
+    db: AsyncSession = Depends(get_session),
+    user_id: UUID = Depends(get_current_user_id)
+):
+    """
+    Set the user's alert thresholds. Already scheduled alerts for their
+    items are rescheduled immediately.
+    """
+    days = None
+    if alert_settings.expiry_alert_days is not None:
+        try:
+            days = normalize_alert_days(alert_settings.expiry_alert_days)
+        except ValueError:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Alert days must be between 0 and {MAX_ALERT_DAYS}"
+            )
+
+    updated_id = await db.scalar(
+        update(User)
+        .where(User.id == user_id)
+        .values(expiry_alert_days=list(days) if days is not None else None)
+        .returning(User.id)
+    )
+    if not updated_id:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    await db.commit()
+    alert_scheduler.set_user_thresholds(user_id, days)
+
+    return _settings_response(days)
@@ -1,30 +1,76 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Body, Depends, File, Header, HTTPException, Query, Response, UploadFile
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import date, datetime, timezone
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.auth import get_current_user_id
+from app.core.database import get_session, get_read_db, mark_user_write
+from app.core.pagination import (
+    NEXT_CURSOR_HEADER,
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+    apply_keyset,
+    decode_cursor,
+    split_page
+)
+from app.core.versioning import DRAFTS, INVENTORY, SHELF_LIFE, bump_versions, etag_matches, get_version, make_etag
 from app.models.draft_item import DraftItem
 from app.models.inventory_item import InventoryItem
-from app.schemas.draft_item import DraftItemCreate, DraftItemUpdate, DraftItemResponse
+from app.schemas.draft_item import (
+    DraftItemCreate,
+    DraftItemUpdate,
+    DraftItemResponse,
+    DraftItemConfirmation,
+    DraftItemBatchError,
+    DraftItemBatchConfirmResponse,
+    DraftItemImportResponse
+)
 from app.schemas.inventory_item import InventoryItemCreate, InventoryItemResponse
+from app.services.alerts import alert_scheduler
 from app.services.expiry_prediction import expiry_prediction_service
+from app.services.expiry_prediction.personalization import user_adjustments
+from app.services.ingestion.draft_enrichment import apply_prediction, predict_missing_expiry
+from app.services.ingestion.file_import import IMPORT_FORMATS, detect_format, import_drafts
+from app.services.inventory_summary import apply_summary_deltas, summary_deltas
 
 router = APIRouter(prefix="/draft-items", tags=["draft-items"])
 
+# Upper bound on drafts per batch request (a large receipt is ~60 lines)
+MAX_DRAFT_BATCH_SIZE = 200
 
-def get_current_user_id(x_user_id: str = Header(...)) -> UUID:
-    """Stub authentication - extracts user_id from header"""
-    try:
-        return UUID(x_user_id)
-    except (ValueError, AttributeError):
-        raise HTTPException(status_code=401, detail="Invalid user ID")
+
+def _drafted_on(drafted_at: datetime) -> date:
+    """
+    The local calendar day a draft was created: the purchase date its
+    expiry was predicted from (predictions default to date.today())
+    """
+    if drafted_at.tzinfo is None:  # SQLite returns naive UTC
+        drafted_at = drafted_at.replace(tzinfo=timezone.utc)
+    return drafted_at.astimezone().date()
+
+
+def _observe(confirmation: InventoryItemCreate, drafted_at: datetime, shown_expiry: Optional[date]):
+    """
+    Offset of a confirmed expiry date from the shared prediction, taking
+    the day the draft was created as the purchase date. None if the user
+    kept the draft's date unchanged.
+    """
+    return expiry_prediction_service.observe_confirmation(
+        name=confirmation.name,
+        category=confirmation.category,
+        storage_location=confirmation.storage_location,
+        purchase_date=_drafted_on(drafted_at),
+        expiry_date=confirmation.expiry_date,
+        shown_expiry=shown_expiry
+    )
 
 
 @router.post("", response_model=DraftItemResponse, status_code=201)
-def create_draft_item(
+async def create_draft_item(
     draft: DraftItemCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     user_id: UUID = Depends(get_current_user_id),
     predict_expiry: bool = True
 ):
@@ -32,7 +78,8 @@ def create_draft_item(
     Create a new draft item (manual or AI-generated).
 
     If expiration_date is not provided and predict_expiry=True,
-    automatically predicts expiry date using the prediction service.
+    automatically predicts expiry date using the prediction service,
+    adjusted to the user's own confirmed expiry dates.
     """
     draft_data = draft.model_dump()
 
@@ -41,53 +88,230 @@ def create_draft_item(
         prediction = expiry_prediction_service.predict_expiry(
             name=draft_data["name"],
             category=draft_data.get("category"),
-            storage_location=draft_data.get("location")
+            storage_location=draft_data.get("location"),
+            adjustments=await user_adjustments.load(db, user_id)
         )
-
-        # Enrich draft with prediction
-        draft_data["expiration_date"] = prediction.expiry_date
-
-        # Update confidence if not set or lower than prediction
-        if draft_data.get("confidence_score") is None:
-            draft_data["confidence_score"] = prediction.confidence
-
-        # Add prediction source to notes if not already present
-        if draft_data.get("notes"):
-            draft_data["notes"] += f"\n[Auto-predicted: {prediction.reasoning}]"
-        else:
-            draft_data["notes"] = f"[Auto-predicted: {prediction.reasoning}]"
+        apply_prediction(draft_data, prediction)
 
     db_draft = DraftItem(
         user_id=user_id,
         **draft_data
     )
     db.add(db_draft)
-    db.commit()
-    db.refresh(db_draft)
+    await bump_versions(db, user_id, DRAFTS)
+    await db.commit()
+    mark_user_write(user_id)
+    await db.refresh(db_draft)
     return db_draft
 
 
+@router.post("/batch", response_model=List[DraftItemResponse], status_code=201)
+async def create_draft_items_batch(
+    drafts: List[DraftItemCreate] = Body(..., min_length=1, max_length=MAX_DRAFT_BATCH_SIZE),
+    db: AsyncSession = Depends(get_session),
+    user_id: UUID = Depends(get_current_user_id),
+    predict_expiry: bool = True
+):
+    """
+    Create many draft items at once (e.g. every line of a receipt).
+
+    Missing expiry dates are predicted for the whole batch in one call and
+    all drafts are written with a single multi-row INSERT ... RETURNING.
+    Drafts are returned in request order.
+    """
+    rows = [draft.model_dump() for draft in drafts]
+
+    if predict_expiry and any(row.get("expiration_date") is None for row in rows):
+        predict_missing_expiry(rows, await user_adjustments.load(db, user_id))
+
+    for row in rows:
+        row["user_id"] = user_id
+
+    created = await db.scalars(
+        insert(DraftItem).returning(DraftItem, sort_by_parameter_order=True),
+        rows
+    )
+    created = created.all()
+    await bump_versions(db, user_id, DRAFTS)
+    await db.commit()
+    mark_user_write(user_id)
+    return created
+
+
+@router.post("/import", response_model=DraftItemImportResponse)
+async def import_draft_items(
+    file: UploadFile = File(..., description="CSV (with header row) or NDJSON file of drafts"),
+    import_format: Optional[str] = Query(None, alias="format", description="csv | ndjson (default: from filename)"),
+    db: AsyncSession = Depends(get_session),
+    user_id: UUID = Depends(get_current_user_id),
+    predict_expiry: bool = True
+):
+    """
+    Bulk-import drafts from another app's export.
+
+    Columns/keys follow DraftItemCreate. The file is processed in chunks:
+    each is validated, expiry-predicted in one batch and written with COPY
+    (executemany on non-Postgres databases). Invalid rows are reported by
+    row number and skipped. Imported rows are drafts like any other and
+    still need confirmation.
+    """
+    import_format = import_format or detect_format(file.filename, file.content_type)
+    if import_format not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported import format. Use one of: {', '.join(IMPORT_FORMATS)}"
+        )
+
+    result = await import_drafts(db, user_id, file.file, import_format, predict_expiry)
+    if result.imported:
+        mark_user_write(user_id)
+
+    return DraftItemImportResponse(
+        imported=result.imported,
+        failed=result.failed,
+        errors=[{"row": e.row, "detail": e.detail} for e in result.errors]
+    )
+
+
+@router.post("/confirm-batch", response_model=DraftItemBatchConfirmResponse)
+async def confirm_draft_items_batch(
+    confirmations: List[DraftItemConfirmation] = Body(..., min_length=1, max_length=MAX_DRAFT_BATCH_SIZE),
+    db: AsyncSession = Depends(get_session),
+    user_id: UUID = Depends(get_current_user_id)
+):
+    """
+    SACRED OPERATION (batch): confirm many drafts and promote them to inventory.
+
+    Same invariant as confirm_draft_item: an InventoryItem is created only
+    for a draft that belongs to the user and is deleted in the same
+    transaction. Ownership is checked by the DELETE itself
+    (DELETE ... WHERE id IN (...) AND user_id = ... RETURNING id), so a draft
+    confirmed concurrently elsewhere can never be promoted twice. The
+    inventory rows are then written with one multi-row INSERT and everything
+    commits together.
+
+    Drafts that are missing, owned by someone else, or repeated in the
+    request are reported in `errors`; the rest are still confirmed. Each
+    confirmed expiry date also updates the user's shelf-life adjustments.
+    """
+    errors = []
+    pending = {}
+    for entry in confirmations:
+        if entry.draft_id in pending:
+            errors.append(DraftItemBatchError(
+                draft_id=entry.draft_id, detail="Duplicate draft_id in request"
+            ))
+        else:
+            pending[entry.draft_id] = entry.confirmation
+
+    # Delete owned drafts first; only drafts actually removed get promoted
+    drafted = {
+        draft_id: (created_at, expiration_date)
+        for draft_id, created_at, expiration_date in await db.execute(
+            delete(DraftItem)
+            .where(DraftItem.id.in_(pending), DraftItem.user_id == user_id)
+            .returning(DraftItem.id, DraftItem.created_at, DraftItem.expiration_date)
+        )
+    }
+
+    for draft_id in pending:
+        if draft_id not in drafted:
+            errors.append(DraftItemBatchError(draft_id=draft_id, detail="Draft item not found"))
+
+    confirmed = []
+    learned = False
+    promoted = [
+        (draft_id, confirmation)
+        for draft_id, confirmation in pending.items()
+        if draft_id in drafted
+    ]
+    if promoted:
+        confirmed = (await db.scalars(
+            insert(InventoryItem).returning(InventoryItem, sort_by_parameter_order=True),
+            [{"user_id": user_id, **confirmation.model_dump()} for _, confirmation in promoted]
+        )).all()
+        await bump_versions(db, user_id, DRAFTS, INVENTORY)
+        await apply_summary_deltas(db, user_id, summary_deltas(confirmed))
+        learned = await user_adjustments.record(db, user_id, [
+            _observe(confirmation, *drafted[draft_id]) for draft_id, confirmation in promoted
+        ])
+        if learned:
+            await bump_versions(db, user_id, SHELF_LIFE)
+
+    await db.commit()
+    mark_user_write(user_id)
+    if learned:
+        user_adjustments.invalidate(user_id)
+    for item in confirmed:
+        alert_scheduler.item_added(item)
+
+    return DraftItemBatchConfirmResponse(confirmed=confirmed, errors=errors)
+
+
 @router.get("", response_model=List[DraftItemResponse])
-def list_draft_items(
-    db: Session = Depends(get_db),
+async def list_draft_items(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size (omit for all drafts)"),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     user_id: UUID = Depends(get_current_user_id)
 ):
-    """List all draft items for the current user"""
-    drafts = db.query(DraftItem).filter(DraftItem.user_id == user_id).all()
+    """
+    List draft items for the current user, oldest first.
+
+    Keyset-paginated on (created_at, id): when more drafts remain, the
+    cursor for the next page is returned in the X-Next-Cursor header.
+
+    Responses carry an ETag derived from the user's drafts version; a
+    matching If-None-Match returns 304 without loading any drafts.
+    """
+    # Read the version before the rows: a concurrent write can only make
+    # the rows newer than the ETag, which just causes one extra refetch.
+    version = await get_version(db, user_id, DRAFTS)
+    if version is not None:
+        etag = make_etag(DRAFTS, version)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, (datetime.fromisoformat, UUID))
+        except InvalidCursorError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    query = apply_keyset(
+        select(DraftItem).where(DraftItem.user_id == user_id),
+        (DraftItem.created_at, DraftItem.id),
+        after,
+        limit
+    )
+    drafts, next_cursor = split_page(
+        (await db.scalars(query)).all(),
+        limit,
+        lambda draft: (draft.created_at, draft.id)
+    )
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return drafts
 
 
 @router.get("/{draft_id}", response_model=DraftItemResponse)
-def get_draft_item(
+async def get_draft_item(
     draft_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     user_id: UUID = Depends(get_current_user_id)
 ):
     """Get a specific draft item"""
-    draft = db.query(DraftItem).filter(
-        DraftItem.id == draft_id,
-        DraftItem.user_id == user_id
-    ).first()
+    draft = await db.scalar(
+        select(DraftItem).where(
+            DraftItem.id == draft_id,
+            DraftItem.user_id == user_id
+        )
+    )
 
     if not draft:
         raise HTTPException(status_code=404, detail="Draft item not found")
@@ -96,67 +320,85 @@ def get_draft_item(
 
 
 @router.patch("/{draft_id}", response_model=DraftItemResponse)
-def update_draft_item(
+async def update_draft_item(
     draft_id: UUID,
     updates: DraftItemUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     user_id: UUID = Depends(get_current_user_id)
 ):
-    """Update a draft item before confirmation"""
-    draft = db.query(DraftItem).filter(
-        DraftItem.id == draft_id,
-        DraftItem.user_id == user_id
-    ).first()
-
-    if not draft:
-        raise HTTPException(status_code=404, detail="Draft item not found")
+    """
+    Update a draft item before confirmation.
 
+    Single round-trip: UPDATE ... WHERE id AND user_id RETURNING *.
+    """
     # Update only provided fields
     update_data = updates.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(draft, field, value)
 
-    db.commit()
-    db.refresh(draft)
+    draft = await db.scalar(
+        update(DraftItem)
+        .where(
+            DraftItem.id == draft_id,
+            DraftItem.user_id == user_id
+        )
+        .values(**update_data, updated_at=func.now())
+        .returning(DraftItem)
+    )
+
+    if not draft:
+        raise HTTPException(status_code=404, detail="Draft item not found")
+
+    await bump_versions(db, user_id, DRAFTS)
+    await db.commit()
+    mark_user_write(user_id)
     return draft
 
 
 @router.delete("/{draft_id}", status_code=204)
-def delete_draft_item(
+async def delete_draft_item(
     draft_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     user_id: UUID = Depends(get_current_user_id)
 ):
     """Discard a draft item"""
-    draft = db.query(DraftItem).filter(
-        DraftItem.id == draft_id,
-        DraftItem.user_id == user_id
-    ).first()
+    deleted_id = await db.scalar(
+        delete(DraftItem)
+        .where(
+            DraftItem.id == draft_id,
+            DraftItem.user_id == user_id
+        )
+        .returning(DraftItem.id)
+    )
 
-    if not draft:
+    if not deleted_id:
         raise HTTPException(status_code=404, detail="Draft item not found")
 
-    db.delete(draft)
-    db.commit()
+    await bump_versions(db, user_id, DRAFTS)
+    await db.commit()
+    mark_user_write(user_id)
     return None
 
 
 @router.post("/{draft_id}/confirm", response_model=InventoryItemResponse, status_code=201)
-def confirm_draft_item(
+async def confirm_draft_item(
     draft_id: UUID,
     confirmation: InventoryItemCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     user_id: UUID = Depends(get_current_user_id)
 ):
     """
     SACRED OPERATION: Confirm a draft item and promote it to inventory.
     This is the core invariant of SnapShelf.
+
+    The draft is deleted (and so locked) before the user row is touched,
+    the same lock order as confirm_draft_items_batch and the stale draft
+    purge, so they cannot deadlock each other.
     """
-    # Verify draft exists and belongs to user
-    draft = db.query(DraftItem).filter(
-        DraftItem.id == draft_id,
-        DraftItem.user_id == user_id
-    ).first()
+    # Delete the draft if it exists and belongs to user
+    draft = (await db.execute(
+        delete(DraftItem)
+        .where(DraftItem.id == draft_id, DraftItem.user_id == user_id)
+        .returning(DraftItem.created_at, DraftItem.expiration_date)
+    )).first()
 
     if not draft:
         raise HTTPException(status_code=404, detail="Draft item not found")
@@ -169,10 +411,20 @@ def confirm_draft_item(
 
     db.add(inventory_item)
 
-    # Delete the draft (it's been confirmed)
-    db.delete(draft)
-
-    db.commit()
-    db.refresh(inventory_item)
+    await bump_versions(db, user_id, DRAFTS, INVENTORY)
+    await apply_summary_deltas(db, user_id, summary_deltas([inventory_item]))
+    # Learn from the confirmed date for this user's next predictions
+    learned = await user_adjustments.record(
+        db, user_id, [_observe(confirmation, draft.created_at, draft.expiration_date)]
+    )
+    if learned:
+        await bump_versions(db, user_id, SHELF_LIFE)
+
+    await db.commit()
+    mark_user_write(user_id)
+    if learned:
+        user_adjustments.invalidate(user_id)
+    await db.refresh(inventory_item)
+    alert_scheduler.item_added(inventory_item)
 
     return inventory_item
@@ -1,6 +1,11 @@
-from fastapi import APIRouter
+from typing import List
 
-from app.services.expiry_prediction import expiry_prediction_service
+from fastapi import APIRouter, Body, Depends, HTTPException
+
+from app.core.auth import require_admin
+from app.services.expiry_prediction import expiry_prediction_service, rules_reloader
+from app.services.expiry_prediction.rules_file import RuleFileError
+from app.services.expiry_prediction.strategies.base import ExpiryPredictionInput
 from app.schemas.expiry_prediction import (
     ExpiryPredictionRequest,
     ExpiryPredictionResponse
@@ -8,6 +13,9 @@ from app.schemas.expiry_prediction import (
 
 router = APIRouter(prefix="/expiry-prediction", tags=["expiry-prediction"])
 
+# Upper bound on items per batch request
+MAX_BATCH_SIZE = 10_000
+
 
 @router.post("", response_model=ExpiryPredictionResponse)
 def predict_expiry(request: ExpiryPredictionRequest):
@@ -35,3 +43,50 @@ def predict_expiry(request: ExpiryPredictionRequest):
         strategy_name=prediction.strategy_name,
         reasoning=prediction.reasoning
     )
+
+
+@router.post("/batch", response_model=List[ExpiryPredictionResponse])
+def predict_expiry_batch(
+    requests: List[ExpiryPredictionRequest] = Body(..., max_length=MAX_BATCH_SIZE)
+):
+    """
+    Predict expiry dates for many items in one call.
+
+    Predictions are returned in request order. Uses the default strategy's
+    batch path, which resolves shared (category, storage) keys once.
+    """
+    predictions = expiry_prediction_service.predict_expiry_batch([
+        ExpiryPredictionInput(
+            name=request.name,
+            category=request.category,
+            storage_location=request.storage_location,
+            purchase_date=request.purchase_date
+        )
+        for request in requests
+    ])
+
+    return [
+        ExpiryPredictionResponse(
+            expiry_date=prediction.expiry_date,
+            confidence=prediction.confidence,
+            strategy_name=prediction.strategy_name,
+            reasoning=prediction.reasoning
+        )
+        for prediction in predictions
+    ]
+
+
+@router.post("/rules/reload", dependencies=[Depends(require_admin)])
+def reload_rules():
+    """
+    Reload the shelf-life rule file now instead of waiting for the next
+    poll. An invalid file is rejected with 422 and the current rules stay
+    in use.
+    """
+    if not rules_reloader.enabled:
+        raise HTTPException(status_code=404, detail="No shelf-life rule file configured")
+    try:
+        rules_reloader.reload(force=True)
+    except RuleFileError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return rules_reloader.snapshot()
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Header, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from uuid import UUID
 from typing import Optional
 
-from app.core.database import get_db
+from app.core.auth import get_current_user_id
+from app.core.database import get_session, mark_user_write
+from app.core.versioning import DRAFTS, bump_versions
 from app.models.draft_item import DraftItem
 from app.schemas.draft_item import DraftItemResponse
 from app.services.ingestion.barcode_ingestion import barcode_ingestion_service
@@ -12,19 +15,11 @@ from app.services.ingestion.barcode_ingestion import barcode_ingestion_service
 router = APIRouter(prefix="/ingest", tags=["ingestion"])
 
 
-def get_current_user_id(x_user_id: str = Header(...)) -> UUID:
-    """Stub authentication - extracts user_id from header"""
-    try:
-        return UUID(x_user_id)
-    except (ValueError, AttributeError):
-        raise HTTPException(status_code=401, detail="Invalid user ID")
-
-
 @router.post("/barcode", response_model=DraftItemResponse, status_code=201)
 async def ingest_barcode(
     image: UploadFile = File(..., description="Image file containing barcode"),
     storage_location: str = Form("fridge", description="Where the item will be stored"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_session),
     user_id: UUID = Depends(get_current_user_id)
 ):
     """
@@ -54,8 +49,9 @@ async def ingest_barcode(
             detail=f"Failed to read image file: {str(e)}"
         )
 
-    # Process barcode
-    result = barcode_ingestion_service.ingest_from_image(
+    # Process barcode (blocking: ZXing subprocess + Open Food Facts HTTP call)
+    result = await run_in_threadpool(
+        barcode_ingestion_service.ingest_from_image,
         image_bytes=image_bytes,
         storage_location=storage_location
     )
@@ -94,7 +90,9 @@ async def ingest_barcode(
         **draft_data
     )
     db.add(db_draft)
-    db.commit()
-    db.refresh(db_draft)
+    await bump_versions(db, user_id, DRAFTS)
+    await db.commit()
+    mark_user_write(user_id)
+    await db.refresh(db_draft)
 
     return db_draft
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from app.core.auth import get_current_user_id
+from app.core.database import get_read_db
+from app.schemas.insights import CategoryInsightsResponse
+from app.services.insights import category_insights_from_rows, load_user_event_rows
+
+router = APIRouter(prefix="/insights", tags=["insights"])
+
+
+@router.get("/categories", response_model=CategoryInsightsResponse)
+async def get_category_insights(
+    days: Optional[int] = Query(None, ge=1, le=3650, description="Only consider the last N days (omit for all history)"),
+    db: AsyncSession = Depends(get_read_db),
+    user_id: UUID = Depends(get_current_user_id)
+):
+    """
+    Most wasted categories and consumption speed per category,
+    computed from the user's inventory event log.
+    """
+    since = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+    rows = await load_user_event_rows(db, user_id, since)
+    # Array conversion and NumPy work run off the event loop; long
+    # histories are ~1M events
+    categories = await run_in_threadpool(category_insights_from_rows, rows)
+    return {"categories": categories}
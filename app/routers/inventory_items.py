@@ -1,49 +1,176 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
+from datetime import date, timedelta
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.auth import get_current_user_id
+from app.core.database import get_session, get_read_db, mark_user_write
+from app.core.pagination import (
+    NEXT_CURSOR_HEADER,
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+    apply_keyset,
+    decode_cursor,
+    split_page
+)
+from app.core.versioning import INVENTORY, bump_versions, etag_matches, get_version, make_etag
 from app.models.inventory_item import InventoryItem
 from app.schemas.inventory_item import (
     InventoryItemResponse,
-    InventoryItemUpdateQuantity
+    InventoryItemUpdateQuantity,
+    ExpiringItemsResponse,
+    InventorySummaryResponse
 )
+from app.services.alerts import alert_scheduler
+from app.services.export import EXPORT_FORMATS, stream_inventory_export
+from app.services.insights import ADJUSTED, CONSUMED, record_event
+from app.services.inventory_summary import apply_summary_deltas, read_summary, summary_deltas
 
 router = APIRouter(prefix="/inventory", tags=["inventory"])
 
 
-def get_current_user_id(x_user_id: str = Header(...)) -> UUID:
-    """Stub authentication - extracts user_id from header"""
-    try:
-        return UUID(x_user_id)
-    except (ValueError, AttributeError):
-        raise HTTPException(status_code=401, detail="Invalid user ID")
-
-
 @router.get("", response_model=List[InventoryItemResponse])
-def list_inventory_items(
-    db: Session = Depends(get_db),
+async def list_inventory_items(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size (omit for all items)"),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     user_id: UUID = Depends(get_current_user_id)
 ):
-    """List all confirmed inventory items for the current user"""
-    items = db.query(InventoryItem).filter(
-        InventoryItem.user_id == user_id
-    ).order_by(InventoryItem.expiry_date).all()
+    """
+    List confirmed inventory items for the current user, soonest expiry first.
+
+    Keyset-paginated on (expiry_date, id): when more items remain, the
+    cursor for the next page is returned in the X-Next-Cursor header.
+
+    Responses carry an ETag derived from the user's inventory version; a
+    matching If-None-Match returns 304 without loading any items.
+    """
+    # Read the version before the rows: a concurrent write can only make
+    # the rows newer than the ETag, which just causes one extra refetch.
+    version = await get_version(db, user_id, INVENTORY)
+    if version is not None:
+        etag = make_etag(INVENTORY, version)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, (date.fromisoformat, UUID))
+        except InvalidCursorError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    query = apply_keyset(
+        select(InventoryItem).where(InventoryItem.user_id == user_id),
+        (InventoryItem.expiry_date, InventoryItem.id),
+        after,
+        limit
+    )
+    items, next_cursor = split_page(
+        (await db.scalars(query)).all(),
+        limit,
+        lambda item: (item.expiry_date, item.id)
+    )
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return items
 
 
+@router.get("/expiring", response_model=ExpiringItemsResponse)
+async def list_expiring_items(
+    within_days: int = Query(7, ge=0, le=365, description="Include items expiring up to this many days from today"),
+    db: AsyncSession = Depends(get_read_db),
+    user_id: UUID = Depends(get_current_user_id)
+):
+    """
+    Urgent items for the Home screen, bucketed by days until expiry.
+
+    Answered by a range scan on the (user_id, expiry_date, id) index:
+    only items expiring on or before today + within_days are read.
+    Already-expired items are included in the `expired` bucket.
+    """
+    today = date.today()
+    items = await db.scalars(
+        select(InventoryItem)
+        .where(
+            InventoryItem.user_id == user_id,
+            InventoryItem.expiry_date <= today + timedelta(days=within_days)
+        )
+        .order_by(InventoryItem.expiry_date, InventoryItem.id)
+    )
+
+    buckets = {"expired": [], "today": [], "tomorrow": [], "this_week": [], "later": []}
+    for item in items:
+        days_left = (item.expiry_date - today).days
+        if days_left < 0:
+            buckets["expired"].append(item)
+        elif days_left == 0:
+            buckets["today"].append(item)
+        elif days_left == 1:
+            buckets["tomorrow"].append(item)
+        elif days_left <= 7:
+            buckets["this_week"].append(item)
+        else:
+            buckets["later"].append(item)
+
+    return buckets
+
+
+@router.get("/summary", response_model=InventorySummaryResponse)
+async def get_inventory_summary(
+    db: AsyncSession = Depends(get_read_db),
+    user_id: UUID = Depends(get_current_user_id)
+):
+    """
+    Dashboard counts per category and storage location, total items and
+    earliest expiry.
+
+    Read from the incrementally maintained user_inventory_summary table
+    plus one index probe; inventory_items is never scanned.
+    """
+    return await read_summary(db, user_id)
+
+
+@router.get("/export")
+async def export_inventory_items(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    user_id: UUID = Depends(get_current_user_id)
+):
+    """
+    Stream the user's full inventory as NDJSON or CSV.
+
+    Rows come from a server-side cursor and are written as they are read,
+    so memory stays flat regardless of inventory size.
+    """
+    return StreamingResponse(
+        stream_inventory_export(user_id, export_format),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="inventory.{export_format}"'
+        }
+    )
+
+
 @router.get("/{item_id}", response_model=InventoryItemResponse)
-def get_inventory_item(
+async def get_inventory_item(
     item_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     user_id: UUID = Depends(get_current_user_id)
 ):
     """Get a specific inventory item"""
-    item = db.query(InventoryItem).filter(
-        InventoryItem.id == item_id,
-        InventoryItem.user_id == user_id
-    ).first()
+    item = await db.scalar(
+        select(InventoryItem).where(
+            InventoryItem.id == item_id,
+            InventoryItem.user_id == user_id
+        )
+    )
 
     if not item:
         raise HTTPException(status_code=404, detail="Inventory item not found")
@@ -52,49 +179,93 @@ def get_inventory_item(
 
 
 @router.patch("/{item_id}/quantity", response_model=InventoryItemResponse)
-def update_inventory_quantity(
+async def update_inventory_quantity(
     item_id: UUID,
-    update: InventoryItemUpdateQuantity,
-    db: Session = Depends(get_db),
+    quantity_update: InventoryItemUpdateQuantity,
+    reason: Literal["consumed", "wasted", "adjusted"] = Query(ADJUSTED, description="Why the quantity changed"),
+    db: AsyncSession = Depends(get_session),
     user_id: UUID = Depends(get_current_user_id)
 ):
     """
     Update quantity of an inventory item.
     Note: Other fields are immutable (PRD requirement)
+
+    A single WITH before AS (SELECT ... FOR UPDATE) UPDATE ... RETURNING
+    applies the change and returns the previous quantity, with ownership
+    checked in the CTE; no row means the item is missing or not owned by
+    the user. The change is then appended to the inventory event log with
+    the given reason.
+    Quantity does not affect the inventory summary counts, so the summary
+    is left untouched.
     """
-    item = db.query(InventoryItem).filter(
-        InventoryItem.id == item_id,
-        InventoryItem.user_id == user_id
-    ).first()
+    # Locks the row, so quantity_before is the value being replaced
+    before = (
+        select(InventoryItem.id, InventoryItem.quantity.label("quantity_before"))
+        .where(
+            InventoryItem.id == item_id,
+            InventoryItem.user_id == user_id
+        )
+        .with_for_update()
+        .cte("before")
+        .prefix_with("MATERIALIZED")
+    )
+    updated = (await db.execute(
+        update(InventoryItem)
+        .where(InventoryItem.id.in_(select(before.c.id)))
+        .values(quantity=quantity_update.quantity)
+        .returning(InventoryItem, select(before.c.quantity_before).scalar_subquery())
+        .execution_options(synchronize_session=False)
+    )).first()
 
-    if not item:
+    if not updated:
         raise HTTPException(status_code=404, detail="Inventory item not found")
+    item, quantity_before = updated
 
-    item.quantity = update.quantity
-    db.commit()
-    db.refresh(item)
+    await bump_versions(db, user_id, INVENTORY)
+    await record_event(db, user_id, item, reason, quantity_before, item.quantity)
+    await db.commit()
+    mark_user_write(user_id)
+    alert_scheduler.item_updated(item)
 
     return item
 
 
 @router.delete("/{item_id}", status_code=204)
-def delete_inventory_item(
+async def delete_inventory_item(
     item_id: UUID,
-    db: Session = Depends(get_db),
+    reason: Literal["consumed", "wasted"] = Query(CONSUMED, description="Whether the item was eaten or thrown away"),
+    db: AsyncSession = Depends(get_session),
     user_id: UUID = Depends(get_current_user_id)
 ):
     """
     Delete an inventory item (e.g., when consumed or thrown away)
+
+    The removal is appended to the inventory event log with the given
+    reason, so waste and consumption history outlive the item.
     """
-    item = db.query(InventoryItem).filter(
-        InventoryItem.id == item_id,
-        InventoryItem.user_id == user_id
-    ).first()
+    deleted = (await db.execute(
+        delete(InventoryItem)
+        .where(
+            InventoryItem.id == item_id,
+            InventoryItem.user_id == user_id
+        )
+        .returning(
+            InventoryItem.id,
+            InventoryItem.category,
+            InventoryItem.storage_location,
+            InventoryItem.quantity,
+            InventoryItem.created_at
+        )
+    )).first()
 
-    if not item:
+    if not deleted:
         raise HTTPException(status_code=404, detail="Inventory item not found")
 
-    db.delete(item)
-    db.commit()
+    await bump_versions(db, user_id, INVENTORY)
+    await apply_summary_deltas(db, user_id, summary_deltas([deleted], sign=-1))
+    await record_event(db, user_id, deleted, reason, deleted.quantity, 0)
+    await db.commit()
+    mark_user_write(user_id)
+    alert_scheduler.item_removed(deleted.id)
 
     return None
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from typing import List
+from datetime import date
+from uuid import UUID
+
+from app.core.auth import get_current_user_id
+from app.core.database import get_read_db
+from app.models.inventory_item import InventoryItem
+from app.schemas.recipe import RecipeMatchResponse
+from app.services.recipes import PantryItem, get_recipe_index
+
+router = APIRouter(prefix="/recipes", tags=["recipes"])
+
+
+@router.get("/suggestions", response_model=List[RecipeMatchResponse])
+async def suggest_recipes(
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+    user_id: UUID = Depends(get_current_user_id)
+):
+    """
+    Recipes that can be made from the user's inventory, prioritizing
+    items that expire soonest. Each result lists the ingredients it uses
+    and the ones still missing. Expired items are not suggested.
+    """
+    today = date.today()
+    rows = await db.execute(
+        select(InventoryItem.name, InventoryItem.category, InventoryItem.expiry_date)
+        .where(
+            InventoryItem.user_id == user_id,
+            InventoryItem.expiry_date >= today
+        )
+    )
+    items = [PantryItem(name, category, expiry_date) for name, category, expiry_date in rows]
+
+    # The first call loads and indexes the corpus; keep that off the event loop
+    index = await run_in_threadpool(get_recipe_index)
+    return index.suggest(items, today, limit)
@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class AlertSettingsUpdate(BaseModel):
+    """Days before expiry to be alerted at; null restores the app default"""
+    expiry_alert_days: Optional[List[int]] = Field(None, max_length=5, description="e.g. [3, 1, 0]")
+
+
+class AlertSettingsResponse(BaseModel):
+    """Effective alert thresholds for the user"""
+    expiry_alert_days: List[int]
+    is_default: bool
@@ -1,8 +1,10 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import date, datetime
 from uuid import UUID
 
+from app.schemas.inventory_item import InventoryItemCreate, InventoryItemResponse
+
 
 class DraftItemBase(BaseModel):
     """Base schema for DraftItem - fields that can be set by user/AI"""
@@ -44,3 +46,34 @@ class DraftItemResponse(DraftItemBase):
 
     class Config:
         from_attributes = True
+
+
+class DraftItemConfirmation(BaseModel):
+    """One entry of a batch confirm: the draft and its user-confirmed data"""
+    draft_id: UUID
+    confirmation: InventoryItemCreate
+
+
+class DraftItemBatchError(BaseModel):
+    """Per-item failure in a batch operation"""
+    draft_id: UUID
+    detail: str
+
+
+class DraftItemBatchConfirmResponse(BaseModel):
+    """Result of a batch confirm: promoted items plus per-draft errors"""
+    confirmed: List[InventoryItemResponse]
+    errors: List[DraftItemBatchError]
+
+
+class DraftItemImportError(BaseModel):
+    """A rejected row of an imported file"""
+    row: int
+    detail: str
+
+
+class DraftItemImportResponse(BaseModel):
+    """Result of a bulk file import"""
+    imported: int
+    failed: int
+    errors: List[DraftItemImportError]  # Truncated for very broken files; see `failed`
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class CategoryInsightResponse(BaseModel):
+    """Consumption and waste metrics for one category"""
+    category: str
+    consumed: int = Field(..., description="Events that consumed some or all of an item")
+    wasted: int = Field(..., description="Events that threw away some or all of an item")
+    waste_rate: float = Field(..., ge=0.0, le=1.0, description="wasted / (consumed + wasted)")
+    avg_days_to_consume: Optional[float] = Field(None, description="Mean item age when fully consumed")
+
+    class Config:
+        from_attributes = True
+
+
+class CategoryInsightsResponse(BaseModel):
+    """Per-category insights, most wasted first"""
+    categories: List[CategoryInsightResponse]
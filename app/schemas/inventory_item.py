@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 from datetime import date, datetime
 from uuid import UUID
 from decimal import Decimal
@@ -32,3 +33,20 @@ class InventoryItemResponse(InventoryItemBase):
 
     class Config:
         from_attributes = True
+
+
+class ExpiringItemsResponse(BaseModel):
+    """Inventory items due soon, grouped into urgency buckets"""
+    expired: List[InventoryItemResponse]  # Before today
+    today: List[InventoryItemResponse]
+    tomorrow: List[InventoryItemResponse]
+    this_week: List[InventoryItemResponse]  # 2-7 days out
+    later: List[InventoryItemResponse]  # Beyond a week, up to within_days
+
+
+class InventorySummaryResponse(BaseModel):
+    """Dashboard aggregates for the user's inventory"""
+    total_items: int
+    by_category: Dict[str, int]
+    by_storage_location: Dict[str, int]
+    earliest_expiry: Optional[date] = None
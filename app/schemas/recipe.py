@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class RecipeMatchResponse(BaseModel):
+    """A recipe ranked against the user's inventory"""
+    recipe_id: str
+    title: str
+    score: float
+    used_ingredients: List[str]  # Available in the user's inventory
+    missing_ingredients: List[str]  # Needed but not in the inventory
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,24 @@
+# Expiry alert services module
+from app.services.alerts.notifiers import (
+    ExpiryAlert,
+    LoggingNotifier,
+    Notifier,
+    create_notifier
+)
+from app.services.alerts.scheduler import (
+    MAX_ALERT_DAYS,
+    AlertScheduler,
+    alert_scheduler,
+    normalize_alert_days
+)
+
+__all__ = [
+    "ExpiryAlert",
+    "LoggingNotifier",
+    "Notifier",
+    "create_notifier",
+    "MAX_ALERT_DAYS",
+    "AlertScheduler",
+    "alert_scheduler",
+    "normalize_alert_days",
+]
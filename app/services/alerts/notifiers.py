@@ -0,0 +1,69 @@
+"""
+Delivery backends for expiry alerts.
+
+The scheduler hands every batch of due alerts to one Notifier. Only a
+logging stub ships today; a push provider (FCM/APNs) plugs in by
+subclassing Notifier and registering it in NOTIFIERS.
+"""
+import logging
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ExpiryAlert:
+    """One item reaching one of its user's alert thresholds"""
+    user_id: UUID
+    item_id: UUID
+    item_name: str
+    expiry_date: date
+    days_before: int  # Threshold that fired (0 = expires today)
+    fire_at: datetime
+
+
+class Notifier(ABC):
+    """
+    Sends batches of alerts.
+
+    Implementations should group by user (one push per user per batch)
+    and must not raise: a failing backend is logged by the scheduler and
+    the batch is dropped rather than blocking later alerts.
+    """
+
+    @abstractmethod
+    async def send(self, alerts: list[ExpiryAlert]) -> None:
+        pass
+
+
+class LoggingNotifier(Notifier):
+    """Local stub: logs one line per user instead of pushing"""
+
+    async def send(self, alerts: list[ExpiryAlert]) -> None:
+        by_user = defaultdict(list)
+        for alert in alerts:
+            by_user[alert.user_id].append(alert)
+
+        for user_id, user_alerts in by_user.items():
+            items = ", ".join(
+                f"{a.item_name} ({a.expiry_date.isoformat()}, {a.days_before}d)"
+                for a in user_alerts
+            )
+            logger.info("Expiry alert for user %s: %s", user_id, items)
+
+
+NOTIFIERS = {
+    "log": LoggingNotifier,
+}
+
+
+def create_notifier(name: str) -> Notifier:
+    if name not in NOTIFIERS:
+        raise RuntimeError(
+            f"Unknown ALERT_NOTIFIER '{name}'. Expected one of: {', '.join(NOTIFIERS)}"
+        )
+    return NOTIFIERS[name]()
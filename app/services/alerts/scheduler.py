@@ -0,0 +1,412 @@
+"""
+In-process expiry alert scheduler.
+
+Upcoming alert times live in a min-heap of
+(fire_at, seq, item_id, generation, days_before) entries. Writes keep it
+current incrementally through the item_added / item_updated /
+item_removed hooks, called by the inventory routers after commit, so the
+database is never polled per user. Rescheduling or removing an item just
+bumps its generation; stale heap entries are skipped when popped (lazy
+invalidation) and the heap is compacted once they dominate.
+
+A periodic resync reloads every item expiring within the alert horizon
+from the database, which picks up items that move into the horizon and
+repairs any drift (e.g. writes from another process). An item confirmed
+on another worker is first seen there, possibly after one of its alert
+times: the most urgent threshold that passed while the item existed and
+was not sent yet fires right away instead of being dropped. The hooks
+skip thresholds already passed when the item is confirmed; no alert for
+an item the user is looking at right now.
+
+Delivered alerts are recorded on the item (alerted_days_before), so a
+restart or resync never sends the same threshold twice, and a batch the
+notifier failed to send is retried at the next resync.
+
+The scheduler runs as one asyncio task per process and is off unless
+ALERTS_ENABLED=true. With several workers, set it in exactly one of
+them (e.g. a dedicated alerts process), otherwise each worker sends its
+own copy of every alert.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time as monotonic_time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Callable, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.database import session_scope
+from app.models.inventory_item import InventoryItem
+from app.models.user import User
+from app.services.alerts.notifiers import ExpiryAlert, Notifier, create_notifier
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for a threshold; also bounds how far ahead resync loads items
+MAX_ALERT_DAYS = 30
+
+# Rebuild the heap when stale entries outnumber live ones by this factor
+COMPACT_FACTOR = 2
+
+
+def normalize_alert_days(days: Iterable[int]) -> tuple[int, ...]:
+    """Validate thresholds and return them unique, furthest first"""
+    days = tuple(sorted(set(days), reverse=True))
+    if any(d < 0 or d > MAX_ALERT_DAYS for d in days):
+        raise ValueError(f"Alert days must be between 0 and {MAX_ALERT_DAYS}")
+    return days
+
+
+def _utc(value: datetime) -> datetime:
+    """Timestamps come back naive (UTC) from SQLite"""
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class _TrackedItem:
+    user_id: UUID
+    name: str
+    expiry_date: date
+    generation: int
+    sent: Optional[int] = None  # Most urgent threshold already delivered
+    pending: int = 0  # Live heap entries for this generation
+
+
+class AlertScheduler:
+    """Min-heap of upcoming alerts, fired in batches to a Notifier"""
+
+    def __init__(
+        self,
+        notifier: Notifier,
+        default_days: Iterable[int],
+        alert_hour_utc: int,
+        resync_seconds: int,
+        clock: Optional[Callable[[], datetime]] = None
+    ):
+        self.notifier = notifier
+        self.default_days = normalize_alert_days(default_days)
+        self.alert_hour_utc = alert_hour_utc
+        self.resync_seconds = resync_seconds
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+
+        self.active = False
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._pending_hooks: Optional[list] = None  # Hooks seen during a resync
+
+        self._heap: list[tuple] = []
+        self._seq = itertools.count()
+        self._live = 0
+        self._items: dict[UUID, _TrackedItem] = {}
+        self._user_items: dict[UUID, set[UUID]] = defaultdict(set)
+        self._user_days: dict[UUID, tuple[int, ...]] = {}
+
+        self.stats = {"fired": 0, "batches": 0, "notifier_errors": 0, "resyncs": 0}
+
+    # Alert times
+
+    def alert_time(self, expiry_date: date, days_before: int) -> datetime:
+        day = expiry_date - timedelta(days=days_before)
+        return datetime.combine(day, time(self.alert_hour_utc), tzinfo=timezone.utc)
+
+    def thresholds(self, user_id: UUID) -> tuple[int, ...]:
+        return self._user_days.get(user_id, self.default_days)
+
+    # Heap maintenance
+
+    def _schedule(
+        self,
+        item_id: UUID,
+        user_id: UUID,
+        name: str,
+        expiry_date: date,
+        since: Optional[datetime] = None,
+        sent: Optional[int] = None
+    ) -> None:
+        """
+        (Re)schedule the alerts of an item that are still to be sent.
+
+        Thresholds at or before `since` (default: now) are skipped, as are
+        those at or above `sent`. Of the thresholds between `since` and
+        now, the most urgent is queued to fire immediately.
+        """
+        self._unschedule(item_id)
+        now = self._clock()
+        since = now if since is None else since
+        tracked = _TrackedItem(user_id, name, expiry_date, next(self._seq), sent)
+
+        head = self._heap[0][0] if self._heap else None
+        overdue = None
+        for days in self.thresholds(user_id):
+            if sent is not None and days >= sent:
+                continue
+            fire_at = self.alert_time(expiry_date, days)
+            if fire_at <= since:
+                continue
+            if fire_at <= now:
+                if overdue is None or days < overdue[1]:
+                    overdue = (fire_at, days)
+                continue
+            heapq.heappush(
+                self._heap, (fire_at, next(self._seq), item_id, tracked.generation, days)
+            )
+            tracked.pending += 1
+        if overdue is not None:
+            fire_at, days = overdue
+            heapq.heappush(self._heap, (fire_at, next(self._seq), item_id, tracked.generation, days))
+            tracked.pending += 1
+
+        if tracked.pending:
+            self._items[item_id] = tracked
+            self._user_items[user_id].add(item_id)
+            self._live += tracked.pending
+            if head is None or self._heap[0][0] < head:
+                self._wakeup.set()  # New earliest alert: recompute the sleep
+
+    def _unschedule(self, item_id: UUID) -> None:
+        tracked = self._items.pop(item_id, None)
+        if tracked is None:
+            return
+        self._live -= tracked.pending
+        self._forget_user_item(tracked.user_id, item_id)
+        self._maybe_compact()
+
+    def _forget_user_item(self, user_id: UUID, item_id: UUID) -> None:
+        items = self._user_items.get(user_id)
+        if items is not None:
+            items.discard(item_id)
+            if not items:
+                del self._user_items[user_id]
+
+    def _is_live(self, entry: tuple) -> bool:
+        tracked = self._items.get(entry[2])
+        return tracked is not None and tracked.generation == entry[3]
+
+    def _maybe_compact(self) -> None:
+        if len(self._heap) > COMPACT_FACTOR * self._live + 64:
+            self._heap = [entry for entry in self._heap if self._is_live(entry)]
+            heapq.heapify(self._heap)
+
+    def _next_fire_at(self) -> Optional[datetime]:
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> list[ExpiryAlert]:
+        """
+        Remove and return every alert due at `now`.
+
+        If several thresholds of one item are due together (e.g. after
+        downtime), only the most urgent is returned.
+        """
+        due: dict[UUID, ExpiryAlert] = {}
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if not self._is_live(entry):
+                continue
+            fire_at, _, item_id, _, days = entry
+            tracked = self._items[item_id]
+            tracked.pending -= 1
+            self._live -= 1
+            if tracked.pending == 0:
+                del self._items[item_id]
+                self._forget_user_item(tracked.user_id, item_id)
+
+            current = due.get(item_id)
+            if current is None or days < current.days_before:
+                due[item_id] = ExpiryAlert(
+                    user_id=tracked.user_id,
+                    item_id=item_id,
+                    item_name=tracked.name,
+                    expiry_date=tracked.expiry_date,
+                    days_before=days,
+                    fire_at=fire_at
+                )
+        return list(due.values())
+
+    # Hooks (no-ops unless the scheduler is running)
+
+    def _hook(self, fn, *args) -> None:
+        if not self.active:
+            return
+        fn(*args)
+        if self._pending_hooks is not None:
+            # Replayed on top of the state a running resync installs
+            self._pending_hooks.append((fn, args))
+
+    def item_added(self, item) -> None:
+        """A confirmed inventory item (call after commit)"""
+        self._hook(self._schedule, item.id, item.user_id, item.name, item.expiry_date)
+
+    def item_updated(self, item) -> None:
+        """
+        An inventory item changed. Only the expiry date affects alert
+        times; quantity updates (the only mutation today) are a no-op.
+        """
+        tracked = self._items.get(item.id)
+        if tracked is not None and tracked.expiry_date != item.expiry_date:
+            self._hook(self._schedule, item.id, item.user_id, item.name, item.expiry_date)
+
+    def item_removed(self, item_id: UUID) -> None:
+        self._hook(self._unschedule, item_id)
+
+    def set_user_thresholds(self, user_id: UUID, days: Optional[tuple[int, ...]]) -> None:
+        """Apply a user's new thresholds (None = default) to their tracked items"""
+        self._hook(self._set_user_thresholds, user_id, days)
+
+    def _set_user_thresholds(self, user_id: UUID, days: Optional[tuple[int, ...]]) -> None:
+        if days is None:
+            self._user_days.pop(user_id, None)
+        else:
+            self._user_days[user_id] = days
+        for item_id in list(self._user_items.get(user_id, ())):
+            tracked = self._items[item_id]
+            self._schedule(item_id, user_id, tracked.name, tracked.expiry_date, sent=tracked.sent)
+
+    # Database resync
+
+    async def resync(self) -> None:
+        """Rebuild all state from items expiring within the alert horizon"""
+        self._pending_hooks = []
+        try:
+            today = self._clock().date()
+            async with session_scope() as db:
+                user_days = (await db.execute(
+                    select(User.id, User.expiry_alert_days)
+                    .where(User.expiry_alert_days.is_not(None))
+                )).all()
+                items = (await db.execute(
+                    select(
+                        InventoryItem.id,
+                        InventoryItem.user_id,
+                        InventoryItem.name,
+                        InventoryItem.expiry_date,
+                        InventoryItem.created_at,
+                        InventoryItem.alerted_days_before
+                    ).where(
+                        InventoryItem.expiry_date >= today,
+                        InventoryItem.expiry_date <= today + timedelta(days=MAX_ALERT_DAYS + 1)
+                    )
+                )).all()
+
+            self._heap = []
+            self._live = 0
+            self._items = {}
+            self._user_items = defaultdict(set)
+            self._user_days = {
+                user_id: normalize_alert_days(days) for user_id, days in user_days
+            }
+            for item_id, user_id, name, expiry_date, created_at, sent in items:
+                self._schedule(item_id, user_id, name, expiry_date, _utc(created_at), sent)
+
+            for fn, args in self._pending_hooks:
+                fn(*args)
+            self.stats["resyncs"] += 1
+        finally:
+            self._pending_hooks = None
+        self._wakeup.set()
+
+    # Delivery loop
+
+    async def _deliver(self, alerts: list[ExpiryAlert]) -> None:
+        try:
+            await self.notifier.send(alerts)
+        except Exception:
+            self.stats["notifier_errors"] += 1
+            logger.exception(
+                "Expiry alert notifier failed; %d alerts retried at the next resync", len(alerts)
+            )
+            return
+        self.stats["fired"] += len(alerts)
+        self.stats["batches"] += 1
+        try:
+            await self._record_sent(alerts)
+        except Exception:
+            logger.exception("Could not record %d sent expiry alerts", len(alerts))
+
+    async def _record_sent(self, alerts: list[ExpiryAlert]) -> None:
+        """Mark delivered thresholds on their items, one UPDATE per threshold"""
+        by_days: dict[int, list[UUID]] = defaultdict(list)
+        for alert in alerts:
+            by_days[alert.days_before].append(alert.item_id)
+        async with session_scope() as db:
+            for days, item_ids in sorted(by_days.items()):
+                await db.execute(
+                    update(InventoryItem)
+                    .where(InventoryItem.id.in_(item_ids))
+                    .values(alerted_days_before=days)
+                    .execution_options(synchronize_session=False)
+                )
+            await db.commit()
+
+    async def _run(self) -> None:
+        next_resync = monotonic_time.monotonic() + self.resync_seconds
+        while True:
+            self._wakeup.clear()
+            try:
+                alerts = self.pop_due(self._clock())
+                if alerts:
+                    await self._deliver(alerts)
+                if monotonic_time.monotonic() >= next_resync:
+                    next_resync = monotonic_time.monotonic() + self.resync_seconds
+                    await self.resync()
+                    self._wakeup.clear()
+            except Exception:
+                logger.exception("Expiry alert scheduler iteration failed")
+
+            timeout = max(0.0, next_resync - monotonic_time.monotonic())
+            next_fire_at = self._next_fire_at()
+            if next_fire_at is not None:
+                until_next = (next_fire_at - self._clock()).total_seconds()
+                timeout = min(timeout, max(0.0, until_next))
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self) -> None:
+        """Load state and start the delivery loop (called from the app lifespan)"""
+        if self.active:
+            return
+        self.active = True
+        try:
+            await self.resync()
+        except Exception:
+            # The loop retries at the next resync interval
+            logger.exception("Initial expiry alert resync failed")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self.active = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict:
+        next_fire_at = self._next_fire_at()
+        return {
+            "active": self.active,
+            "tracked_items": len(self._items),
+            "pending_alerts": self._live,
+            "heap_entries": len(self._heap),
+            "next_alert_at": next_fire_at.isoformat() if next_fire_at else None,
+            **self.stats,
+        }
+
+
+alert_scheduler = AlertScheduler(
+    notifier=create_notifier(settings.alert_notifier),
+    default_days=settings.expiry_alert_days,
+    alert_hour_utc=settings.expiry_alert_hour_utc,
+    resync_seconds=settings.alert_resync_seconds
+)
@@ -1,15 +1,19 @@
 from app.services.expiry_prediction.service import (
     ExpiryPredictionService,
-    expiry_prediction_service
+    expiry_prediction_service,
+    rules_reloader
 )
 from app.services.expiry_prediction.strategies.base import (
     ExpiryPrediction,
+    ExpiryPredictionInput,
     ExpiryPredictionStrategy
 )
 
 __all__ = [
     "ExpiryPredictionService",
     "expiry_prediction_service",
+    "rules_reloader",
     "ExpiryPrediction",
+    "ExpiryPredictionInput",
     "ExpiryPredictionStrategy",
 ]
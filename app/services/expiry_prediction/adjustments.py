@@ -0,0 +1,55 @@
+"""
+Per-user shelf-life offsets as the prediction service applies them.
+
+Kept free of database imports so the service (and anything importing
+app.services.expiry_prediction) loads without DATABASE_URL; reading and
+writing the offsets is personalization.UserAdjustmentStore's job.
+"""
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+# Confirmed shelf lives outside this range (days) are treated as typos
+MIN_SHELF_LIFE_DAYS = 0
+MAX_SHELF_LIFE_DAYS = 3 * 365
+
+# Offsets are shrunk toward the prediction as if this many confirmations
+# had matched it exactly, so one odd date moves little
+PRIOR_SAMPLES = 2
+
+
+@dataclass(frozen=True)
+class ShelfLifeObservation:
+    """Days between a confirmed expiry date and the shelf-life rules' date"""
+    category: str
+    storage_location: str
+    offset_days: int
+
+
+class UserAdjustments:
+    """One user's adjustments as of a shelf_life_version"""
+
+    def __init__(self, version: Optional[int], offsets: Mapping[tuple[str, str], tuple[float, int]]):
+        self.version = version
+        self.offsets = offsets
+
+    def __bool__(self) -> bool:
+        return bool(self.offsets)
+
+    def offset_days(
+        self,
+        category: Optional[str],
+        storage_location: Optional[str],
+        baseline_days: int = 0
+    ) -> int:
+        """
+        Days to add to a prediction for these canonical labels.
+
+        Offsets are kept relative to the rules; baseline_days is how far
+        the prediction already is from them (e.g. a regression correction),
+        so that part is not added twice.
+        """
+        found = self.offsets.get((category, storage_location))
+        if found is None:
+            return 0
+        mean, samples = found
+        return round((mean - baseline_days) * samples / (samples + PRIOR_SAMPLES))
@@ -0,0 +1,88 @@
+"""
+Bounded LRU cache of expiry predictions.
+
+A strategy's output usually depends only on its normalized inputs and the
+purchase date, not on the free-text item name, so identical drafts
+(every "Milk, dairy, fridge" bought today) can share one immutable
+ExpiryPrediction. Strategies opt in through
+ExpiryPredictionStrategy.cache_key(); entries are tagged with the
+strategy's cache_version and the whole cache is dropped when it changes.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from app.services.expiry_prediction.strategies.base import ExpiryPrediction
+
+
+class PredictionCache:
+    """Thread-safe LRU mapping cache keys to predictions"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, ExpiryPrediction] = OrderedDict()
+        self._version: Hashable = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def get_or_compute(
+        self,
+        version: Hashable,
+        key: Hashable,
+        compute: Callable[[], ExpiryPrediction]
+    ) -> ExpiryPrediction:
+        """
+        Return the cached prediction for key, computing it on a miss.
+
+        compute() runs outside the lock; two threads missing on the same
+        key both compute it, which is harmless because the result is
+        deterministic.
+        """
+        with self._lock:
+            if version != self._version:
+                self._clear(version)
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        prediction = compute()
+
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = prediction
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return prediction
+
+    def invalidate(self) -> None:
+        """Drop every entry (e.g. after the rules were reloaded)"""
+        with self._lock:
+            self._clear(self._version)
+
+    def _clear(self, version: Hashable) -> None:
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+        self._version = version
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
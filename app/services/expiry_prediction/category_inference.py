@@ -0,0 +1,204 @@
+"""
+Category inference from free-text item names.
+
+Manual drafts often carry only a name ("Semi skimmed milk 2L", "Hähnchenbrust"),
+which leaves the rule-based strategy on its low-confidence storage
+defaults. A multilingual food keyword dictionary is compiled into an
+Aho-Corasick automaton, so a name is scanned once, in time linear in its
+length, whatever the size of the dictionary.
+
+Names and keywords are case-folded and stripped of accents. Matches must
+sit on word boundaries (an optional plural "s" is allowed), so "egg"
+does not fire inside "eggplant". When several keywords match, a modifier
+category ("frozen peas", "canned tomatoes") wins over the noun it
+qualifies; otherwise the longest keyword wins, then the rightmost.
+Compound names whose leading word would pick the wrong category
+("milk chocolate", "apple juice") are listed as unclassified: as the
+longest match they win, and infer() returns None for them.
+
+The automaton is built once per process, on first use (around ten
+milliseconds for the bundled dictionary).
+"""
+import json
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Optional
+
+BUNDLED_KEYWORDS = Path(__file__).parent / "data" / "food_keywords.json"
+
+# Transition keys are state * CODEPOINTS + ord(char)
+CODEPOINTS = 0x110000
+
+# Names remembered by infer()
+INFERENCE_CACHE_SIZE = 8192
+
+
+_WORDS = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Casefold, strip accents and reduce punctuation to single spaces
+    ("Crème-fraîche 30%" -> "creme fraiche 30")
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(_WORDS.findall(stripped))
+
+
+class AhoCorasick:
+    """
+    Keyword automaton over a trie with failure links.
+
+    goto maps state * CODEPOINTS + ord(char) to the next state; outputs[s]
+    lists the keyword ids ending at state s, including those inherited
+    through failure links, so matching never walks output chains.
+    """
+
+    def __init__(self, goto: dict[int, int], fail: list[int], outputs: list[tuple[int, ...]]):
+        self.goto = goto
+        self.fail = fail
+        self.outputs = outputs
+
+    @classmethod
+    def build(cls, keywords: list[str]) -> "AhoCorasick":
+        goto: dict[int, int] = {}
+        children: list[list[int]] = [[]]
+        own: list[list[int]] = [[]]
+
+        for keyword_id, keyword in enumerate(keywords):
+            state = 0
+            for ch in keyword:
+                key = state * CODEPOINTS + ord(ch)
+                nxt = goto.get(key)
+                if nxt is None:
+                    nxt = len(children)
+                    goto[key] = nxt
+                    children.append([])
+                    own.append([])
+                    children[state].append(key)
+                state = nxt
+            own[state].append(keyword_id)
+
+        fail = [0] * len(children)
+        outputs: list[tuple[int, ...]] = [()] * len(children)
+        # Breadth-first, so a state's failure target is final before its children
+        queue = [goto[key] for key in children[0]]
+        for state in queue:
+            outputs[state] = tuple(own[state]) + outputs[fail[state]]
+            for key in children[state]:
+                child = goto[key]
+                cp = key - state * CODEPOINTS
+                target = fail[state]
+                while True:
+                    nxt = goto.get(target * CODEPOINTS + cp)
+                    if nxt is not None and nxt != child:
+                        fail[child] = nxt
+                        break
+                    if target == 0:
+                        break
+                    target = fail[target]
+                queue.append(child)
+        return cls(goto, fail, outputs)
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int]]:
+        """Yield (end_index, keyword_id) for every keyword occurrence"""
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        state = 0
+        for index, ch in enumerate(text):
+            cp = ord(ch)
+            while True:
+                nxt = goto.get(state * CODEPOINTS + cp)
+                if nxt is not None:
+                    state = nxt
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+            for keyword_id in outputs[state]:
+                yield index, keyword_id
+
+
+@dataclass(frozen=True)
+class CategoryMatch:
+    """The category inferred for a name and the keyword that decided it"""
+    category: str
+    keyword: str
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    return index < 0 or index >= len(text) or not text[index].isalnum()
+
+
+class CategoryInferrer:
+    """Maps item names to rule categories through the keyword automaton"""
+
+    def __init__(self, automaton: AhoCorasick, keywords: list[str], categories: list[Optional[str]],
+                 modifiers: frozenset[str]):
+        self.automaton = automaton
+        self.keywords = keywords
+        self.categories = categories
+        self.modifiers = modifiers
+        self.infer = lru_cache(maxsize=INFERENCE_CACHE_SIZE)(self._infer)
+
+    @staticmethod
+    def load_dictionary(path: Path) -> tuple[list[str], list[Optional[str]], frozenset[str]]:
+        """
+        Read the keyword file.
+
+        Returns (keywords, category per keyword, modifier categories).
+        Unclassified keywords have category None and take precedence;
+        otherwise a keyword listed under two categories keeps the first.
+        """
+        data = json.loads(Path(path).read_bytes())
+        keywords, categories, seen = [], [], set()
+        sections = [(None, data.get("unclassified", ())), *data["categories"].items()]
+        for category, terms in sections:
+            for term in terms:
+                keyword = normalize_text(term)
+                if keyword and keyword not in seen:
+                    seen.add(keyword)
+                    keywords.append(keyword)
+                    categories.append(category)
+        return keywords, categories, frozenset(data.get("modifiers", ()))
+
+    @classmethod
+    def from_file(cls, path: Path) -> "CategoryInferrer":
+        """Load the dictionary and build its automaton"""
+        keywords, categories, modifiers = cls.load_dictionary(path)
+        return cls(AhoCorasick.build(keywords), keywords, categories, modifiers)
+
+    def _infer(self, name: Optional[str]) -> Optional[CategoryMatch]:
+        if not name:
+            return None
+        text = normalize_text(name)
+
+        best = None  # Keyword id
+        best_rank = None
+        for end, keyword_id in self.automaton.iter_matches(text):
+            keyword = self.keywords[keyword_id]
+            start = end - len(keyword) + 1
+            if not _is_boundary(text, start - 1):
+                continue
+            after = end + 1
+            if not _is_boundary(text, after):
+                # Allow a plural "s" after the keyword
+                if text[after] != "s" or not _is_boundary(text, after + 1):
+                    continue
+
+            category = self.categories[keyword_id]
+            rank = (category in self.modifiers, len(keyword), end)
+            if best_rank is None or rank > best_rank:
+                best, best_rank = keyword_id, rank
+        if best is None or self.categories[best] is None:
+            return None
+        return CategoryMatch(self.categories[best], self.keywords[best])
+
+
+@lru_cache(maxsize=1)
+def get_category_inferrer() -> CategoryInferrer:
+    """Process-wide inferrer over the bundled keyword dictionary"""
+    return CategoryInferrer.from_file(BUNDLED_KEYWORDS)
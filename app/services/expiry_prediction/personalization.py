@@ -0,0 +1,174 @@
+"""
+Per-user shelf-life adjustments.
+
+Households differ: one keeps milk for twelve days, another throws it out
+after five. Every confirmation is compared with the shelf-life rules'
+date for the same (category, storage) and purchase date, whichever
+strategy is the default, so the offsets stay valid when a regression
+model is deployed or withdrawn. The difference in days
+is folded into a per-user running mean (user_shelf_life_adjustments) in
+the confirm transaction, and later predictions for that user are shifted
+by it, less whatever the default strategy already moves away from the
+rules. A confirmation that keeps the date the draft already showed is
+not recorded: that date includes the shrunk offset, and counting it
+would drag the mean back toward zero.
+
+The table is needed on the prediction path, so each worker keeps the
+adjustments of recently active users in an LRU. Writers bump the user's
+shelf_life_version in the same transaction. A cached entry is trusted for
+USER_ADJUSTMENT_REFRESH_SECONDS; after that, one primary-key lookup of
+the version decides whether it must be reloaded. The worker that wrote
+drops its own entry on commit, so a user's next prediction there
+reflects the confirmation immediately.
+
+The offsets themselves (UserAdjustments) live in .adjustments, which the
+prediction service imports without needing a database.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import dialect_insert
+from app.core.versioning import SHELF_LIFE, get_version
+from app.models.shelf_life_adjustment import UserShelfLifeAdjustment
+from app.services.expiry_prediction.adjustments import ShelfLifeObservation, UserAdjustments
+
+# Users whose adjustments are kept in memory per process
+ADJUSTMENT_CACHE_USERS = 10_000
+
+
+class UserAdjustmentStore:
+    """LRU of per-user adjustments, revalidated through shelf_life_version"""
+
+    def __init__(self, maxsize: int, refresh_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.refresh_seconds = refresh_seconds
+        self.clock = clock
+        self._entries: OrderedDict[UUID, tuple[UserAdjustments, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidations = 0
+        self.loads = 0
+
+    def _cached(self, user_id: UUID) -> tuple[Optional[UserAdjustments], bool]:
+        """(entry or None, whether it is within the refresh window)"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None, False
+            self._entries.move_to_end(user_id)
+            adjustments, checked_at = entry
+            return adjustments, self.clock() - checked_at < self.refresh_seconds
+
+    def _store(self, user_id: UUID, adjustments: UserAdjustments) -> None:
+        with self._lock:
+            self._entries[user_id] = (adjustments, self.clock())
+            self._entries.move_to_end(user_id)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    async def load(self, db, user_id: UUID) -> UserAdjustments:
+        """
+        The user's adjustments, from memory when the cached copy is
+        fresh, after a version check when it is older, otherwise from
+        the table.
+        """
+        cached, fresh = self._cached(user_id)
+        if fresh:
+            self.hits += 1
+            return cached
+
+        version = await get_version(db, user_id, SHELF_LIFE)
+        if cached is not None and cached.version == version:
+            self.revalidations += 1
+            self._store(user_id, cached)
+            return cached
+
+        # Read after the version: rows can only be newer than it, which
+        # costs at most one extra reload
+        rows = await db.execute(
+            select(
+                UserShelfLifeAdjustment.category,
+                UserShelfLifeAdjustment.storage_location,
+                UserShelfLifeAdjustment.mean_offset_days,
+                UserShelfLifeAdjustment.samples
+            ).where(UserShelfLifeAdjustment.user_id == user_id)
+        )
+        adjustments = UserAdjustments(
+            version,
+            {(category, storage): (mean, samples) for category, storage, mean, samples in rows}
+        )
+        self.loads += 1
+        self._store(user_id, adjustments)
+        return adjustments
+
+    async def record(self, db, user_id: UUID, observations: Iterable[Optional[ShelfLifeObservation]]) -> bool:
+        """
+        Fold observations into the running means with one upsert. None
+        entries (confirmations with nothing to learn from) are skipped.
+        Returns whether anything was written.
+
+        Call before commit; if it returns True, also bump_versions(db,
+        user_id, SHELF_LIFE) in the same transaction and invalidate(user_id)
+        once committed.
+        """
+        batches: dict[tuple[str, str], list[int]] = {}
+        for observation in observations:
+            if observation is None:
+                continue
+            batches.setdefault(
+                (observation.category, observation.storage_location), []
+            ).append(observation.offset_days)
+        if not batches:
+            return False
+
+        # Sorted so concurrent writers touch rows in the same order
+        rows = [
+            {
+                "user_id": user_id,
+                "category": category,
+                "storage_location": storage,
+                "mean_offset_days": sum(offsets) / len(offsets),
+                "samples": len(offsets),
+            }
+            for (category, storage), offsets in sorted(batches.items())
+        ]
+        insert = dialect_insert(db)
+        statement = insert(UserShelfLifeAdjustment).values(rows)
+        table, new = UserShelfLifeAdjustment, statement.excluded
+        total = table.samples + new.samples
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.user_id, table.category, table.storage_location],
+            set_={
+                # Running mean: move toward the new batch mean by its weight
+                "mean_offset_days": table.mean_offset_days
+                + (new.mean_offset_days - table.mean_offset_days) * new.samples / total,
+                "samples": total,
+            }
+        )
+        await db.execute(statement)
+        return True
+
+    def invalidate(self, user_id: UUID) -> None:
+        """Drop a user's cached adjustments (after committing a change)"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "users": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "revalidations": self.revalidations,
+                "loads": self.loads,
+            }
+
+
+# Process-wide store used by the draft routes
+user_adjustments = UserAdjustmentStore(ADJUSTMENT_CACHE_USERS, settings.user_adjustment_refresh_seconds)
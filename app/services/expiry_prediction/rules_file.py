@@ -0,0 +1,282 @@
+"""
+External shelf-life rule file with hot reload.
+
+The built-in tables on RuleBasedStrategy can be replaced by a versioned
+JSON file (SHELF_LIFE_RULES_PATH) so shelf lives are tuned without a
+redeploy:
+
+    {
+      "version": "2024-06-01",
+      "rules": {"dairy": {"fridge": {"days": 7, "confidence": 0.85}, ...}, ...},
+      "storage_defaults": {"fridge": {"days": 7, "confidence": 0.5}, ...},
+      "default": {"days": 7, "confidence": 0.3},
+      "category_aliases": {"dairy": ["milk", ...]},   (optional)
+      "storage_aliases": {"fridge": ["refrigerator", ...]}   (optional)
+    }
+
+A new file is parsed, validated and compiled completely before it is
+published with a single attribute assignment, so an in-flight prediction
+sees either the old table or the new one, never a mix. An invalid file is
+rejected and the current rules stay in place. The prediction cache is
+cleared on every swap.
+
+    python -m app.services.expiry_prediction.rules_file --export > rules.json
+    python -m app.services.expiry_prediction.rules_file --check rules.json
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.services.expiry_prediction.strategies.rule_based import RuleBasedStrategy
+from app.services.expiry_prediction.strategies.rule_table import CompiledRules
+
+logger = logging.getLogger(__name__)
+
+# Longest shelf life a rule may declare
+MAX_RULE_DAYS = 3650
+
+
+class RuleFileError(ValueError):
+    """Raised when a rule file cannot be parsed or fails validation"""
+
+
+def _entry(value, where: str) -> tuple[int, float]:
+    if not isinstance(value, dict) or set(value) != {"days", "confidence"}:
+        raise RuleFileError(f"{where}: expected {{\"days\": ..., \"confidence\": ...}}")
+    days, confidence = value["days"], value["confidence"]
+    if isinstance(days, bool) or not isinstance(days, int) or not 0 <= days <= MAX_RULE_DAYS:
+        raise RuleFileError(f"{where}: days must be an integer between 0 and {MAX_RULE_DAYS}")
+    if isinstance(confidence, bool) or not isinstance(confidence, (int, float)) or not 0 <= confidence <= 1:
+        raise RuleFileError(f"{where}: confidence must be between 0 and 1")
+    return days, float(confidence)
+
+
+def _name(value, where: str) -> str:
+    if not isinstance(value, str) or not value.strip() or value != value.strip().lower():
+        raise RuleFileError(f"{where}: names must be non-empty lowercase strings, got {value!r}")
+    return value
+
+
+def _aliases(value, where: str, default: dict) -> dict[str, list[str]]:
+    if value is None:
+        return default
+    if not isinstance(value, dict) or not all(
+        isinstance(terms, list) and all(isinstance(term, str) for term in terms)
+        for terms in value.values()
+    ):
+        raise RuleFileError(f"{where}: expected a mapping of name to a list of strings")
+    return value
+
+
+def parse_rules(data, version_suffix: str = "") -> CompiledRules:
+    """Validate rule file contents and compile them"""
+    if not isinstance(data, dict):
+        raise RuleFileError("rule file must contain a JSON object")
+    for required in ("version", "rules", "storage_defaults", "default"):
+        if required not in data:
+            raise RuleFileError(f"missing '{required}'")
+
+    version = data["version"]
+    if not isinstance(version, (str, int)) or isinstance(version, bool) or str(version) == "":
+        raise RuleFileError("version must be a non-empty string or integer")
+
+    if not isinstance(data["storage_defaults"], dict) or not data["storage_defaults"]:
+        raise RuleFileError("storage_defaults must be a non-empty object")
+    storage_defaults = {
+        _name(storage, "storage_defaults"): _entry(entry, f"storage_defaults.{storage}")
+        for storage, entry in data["storage_defaults"].items()
+    }
+
+    if not isinstance(data["rules"], dict) or not data["rules"]:
+        raise RuleFileError("rules must be a non-empty object")
+    rules = {}
+    for category, by_storage in data["rules"].items():
+        _name(category, "rules")
+        if not isinstance(by_storage, dict) or not by_storage:
+            raise RuleFileError(f"rules.{category}: expected an object keyed by storage")
+        for storage, entry in by_storage.items():
+            where = f"rules.{category}.{storage}"
+            if _name(storage, where) not in storage_defaults:
+                raise RuleFileError(f"{where}: storage '{storage}' has no storage_defaults entry")
+            rules[(category, storage)] = _entry(entry, where)
+
+    try:
+        return CompiledRules(
+            rules,
+            storage_defaults,
+            _entry(data["default"], "default"),
+            _aliases(data.get("category_aliases"), "category_aliases", RuleBasedStrategy.CATEGORY_ALIASES),
+            _aliases(data.get("storage_aliases"), "storage_aliases", RuleBasedStrategy.STORAGE_ALIASES),
+            version=f"{version}{version_suffix}"
+        )
+    except ValueError as e:
+        # e.g. an alias pointing at a category without rules
+        raise RuleFileError(str(e)) from e
+
+
+def load_rules_file(path: Path) -> CompiledRules:
+    """
+    Read and compile a rule file. The compiled version is the file's
+    version plus a content digest, so editing a file without bumping its
+    version still invalidates cached predictions.
+    """
+    try:
+        raw = Path(path).read_bytes()
+        data = json.loads(raw)
+    except (OSError, json.JSONDecodeError) as e:
+        raise RuleFileError(f"{path}: {e}") from e
+    digest = hashlib.sha256(raw).hexdigest()[:12]
+    try:
+        return parse_rules(data, version_suffix=f"@{digest}")
+    except RuleFileError as e:
+        raise RuleFileError(f"{path}: {e}") from e
+
+
+def export_builtin_rules() -> dict:
+    """The built-in tables in rule file format, as a starting point"""
+    rules: dict[str, dict] = {}
+    for (category, storage), (days, confidence) in RuleBasedStrategy.SHELF_LIFE_RULES.items():
+        rules.setdefault(category, {})[storage] = {"days": days, "confidence": confidence}
+    days, confidence = RuleBasedStrategy.DEFAULT_PREDICTION
+    return {
+        "version": 1,
+        "rules": rules,
+        "storage_defaults": {
+            storage: {"days": days, "confidence": confidence}
+            for storage, (days, confidence) in RuleBasedStrategy.STORAGE_DEFAULTS.items()
+        },
+        "default": {"days": days, "confidence": confidence},
+        "category_aliases": RuleBasedStrategy.CATEGORY_ALIASES,
+        "storage_aliases": RuleBasedStrategy.STORAGE_ALIASES,
+    }
+
+
+class RulesReloader:
+    """
+    Watches the rule file's mtime and size and swaps in new rules.
+
+    Polling runs as a background task; reload(force=True) is also exposed
+    through the admin endpoint for deployments that push a file and want
+    it applied immediately.
+    """
+
+    def __init__(self, service, path: Optional[str], interval_seconds: int):
+        self.service = service
+        self.path = Path(path) if path else None
+        self.interval_seconds = interval_seconds
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.loaded_at: Optional[datetime] = None
+        self._signature: Optional[tuple[int, int]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def _file_signature(self) -> Optional[tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Load the file if it changed since the last load (or always, with
+        force). Returns True if new rules were swapped in.
+
+        Raises:
+            RuleFileError: If the file is invalid; current rules are kept
+        """
+        if not self.enabled:
+            return False
+        signature = self._file_signature()
+        if not force and signature is not None and signature == self._signature:
+            return False
+
+        try:
+            rules = load_rules_file(self.path)
+        except RuleFileError as e:
+            self.failures += 1
+            self.last_error = str(e)
+            # Remember the bad file so it is not re-parsed every poll
+            self._signature = signature
+            raise
+
+        self.service.swap_rules(rules)
+        self._signature = signature
+        self.reloads += 1
+        self.last_error = None
+        self.loaded_at = datetime.now(timezone.utc)
+        logger.info("Loaded shelf-life rules %s from %s", rules.version, self.path)
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await run_in_threadpool(self.reload)
+            except RuleFileError as e:
+                logger.error("Rejected shelf-life rules: %s", e)
+            except Exception:
+                logger.exception("Shelf-life rule reload failed")
+
+    def start(self) -> None:
+        """Load the file now, so a bad file fails startup, then poll it"""
+        if self.enabled and self._task is None:
+            self.reload(force=True)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict:
+        return {
+            "path": str(self.path) if self.path else None,
+            "version": self.service.rules_version,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate or export shelf-life rule files")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--check", type=Path, metavar="PATH", help="Validate a rule file")
+    group.add_argument("--export", action="store_true", help="Print the built-in rules as JSON")
+    args = parser.parse_args()
+
+    if args.export:
+        print(json.dumps(export_builtin_rules(), indent=2))
+        return
+
+    try:
+        rules = load_rules_file(args.check)
+    except RuleFileError as e:
+        print(f"invalid: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"ok: version {rules.version}, {len(rules.categories.names) - 1} categories, "
+          f"{len(rules.storages.names) - 1} storages")
+
+
+if __name__ == "__main__":
+    main()
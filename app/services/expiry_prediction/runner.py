@@ -0,0 +1,123 @@
+"""
+Concurrent execution of prediction strategies under latency budgets.
+
+Every strategy is submitted to a shared thread pool at once, so comparing
+strategies costs the slowest one that finishes in time rather than the
+sum of all of them. Each strategy has its own budget (its
+latency_budget_ms, or the service default); a strategy that misses it, or
+raises, is left out of the result instead of holding it up, which keeps
+the "non-blocking" contract of ExpiryPredictionStrategy.
+
+Python threads cannot be cancelled: a late strategy keeps its worker until
+it returns, and its latency is still recorded when it does.
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Callable, Optional, Sequence
+
+from app.services.expiry_prediction.strategies.base import (
+    ExpiryPrediction,
+    ExpiryPredictionStrategy
+)
+
+
+class _Stats:
+    """Latency and outcome counters for one strategy"""
+
+    def __init__(self):
+        self.calls = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "latency_avg_ms": self.total_seconds / self.calls * 1000 if self.calls else 0.0,
+            "latency_max_ms": self.max_seconds * 1000,
+        }
+
+
+class StrategyRunner:
+    """Runs strategies in parallel, keeping those that meet their budget"""
+
+    def __init__(self, default_budget_ms: float, max_workers: int):
+        self.default_budget_ms = default_budget_ms
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats: dict[str, _Stats] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="expiry-strategy"
+                )
+            return self._executor
+
+    def budget_seconds(self, strategy: ExpiryPredictionStrategy) -> float:
+        budget_ms = strategy.latency_budget_ms
+        return (self.default_budget_ms if budget_ms is None else budget_ms) / 1000
+
+    def _timed(self, strategy: ExpiryPredictionStrategy, call: Callable[[], ExpiryPrediction]):
+        start = time.perf_counter()
+        try:
+            return call()
+        finally:
+            self._record_latency(strategy.name, time.perf_counter() - start)
+
+    def _stats_for(self, name: str) -> _Stats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats.setdefault(name, _Stats())
+        return stats
+
+    def _record_latency(self, name: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._stats_for(name)
+            stats.calls += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+
+    def _record(self, name: str, field: str) -> None:
+        with self._lock:
+            stats = self._stats_for(name)
+            setattr(stats, field, getattr(stats, field) + 1)
+
+    def run(
+        self,
+        strategies: Sequence[ExpiryPredictionStrategy],
+        call: Callable[[ExpiryPredictionStrategy], ExpiryPrediction]
+    ) -> list[ExpiryPrediction]:
+        """
+        Call every strategy concurrently.
+
+        Returns predictions from strategies that finished within their
+        budget, in the order of strategies.
+        """
+        start = time.monotonic()
+        pool = self._pool()
+        futures: list[Future] = [
+            pool.submit(self._timed, strategy, lambda s=strategy: call(s))
+            for strategy in strategies
+        ]
+
+        predictions = []
+        for strategy, future in zip(strategies, futures):
+            remaining = start + self.budget_seconds(strategy) - time.monotonic()
+            try:
+                predictions.append(future.result(timeout=max(remaining, 0)))
+            except TimeoutError:
+                self._record(strategy.name, "timeouts")
+            except Exception:
+                self._record(strategy.name, "errors")
+        return predictions
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: stats.snapshot() for name, stats in self._stats.items()}
@@ -1,8 +1,36 @@
-from datetime import date
-from typing import Optional
+import logging
+from dataclasses import replace
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional, Sequence
 
-from app.services.expiry_prediction.strategies.base import ExpiryPrediction
+from app.core.config import settings
+from app.services.expiry_prediction.adjustments import (
+    MAX_SHELF_LIFE_DAYS,
+    MIN_SHELF_LIFE_DAYS,
+    ShelfLifeObservation,
+    UserAdjustments
+)
+from app.services.expiry_prediction.cache import PredictionCache
+from app.services.expiry_prediction.category_inference import (
+    CategoryInferrer,
+    CategoryMatch,
+    get_category_inferrer
+)
+from app.services.expiry_prediction.rules_file import RulesReloader
+from app.services.expiry_prediction.runner import StrategyRunner
+from app.services.expiry_prediction.strategies.base import (
+    ExpiryPrediction,
+    ExpiryPredictionInput
+)
+from app.services.expiry_prediction.strategies.ml_regression import (
+    DEFAULT_MODEL_PATH,
+    load_regression_strategy
+)
 from app.services.expiry_prediction.strategies.rule_based import RuleBasedStrategy
+from app.services.expiry_prediction.strategies.rule_table import CompiledRules
+
+logger = logging.getLogger(__name__)
 
 
 class ExpiryPredictionService:
@@ -10,24 +38,88 @@ class ExpiryPredictionService:
     Main service for predicting food expiry dates.
 
     Orchestrates multiple prediction strategies and selects the best result.
-    Currently uses rule-based strategy; can be extended with ML models later.
+    The rule-based strategy is always available; when a trained regression
+    model exists it is registered too and becomes the default, since it
+    refines the same rules with confirmed expiry dates. The model is only
+    used while the rules in use are the version it was trained against.
     """
 
-    def __init__(self):
+    # Threads shared by all strategy comparisons
+    MAX_STRATEGY_WORKERS = 8
+
+    # Confidence kept when the category was guessed from the item name
+    INFERRED_CONFIDENCE_FACTOR = 0.9
+
+    def __init__(
+        self,
+        cache_size: int = settings.expiry_prediction_cache_size,
+        strategy_budget_ms: float = settings.expiry_strategy_budget_ms,
+        model_path: Optional[Path] = Path(settings.expiry_model_path or DEFAULT_MODEL_PATH),
+        category_inferrer: Optional[CategoryInferrer] = None
+    ):
         # Initialize available strategies
+        rule_based = RuleBasedStrategy()
+        self.rule_based = rule_based
         self.strategies = [
-            RuleBasedStrategy(),
-            # Future: MLRegressionStrategy(),
+            rule_based,
             # Future: HybridStrategy(),
         ]
-        self.default_strategy = self.strategies[0]
+        self.default_strategy = rule_based
+
+        self.regression = load_regression_strategy(model_path, rule_based)
+        if self.regression is not None:
+            self._use_regression(self.regression.trained_on(rule_based.rules))
+        self.cache = PredictionCache(cache_size)
+        self.runner = StrategyRunner(strategy_budget_ms, self.MAX_STRATEGY_WORKERS)
+        self.category_inferrer = category_inferrer or get_category_inferrer()
+
+    def _infer_category(self, name: str, category: Optional[str]) -> Optional[CategoryMatch]:
+        """Guess a category from the name when the caller gave none"""
+        if category and category.strip():
+            return None
+        return self.category_inferrer.infer(name)
+
+    def _mark_inferred(self, prediction: ExpiryPrediction, match: CategoryMatch) -> ExpiryPrediction:
+        return replace(
+            prediction,
+            confidence=round(prediction.confidence * self.INFERRED_CONFIDENCE_FACTOR, 2),
+            reasoning=f"{prediction.reasoning} (category inferred from '{match.keyword}' in the name)"
+        )
+
+    def _personalize(
+        self,
+        prediction: ExpiryPrediction,
+        adjustments: UserAdjustments,
+        category: Optional[str],
+        storage_location: Optional[str],
+        purchase_date: Optional[date]
+    ) -> ExpiryPrediction:
+        """
+        Shift a prediction by the user's offset for its (category, storage).
+
+        Offsets are measured against the rules, so the days the prediction
+        is already off the rules' date count toward them.
+        """
+        rules = self.rule_based.rules
+        category_id, storage_id, category_label, storage_label = rules.resolve(category, storage_location)
+        rule_days, _ = rules.lookup(category_id, storage_id)
+        baseline = (prediction.expiry_date - (purchase_date or date.today())).days - rule_days
+        offset = adjustments.offset_days(category_label, storage_label, baseline)
+        if not offset:
+            return prediction
+        return replace(
+            prediction,
+            expiry_date=prediction.expiry_date + timedelta(days=offset),
+            reasoning=f"{prediction.reasoning} (shifted {offset:+d} days to match your confirmed dates)"
+        )
 
     def predict_expiry(
         self,
         name: str,
         category: Optional[str] = None,
         storage_location: Optional[str] = None,
-        purchase_date: Optional[date] = None
+        purchase_date: Optional[date] = None,
+        adjustments: Optional[UserAdjustments] = None
     ) -> ExpiryPrediction:
         """
         Predict expiry date for a food item.
@@ -37,6 +129,8 @@ class ExpiryPredictionService:
             category: Food category (e.g., "dairy", "meat")
             storage_location: Storage location (e.g., "fridge", "freezer")
             purchase_date: Purchase date (defaults to today)
+            adjustments: The user's shelf-life adjustments, applied on top
+                of the shared (cached) prediction
 
         Returns:
             ExpiryPrediction with date, confidence, and reasoning
@@ -45,41 +139,206 @@ class ExpiryPredictionService:
             This method is non-blocking and will always return a prediction,
             even if inputs are incomplete (with lower confidence).
         """
-        # For now, use the rule-based strategy
-        # Later: could run multiple strategies and select highest confidence
-        prediction = self.default_strategy.predict(
-            name=name,
-            category=category,
-            storage_location=storage_location,
-            purchase_date=purchase_date
-        )
+        strategy = self.default_strategy
+        match = self._infer_category(name, category)
+        if match is not None:
+            category = match.category
+
+        def compute() -> ExpiryPrediction:
+            prediction = strategy.predict(
+                name=name,
+                category=category,
+                storage_location=storage_location,
+                purchase_date=purchase_date
+            )
+            return prediction if match is None else self._mark_inferred(prediction, match)
+
+        # Read the version before the key: if the rules are swapped in
+        # between, the entry is tagged with the older version and dropped
+        version = strategy.cache_version
+        key = strategy.cache_key(category, storage_location) if self.cache.enabled else None
+        if key is None:
+            prediction = compute()
+        else:
+            # Resolve "today" here so the key stays correct across midnight
+            purchase_date = purchase_date or date.today()
+            prediction = self.cache.get_or_compute(
+                version,
+                (strategy.name, key, purchase_date, match and match.keyword),
+                compute
+            )
 
+        if adjustments:
+            prediction = self._personalize(
+                prediction, adjustments, category, storage_location, purchase_date
+            )
         return prediction
 
+    def predict_expiry_batch(
+        self,
+        items: Sequence[ExpiryPredictionInput],
+        adjustments: Optional[UserAdjustments] = None
+    ) -> list[ExpiryPrediction]:
+        """
+        Predict expiry dates for many items in one call.
+
+        Used by bulk draft creation (receipts, grocery hauls) so the whole
+        batch is resolved before a single INSERT.
+
+        Items without a category get one inferred from their name first;
+        the user's adjustments, if given, are applied last.
+
+        Returns:
+            Predictions in the same order as items
+        """
+        matches = [self._infer_category(item.name, item.category) for item in items]
+        if any(matches):
+            items = [
+                item if match is None else replace(item, category=match.category)
+                for item, match in zip(items, matches)
+            ]
+
+        predictions = self.default_strategy.predict_expiry_batch(items)
+        if any(matches):
+            predictions = [
+                prediction if match is None else self._mark_inferred(prediction, match)
+                for prediction, match in zip(predictions, matches)
+            ]
+        if adjustments:
+            predictions = [
+                self._personalize(
+                    prediction, adjustments, item.category, item.storage_location, item.purchase_date
+                )
+                for prediction, item in zip(predictions, items)
+            ]
+        return predictions
+
+    def observe_confirmation(
+        self,
+        name: str,
+        category: str,
+        storage_location: str,
+        purchase_date: date,
+        expiry_date: date,
+        shown_expiry: Optional[date] = None
+    ) -> Optional[ShelfLifeObservation]:
+        """
+        How many days a confirmed expiry date is from the rule-based
+        prediction, for the user's running mean. None for keys with no
+        label or implausible shelf lives (likely typos).
+
+        Always measured against the rules, not the default strategy, so
+        offsets mean the same whether or not a regression model is in use.
+
+        Also None when the user kept shown_expiry, the date their draft
+        already carried: that date includes their shrunk offset, so
+        recording it would pull the mean back toward zero.
+        """
+        if shown_expiry is not None and expiry_date == shown_expiry:
+            return None
+        if not MIN_SHELF_LIFE_DAYS <= (expiry_date - purchase_date).days <= MAX_SHELF_LIFE_DAYS:
+            return None
+        _, _, category_label, storage_label = self.rule_based.rules.resolve(category, storage_location)
+        if not category_label or not storage_label:
+            return None
+        prediction = self.rule_based.predict(name, category, storage_location, purchase_date)
+        return ShelfLifeObservation(
+            category_label, storage_label, (expiry_date - prediction.expiry_date).days
+        )
+
+    @property
+    def rules_version(self):
+        """Version of the shelf-life rules currently in use"""
+        return self.rule_based.rules.version
+
+    def _use_regression(self, enabled: bool) -> None:
+        """Register the regression strategy as the default, or withdraw it"""
+        if enabled:
+            self.strategies = [self.rule_based, self.regression]
+            self.default_strategy = self.regression
+        else:
+            self.default_strategy = self.rule_based
+            self.strategies = [self.rule_based]
+
+    def swap_rules(self, rules: CompiledRules) -> None:
+        """
+        Publish a compiled rule table to the rule-based strategy (the
+        regression strategy reads it through that strategy).
+
+        The table is fully built before this call and replaced with a
+        single assignment. The regression model's corrections are only
+        valid for the rules it was trained against: if the new rules are
+        another version it is withdrawn, with a warning, until a model
+        trained on them is deployed.
+        """
+        regression = self.regression
+        matches = regression is not None and regression.trained_on(rules)
+        if regression is not None and not matches:
+            # Withdrawn before the swap so it never corrects foreign rules
+            if self.default_strategy is regression:
+                logger.warning(
+                    "Regression model was trained on shelf-life rules %s, not %s; "
+                    "predicting from the rules until it is retrained",
+                    regression.model.rules_version, rules.version
+                )
+            self._use_regression(False)
+        self.rule_based.rules = rules
+        if matches and self.default_strategy is not regression:
+            logger.info("Regression model enabled for shelf-life rules %s", rules.version)
+            self._use_regression(True)
+        self.invalidate_cache()
+
+    def invalidate_cache(self) -> None:
+        """Forget cached predictions, e.g. after shelf-life rules change"""
+        self.cache.invalidate()
+
+    def cache_stats(self) -> dict:
+        """Prediction cache hit/miss counters for monitoring"""
+        return self.cache.snapshot()
+
+    def strategy_stats(self) -> dict:
+        """Per-strategy latency, timeout and error counts from comparisons"""
+        return self.runner.snapshot()
+
     def predict_multiple_strategies(
         self,
         name: str,
         category: Optional[str] = None,
         storage_location: Optional[str] = None,
-        purchase_date: Optional[date] = None
+        purchase_date: Optional[date] = None,
+        adjustments: Optional[UserAdjustments] = None
     ) -> list[ExpiryPrediction]:
         """
         Run all available strategies and return all predictions.
         Useful for comparison and academic analysis.
 
+        Strategies run concurrently; any that miss their latency budget or
+        fail are left out (see StrategyRunner). Category inference and the
+        user's adjustments apply to every prediction, as in predict_expiry.
+
         Returns:
-            List of predictions from each strategy
+            List of predictions from each strategy that answered in time
         """
-        predictions = []
-        for strategy in self.strategies:
-            prediction = strategy.predict(
+        match = self._infer_category(name, category)
+        if match is not None:
+            category = match.category
+
+        predictions = self.runner.run(
+            self.strategies,
+            lambda strategy: strategy.predict(
                 name=name,
                 category=category,
                 storage_location=storage_location,
                 purchase_date=purchase_date
             )
-            predictions.append(prediction)
-
+        )
+        if match is not None:
+            predictions = [self._mark_inferred(prediction, match) for prediction in predictions]
+        if adjustments:
+            predictions = [
+                self._personalize(prediction, adjustments, category, storage_location, purchase_date)
+                for prediction in predictions
+            ]
         return predictions
 
     def get_best_prediction(
@@ -87,18 +346,25 @@ class ExpiryPredictionService:
         name: str,
         category: Optional[str] = None,
         storage_location: Optional[str] = None,
-        purchase_date: Optional[date] = None
+        purchase_date: Optional[date] = None,
+        adjustments: Optional[UserAdjustments] = None
     ) -> ExpiryPrediction:
         """
         Run all strategies and return the one with highest confidence.
         Useful when multiple strategies are available.
+
+        Falls back to the default strategy's own prediction if no
+        strategy answered within its budget.
         """
         predictions = self.predict_multiple_strategies(
             name=name,
             category=category,
             storage_location=storage_location,
-            purchase_date=purchase_date
+            purchase_date=purchase_date,
+            adjustments=adjustments
         )
+        if not predictions:
+            return self.predict_expiry(name, category, storage_location, purchase_date, adjustments)
 
         # Return prediction with highest confidence
         return max(predictions, key=lambda p: p.confidence)
@@ -106,3 +372,10 @@ class ExpiryPredictionService:
 
 # Singleton instance for dependency injection
 expiry_prediction_service = ExpiryPredictionService()
+
+# Applies SHELF_LIFE_RULES_PATH to the singleton; started with the app
+rules_reloader = RulesReloader(
+    expiry_prediction_service,
+    settings.shelf_life_rules_path,
+    settings.rules_reload_seconds
+)
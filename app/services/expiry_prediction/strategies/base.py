@@ -1,14 +1,15 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import date
-from typing import Optional
+from typing import Hashable, Optional, Sequence
 
 
-@dataclass
+@dataclass(frozen=True)
 class ExpiryPrediction:
     """
     Result of an expiry prediction.
     Includes the predicted date, confidence, and explanation for transparency.
+    Immutable so cached predictions can be shared between callers.
     """
     expiry_date: date
     confidence: float  # 0.0 to 1.0
@@ -16,6 +17,18 @@ class ExpiryPrediction:
     reasoning: str  # Human-readable explanation
 
 
+@dataclass
+class ExpiryPredictionInput:
+    """
+    One item in a batch prediction request.
+    Mirrors the arguments of ExpiryPredictionStrategy.predict().
+    """
+    name: str
+    category: Optional[str] = None
+    storage_location: Optional[str] = None
+    purchase_date: Optional[date] = None
+
+
 class ExpiryPredictionStrategy(ABC):
     """
     Abstract base class for expiry prediction strategies.
@@ -26,6 +39,9 @@ class ExpiryPredictionStrategy(ABC):
     - Non-blocking (never raise exceptions, return low confidence if uncertain)
     """
 
+    # Time allowed when run alongside other strategies; None = service default
+    latency_budget_ms: Optional[float] = None
+
     @abstractmethod
     def predict(
         self,
@@ -48,6 +64,47 @@ class ExpiryPredictionStrategy(ABC):
         """
         pass
 
+    def predict_expiry_batch(
+        self,
+        items: Sequence[ExpiryPredictionInput]
+    ) -> list[ExpiryPrediction]:
+        """
+        Predict expiry dates for many items.
+
+        The default calls predict() per item; strategies that can resolve
+        a whole batch at once (e.g. table lookups) should override it.
+        Must return exactly the predictions predict() would, in order.
+        """
+        return [
+            self.predict(
+                name=item.name,
+                category=item.category,
+                storage_location=item.storage_location,
+                purchase_date=item.purchase_date
+            )
+            for item in items
+        ]
+
+    def cache_key(
+        self,
+        category: Optional[str],
+        storage_location: Optional[str]
+    ) -> Optional[Hashable]:
+        """
+        Key under which predictions may be cached, or None if uncacheable.
+
+        Strategies whose output depends only on (category, storage,
+        purchase_date) return a normalized key so equivalent inputs share
+        a cache entry; the purchase date is added by the caller. The
+        default opts out (e.g. strategies that read the item name).
+        """
+        return None
+
+    @property
+    def cache_version(self) -> Hashable:
+        """Changes whenever cached predictions become stale (e.g. new rules)"""
+        return None
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -0,0 +1,256 @@
+"""
+Regression correction on top of the shelf-life rules.
+
+The model learns how far confirmed expiry dates land from what the rules
+predict, as an additive ridge regression over one-hot features:
+
+    actual_days - rule_days ~ intercept + category effect + storage effect
+
+Coefficients are trained offline (see expiry_prediction.training) and
+published as a model directory holding a small .npy file and a JSON file
+naming each feature:
+
+    coefficients.npy row 0: coefficients  [intercept, category..., storage...]
+    coefficients.npy row 1: training rows that had each feature
+
+The model path is a symlink to the current versioned directory, so the
+trainer publishes both files with one atomic rename and a reader never
+pairs coefficients with another version's feature names.
+
+The .npy is memory-mapped read-only at startup. Effects are gathered once
+into a (category_id, storage_id) table of corrected days and confidence
+matching the current rule ids, so inference costs the same as a rule
+lookup. A model that cannot be read is skipped with a warning and the
+service keeps predicting from the rules.
+
+The model also records the version of the rules it was trained against;
+its corrections are residuals of those rules, so the service only uses
+it while the same version is in use (see trained_on).
+"""
+import json
+import logging
+from pathlib import Path
+from datetime import date, timedelta
+from typing import Hashable, Optional, Sequence
+
+import numpy as np
+
+from app.services.expiry_prediction.strategies.base import (
+    ExpiryPrediction,
+    ExpiryPredictionInput,
+    ExpiryPredictionStrategy
+)
+from app.services.expiry_prediction.strategies.rule_based import RuleBasedStrategy, predict_by_key
+from app.services.expiry_prediction.strategies.rule_table import CompiledRules
+
+logger = logging.getLogger(__name__)
+
+# Trained model location unless EXPIRY_MODEL_PATH is set (not shipped)
+DEFAULT_MODEL_PATH = Path(__file__).resolve().parent.parent / "data" / "expiry_regression"
+
+# Files inside a published model directory
+COEFFICIENTS_FILE = "coefficients.npy"
+METADATA_FILE = "model.json"
+
+# Feature name used for inputs the rules do not recognize
+UNKNOWN_FEATURE = "__unknown__"
+
+# Training rows at which a correction earns half of the confidence boost
+PRIOR_SAMPLES = 20
+# Ceiling on confidence, however much data backs a correction
+MAX_CONFIDENCE = 0.95
+
+
+class RegressionModel:
+    """Memory-mapped coefficients with their feature names"""
+
+    def __init__(self, path: Path):
+        # Resolved once, so both files come from the same published version
+        path = Path(path).resolve()
+        self.coefficients = np.load(path / COEFFICIENTS_FILE, mmap_mode="r")
+        metadata = json.loads((path / METADATA_FILE).read_text())
+        self.categories: list[str] = metadata["categories"]
+        self.storages: list[str] = metadata["storages"]
+        self.samples: int = metadata["samples"]
+        self.rmse: float = metadata["rmse"]
+        self.version: str = metadata["trained_at"]
+        # Models without it predate the check and match no rules
+        self.rules_version: Optional[str] = metadata.get("rules_version")
+
+        expected = (2, 1 + len(self.categories) + len(self.storages))
+        if self.coefficients.shape != expected:
+            raise ValueError(f"{path}: expected shape {expected}, got {self.coefficients.shape}")
+
+    def _effects(self, names: list, features: list[str], offset: int) -> tuple[np.ndarray, np.ndarray]:
+        """Coefficient and support per rule id (zero for unseen names)"""
+        index = {feature: offset + i for i, feature in enumerate(features)}
+        positions = np.array(
+            [index.get(name or UNKNOWN_FEATURE, -1) for name in names], dtype=np.intp
+        )
+        known = positions >= 0
+        weights = np.zeros(len(names))
+        support = np.zeros(len(names))
+        weights[known] = self.coefficients[0, positions[known]]
+        support[known] = self.coefficients[1, positions[known]]
+        return weights, support
+
+    def correction_table(self, rules: CompiledRules) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Day corrections and supporting sample counts per
+        (category_id, storage_id) of the given rules.
+        """
+        category_weights, category_support = self._effects(
+            rules.categories.names, self.categories, 1
+        )
+        storage_weights, storage_support = self._effects(
+            rules.storages.names, self.storages, 1 + len(self.categories)
+        )
+        corrections = self.coefficients[0, 0] + category_weights[:, None] + storage_weights[None, :]
+        support = np.minimum(category_support[:, None], storage_support[None, :])
+        return np.rint(corrections).astype(np.int64), support
+
+
+class MLRegressionStrategy(ExpiryPredictionStrategy):
+    """
+    Rule prediction adjusted by a learned per-(category, storage) offset.
+
+    Shares the compiled rules of the given rule-based strategy; if those
+    are replaced, the correction table is rebuilt on next use. Callers
+    check trained_on() first: corrections for another rules version are
+    not meaningful.
+    """
+
+    def __init__(self, model: RegressionModel, base: RuleBasedStrategy):
+        self.model = model
+        self.base = base
+        # (rules, cells) swapped as one tuple so readers never mix tables
+        self._state: tuple[Optional[CompiledRules], list] = (None, [])
+
+    def trained_on(self, rules: CompiledRules) -> bool:
+        """Whether the model's corrections were learned against these rules"""
+        return self.model.rules_version is not None and self.model.rules_version == rules.version
+
+    def _cells(self, rules: CompiledRules) -> list[list[tuple[int, float, int]]]:
+        """(days, confidence, correction) per (category_id, storage_id)"""
+        state_rules, cells = self._state
+        if state_rules is rules:
+            return cells
+
+        corrections, support = self.model.correction_table(rules)
+        # A correction never predicts expiry before the purchase day
+        days = np.maximum(rules.days + corrections, 0)
+        weight = support / (support + PRIOR_SAMPLES)
+        confidence = rules.confidence + (MAX_CONFIDENCE - rules.confidence) * weight / 2
+        confidence = np.maximum(confidence, rules.confidence).round(2)
+
+        cells = [
+            list(zip(*rows))
+            for rows in zip(days.tolist(), confidence.tolist(), corrections.tolist())
+        ]
+        self._state = (rules, cells)
+        return cells
+
+    def _key_predictions(
+        self,
+        rules: CompiledRules,
+        resolved: list
+    ) -> tuple[np.ndarray, list[float], list[str]]:
+        cells = self._cells(rules)
+        key_days, key_confidence, key_reasoning = [], [], []
+        for category_id, storage_id, category, storage in resolved:
+            days, confidence, correction = cells[category_id][storage_id]
+            key_days.append(days)
+            key_confidence.append(confidence)
+            key_reasoning.append(self._generate_reasoning(category, storage, days, correction))
+        return np.array(key_days, dtype=np.int64), key_confidence, key_reasoning
+
+    def predict(
+        self,
+        name: str,
+        category: Optional[str] = None,
+        storage_location: Optional[str] = None,
+        purchase_date: Optional[date] = None
+    ) -> ExpiryPrediction:
+        """Rule prediction plus the learned correction for its key"""
+        if purchase_date is None:
+            purchase_date = date.today()
+
+        rules = self.base.rules
+        category_id, storage_id, category_label, storage_label = rules.resolve(
+            category, storage_location
+        )
+        days, confidence, correction = self._cells(rules)[category_id][storage_id]
+
+        return ExpiryPrediction(
+            expiry_date=purchase_date + timedelta(days=days),
+            confidence=confidence,
+            strategy_name=self.name,
+            reasoning=self._generate_reasoning(category_label, storage_label, days, correction)
+        )
+
+    def predict_expiry_batch(
+        self,
+        items: Sequence[ExpiryPredictionInput]
+    ) -> list[ExpiryPrediction]:
+        return predict_by_key(items, self.base.rules, self._key_predictions, self.name)
+
+    def cache_key(
+        self,
+        category: Optional[str],
+        storage_location: Optional[str]
+    ) -> Hashable:
+        return self.base.rules.resolve(category, storage_location)
+
+    @property
+    def cache_version(self) -> Hashable:
+        return (self.base.cache_version, self.model.version)
+
+    def _generate_reasoning(
+        self,
+        category: Optional[str],
+        storage: Optional[str],
+        days: int,
+        correction: int
+    ) -> str:
+        if category and storage:
+            basis = f"category '{category}' stored in '{storage}'"
+        elif storage:
+            basis = f"storage in '{storage}' (category unknown)"
+        else:
+            basis = "items without category or storage"
+
+        if correction == 0:
+            return f"Confirmed expiry dates for {basis} match the shelf-life rules: {days} days"
+        return (
+            f"Confirmed expiry dates for {basis} run {abs(correction)} days "
+            f"{'longer' if correction > 0 else 'shorter'} than the rules: estimated {days} days"
+        )
+
+    @property
+    def name(self) -> str:
+        return "ml_regression"
+
+
+def load_regression_strategy(
+    path: Optional[Path],
+    base: RuleBasedStrategy
+) -> Optional[MLRegressionStrategy]:
+    """
+    The trained strategy, or None when no model has been trained or the
+    published one cannot be read (logged; predictions fall back to rules).
+    """
+    if path is None or not Path(path).exists():
+        return None
+    try:
+        model = RegressionModel(path)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning("Ignoring regression model %s, using rule-based predictions: %s", path, e)
+        return None
+    strategy = MLRegressionStrategy(model, base)
+    if not strategy.trained_on(base.rules):
+        logger.warning(
+            "Regression model %s was trained on shelf-life rules %s, not %s; "
+            "it is used only once those rules are loaded",
+            path, model.rules_version, base.rules.version
+        )
+    return strategy
@@ -1,10 +1,65 @@
 from datetime import date, timedelta
-from typing import Optional
+from typing import Callable, Hashable, Optional, Sequence
+
+import numpy as np
 
 from app.services.expiry_prediction.strategies.base import (
     ExpiryPredictionStrategy,
-    ExpiryPrediction
+    ExpiryPrediction,
+    ExpiryPredictionInput
 )
+from app.services.expiry_prediction.strategies.rule_table import CompiledRules
+
+
+# date.toordinal() of the datetime64 epoch (1970-01-01)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def predict_by_key(
+    items: Sequence[ExpiryPredictionInput],
+    rules: CompiledRules,
+    key_predictions: Callable[[CompiledRules, list], tuple[np.ndarray, list[float], list[str]]],
+    strategy_name: str
+) -> list[ExpiryPrediction]:
+    """
+    Batch prediction for strategies whose output depends only on the
+    (category, storage) key and the purchase date.
+
+    Items are factorized by their raw (category, storage) pair, so alias
+    resolution and key_predictions() run once per distinct key (a receipt
+    has a handful). Per-key days are then added to the purchase dates in
+    one vectorized step.
+    """
+    if not items:
+        return []
+
+    today = date.today().toordinal()
+    raw_codes = {}
+    codes = [
+        raw_codes.setdefault((item.category, item.storage_location), len(raw_codes))
+        for item in items
+    ]
+    purchase_days = np.fromiter(
+        (item.purchase_date.toordinal() if item.purchase_date else today for item in items),
+        dtype=np.int64,
+        count=len(items)
+    )
+
+    resolved = [rules.resolve(category, storage) for category, storage in raw_codes]
+    key_days, key_confidence, key_reasoning = key_predictions(rules, resolved)
+
+    expiry_days = purchase_days + key_days[np.array(codes)]
+    expiry_dates = (expiry_days - _EPOCH_ORDINAL).astype("datetime64[D]").tolist()
+
+    return [
+        ExpiryPrediction(
+            expiry_date=expiry_date,
+            confidence=key_confidence[code],
+            strategy_name=strategy_name,
+            reasoning=key_reasoning[code]
+        )
+        for expiry_date, code in zip(expiry_dates, codes)
+    ]
 
 
 class RuleBasedStrategy(ExpiryPredictionStrategy):
@@ -89,6 +144,69 @@ class RuleBasedStrategy(ExpiryPredictionStrategy):
     # Absolute fallback
     DEFAULT_PREDICTION = (7, 0.30)  # 1 week, low confidence
 
+    # Alternative spellings, synonyms and Open Food Facts category names.
+    # Matched against the whole input first, then its individual words.
+    CATEGORY_ALIASES = {
+        "dairy": [
+            "dairies", "dairy products", "milk", "milks", "milk products",
+            "fermented milk products", "cheese", "cheeses", "yogurt", "yoghurt",
+            "yogurts", "butter", "cream",
+        ],
+        "meat": [
+            "meats", "meat products", "beef", "pork", "lamb", "veal", "mince",
+            "sausage", "sausages", "ham", "bacon",
+        ],
+        "poultry": ["poultries", "chicken", "chickens", "turkey", "duck"],
+        "fish": [
+            "fishes", "seafood", "seafoods", "fish and seafood", "salmon", "tuna",
+            "shrimp", "prawns", "shellfish",
+        ],
+        "produce": ["fresh produce"],
+        "vegetables": [
+            "vegetable", "veg", "veggie", "veggies", "greens", "salad", "salads",
+            "lettuce", "carrot", "carrots", "tomato", "tomatoes",
+        ],
+        "fruits": ["fruit", "berries", "apple", "apples", "banana", "bananas", "citrus"],
+        "bakery": ["baked goods", "pastry", "pastries", "cakes", "biscuits"],
+        "bread": ["breads", "loaf", "rolls", "buns"],
+        "eggs": ["egg"],
+        "condiments": [
+            "condiment", "sauce", "sauces", "ketchup", "mustard", "mayonnaise",
+            "dressing", "dressings", "spreads",
+        ],
+        "canned": [
+            "canned goods", "canned foods", "tinned", "tins", "preserved",
+            "preserves", "conserves",
+        ],
+        "frozen": ["frozen foods", "frozen food"],
+    }
+
+    STORAGE_ALIASES = {
+        "fridge": ["refrigerator", "refrigerated", "chiller", "cooler"],
+        "freezer": ["frozen", "deep freeze", "deep freezer"],
+        "pantry": [
+            "cupboard", "cabinet", "larder", "shelf", "counter", "countertop",
+            "room temperature", "ambient", "dry storage",
+        ],
+    }
+
+    def __init__(self, rules: Optional[CompiledRules] = None):
+        # Replaced wholesale on reload (see rules_file); readers take one
+        # reference per prediction so they never mix two tables.
+        self.rules = rules or self.builtin_rules()
+
+    @classmethod
+    def builtin_rules(cls) -> CompiledRules:
+        """The rule tables defined on this class"""
+        return CompiledRules(
+            cls.SHELF_LIFE_RULES,
+            cls.STORAGE_DEFAULTS,
+            cls.DEFAULT_PREDICTION,
+            cls.CATEGORY_ALIASES,
+            cls.STORAGE_ALIASES,
+            version="builtin"
+        )
+
     def predict(
         self,
         name: str,
@@ -103,12 +221,12 @@ class RuleBasedStrategy(ExpiryPredictionStrategy):
         if purchase_date is None:
             purchase_date = date.today()
 
-        # Normalize inputs
-        category_normalized = category.lower().strip() if category else None
-        storage_normalized = storage_location.lower().strip() if storage_location else None
-
-        # Try exact match first
-        days, confidence = self._lookup_shelf_life(category_normalized, storage_normalized)
+        # Resolve aliases to rule table ids
+        rules = self.rules
+        category_id, storage_id, category_normalized, storage_normalized = rules.resolve(
+            category, storage_location
+        )
+        days, confidence = rules.lookup(category_id, storage_id)
 
         # Calculate expiry date
         expiry_date = purchase_date + timedelta(days=days)
@@ -125,29 +243,45 @@ class RuleBasedStrategy(ExpiryPredictionStrategy):
             reasoning=reasoning
         )
 
-    def _lookup_shelf_life(
+    def predict_expiry_batch(
         self,
-        category: Optional[str],
-        storage: Optional[str]
-    ) -> tuple[int, float]:
+        items: Sequence[ExpiryPredictionInput]
+    ) -> list[ExpiryPrediction]:
         """
-        Lookup shelf life with graceful fallbacks:
-        1. Try (category, storage) exact match
-        2. Try storage-only default
-        3. Use absolute default
+        Vectorized batch prediction; days and confidence for all distinct
+        keys are gathered from the dense rule table at once.
         """
-        # Try exact match
-        if category and storage:
-            key = (category, storage)
-            if key in self.SHELF_LIFE_RULES:
-                return self.SHELF_LIFE_RULES[key]
+        return predict_by_key(items, self.rules, self._key_predictions, self.name)
 
-        # Fallback to storage location only
-        if storage and storage in self.STORAGE_DEFAULTS:
-            return self.STORAGE_DEFAULTS[storage]
+    def _key_predictions(
+        self,
+        rules: CompiledRules,
+        resolved: list[tuple[int, int, Optional[str], Optional[str]]]
+    ) -> tuple[np.ndarray, list[float], list[str]]:
+        """(days, confidence, reasoning) for each resolved key"""
+        category_ids = np.array([r[0] for r in resolved], dtype=np.intp)
+        storage_ids = np.array([r[1] for r in resolved], dtype=np.intp)
+        key_days = rules.days[category_ids, storage_ids]
+        key_confidence = rules.confidence[category_ids, storage_ids].tolist()
+        # Reasoning depends only on the key, never on the item name
+        key_reasoning = [
+            self._generate_reasoning(None, category, storage, days, confidence)
+            for (_, _, category, storage), days, confidence
+            in zip(resolved, key_days.tolist(), key_confidence)
+        ]
+        return key_days, key_confidence, key_reasoning
 
-        # Absolute fallback
-        return self.DEFAULT_PREDICTION
+    def cache_key(
+        self,
+        category: Optional[str],
+        storage_location: Optional[str]
+    ) -> Hashable:
+        # Resolved ids plus the labels shown in the reasoning text
+        return self.rules.resolve(category, storage_location)
+
+    @property
+    def cache_version(self) -> Hashable:
+        return self.rules.version
 
     def _generate_reasoning(
         self,
@@ -0,0 +1,146 @@
+"""
+Compiled shelf-life rule table.
+
+The (category, storage) -> (days, confidence) rules are compiled once into
+interned integer ids and a dense 2-D table indexed by
+(category_id, storage_id). Id 0 on each axis means "unknown"; the
+storage-only and absolute fallbacks are baked into those cells, so a
+lookup is two id resolutions and one index, never a chain of dict probes.
+
+Free-text categories and storage locations ("Refrigerator", "veg",
+"en:fermented-milk-products") resolve through alias tables: first the
+whole normalized phrase, then its words from last to first (the head noun
+of "frozen chicken" is "chicken"). Resolution is memoized per raw string,
+so a repeated input costs one cache hit.
+"""
+import re
+from functools import lru_cache
+from typing import Hashable, Mapping, Optional
+
+import numpy as np
+
+# Id of the "unknown" row/column in the dense table
+UNKNOWN = 0
+
+# Raw strings remembered per axis
+RESOLVE_CACHE_SIZE = 4096
+
+_LANGUAGE_PREFIX = re.compile(r"^[a-z]{2}:")
+_SEPARATORS = re.compile(r"[\s\-_/,.]+")
+
+
+def _label(value: Optional[str]) -> Optional[str]:
+    """The input as shown in reasoning text (lowercased and trimmed)"""
+    return value.lower().strip() if value else None
+
+
+def _match_key(value: str) -> str:
+    """Aggressive normalization used only for alias matching"""
+    value = _LANGUAGE_PREFIX.sub("", value.lower().strip())
+    return " ".join(_SEPARATORS.split(value)).strip()
+
+
+def _singular(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+class _Axis:
+    """Interned names and aliases for one dimension of the table"""
+
+    def __init__(self, names: list[str], aliases: Mapping[str, list[str]]):
+        self.names = [None] + names
+        self.ids = {name: i for i, name in enumerate(self.names) if name}
+        for canonical, alternatives in aliases.items():
+            if canonical not in self.ids:
+                raise ValueError(f"Alias target '{canonical}' has no rules")
+            for alias in alternatives:
+                self.ids.setdefault(_match_key(alias), self.ids[canonical])
+        self.resolve = lru_cache(maxsize=RESOLVE_CACHE_SIZE)(self._resolve)
+
+    def _lookup(self, key: str) -> int:
+        found = self.ids.get(key)
+        if found is None:
+            found = self.ids.get(_singular(key), UNKNOWN)
+        return found
+
+    def _resolve(self, value: Optional[str]) -> tuple[int, Optional[str]]:
+        """
+        Map a raw string to (id, label). Known inputs are labelled with
+        their canonical name; unknown ones keep the caller's text.
+        """
+        label = _label(value)
+        if not label:
+            return UNKNOWN, label
+
+        key = _match_key(label)
+        found = self._lookup(key)
+        if found == UNKNOWN:
+            for word in reversed(key.split()):
+                found = self._lookup(word)
+                if found != UNKNOWN:
+                    break
+
+        if found == UNKNOWN:
+            return UNKNOWN, label
+        return found, self.names[found]
+
+
+class CompiledRules:
+    """
+    Dense shelf-life lookup built from the rule dictionaries.
+
+    days/confidence are (categories + 1) x (storages + 1) numpy arrays for
+    vectorized gathers; cells holds the same values as nested tuples,
+    which is faster than numpy scalar indexing for a single lookup.
+    """
+
+    def __init__(
+        self,
+        rules: Mapping[tuple[str, str], tuple[int, float]],
+        storage_defaults: Mapping[str, tuple[int, float]],
+        default: tuple[int, float],
+        category_aliases: Mapping[str, list[str]],
+        storage_aliases: Mapping[str, list[str]],
+        version: Hashable = None
+    ):
+        self.version = version
+        categories = sorted({category for category, _ in rules})
+        storages = sorted({storage for _, storage in rules} | set(storage_defaults))
+        self.categories = _Axis(categories, category_aliases)
+        self.storages = _Axis(storages, storage_aliases)
+
+        shape = (len(self.categories.names), len(self.storages.names))
+        self.days = np.empty(shape, dtype=np.int64)
+        self.confidence = np.empty(shape, dtype=np.float64)
+
+        for storage_id, storage in enumerate(self.storages.names):
+            fallback = storage_defaults.get(storage, default) if storage else default
+            for category_id, category in enumerate(self.categories.names):
+                cell = default
+                if category and storage:
+                    cell = rules.get((category, storage), fallback)
+                elif storage:
+                    cell = fallback
+                self.days[category_id, storage_id], self.confidence[category_id, storage_id] = cell
+
+        self.cells = [
+            list(zip(days_row, confidence_row))
+            for days_row, confidence_row in zip(self.days.tolist(), self.confidence.tolist())
+        ]
+
+    def resolve(
+        self,
+        category: Optional[str],
+        storage: Optional[str]
+    ) -> tuple[int, int, Optional[str], Optional[str]]:
+        """Return (category_id, storage_id, category_label, storage_label)"""
+        category_id, category_label = self.categories.resolve(category)
+        storage_id, storage_label = self.storages.resolve(storage)
+        return category_id, storage_id, category_label, storage_label
+
+    def lookup(self, category_id: int, storage_id: int) -> tuple[int, float]:
+        return self.cells[category_id][storage_id]
@@ -0,0 +1,241 @@
+"""
+Offline trainer for the regression expiry strategy.
+
+Streams confirmed inventory rows through a server-side cursor and
+accumulates the normal equations (X^T X, X^T y) of the one-hot model in
+MLRegressionStrategy, so memory stays constant however many rows are
+read. The shelf life a user confirmed is expiry_date - created_at; the
+target is its difference from what the rules predict for the same key.
+
+Training uses the rules the service predicts with: the rule file at
+SHELF_LIFE_RULES_PATH when one is configured (or --rules), otherwise the
+built-in tables. Their version is saved with the model, which is only
+used while that version is loaded.
+
+    python -m app.services.expiry_prediction.training
+    python -m app.services.expiry_prediction.training --output model --ridge 5
+    python -m app.services.expiry_prediction.training --rules rules.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import session_scope
+from app.models.inventory_item import InventoryItem
+from app.services.expiry_prediction.adjustments import MAX_SHELF_LIFE_DAYS, MIN_SHELF_LIFE_DAYS
+from app.services.expiry_prediction.rules_file import RuleFileError, load_rules_file
+from app.services.expiry_prediction.strategies.ml_regression import (
+    COEFFICIENTS_FILE,
+    DEFAULT_MODEL_PATH,
+    METADATA_FILE,
+    UNKNOWN_FEATURE
+)
+from app.services.expiry_prediction.strategies.rule_based import RuleBasedStrategy
+from app.services.expiry_prediction.strategies.rule_table import CompiledRules
+
+# Rows fetched per round-trip while streaming
+TRAINING_PARTITION_SIZE = 5000
+
+
+class NormalEquations:
+    """
+    Running X^T X and X^T y for an intercept plus one-hot category and
+    storage features. Every row has exactly three active features, so a
+    chunk updates both with np.bincount over feature index pairs.
+    """
+
+    def __init__(self, rules: CompiledRules):
+        self.rules = rules
+        self.n_categories = len(rules.categories.names)
+        self.n_features = 1 + self.n_categories + len(rules.storages.names)
+        self.xtx = np.zeros((self.n_features, self.n_features))
+        self.xty = np.zeros(self.n_features)
+        self.yty = 0.0
+        self.samples = 0
+
+    def add(self, category_ids: np.ndarray, storage_ids: np.ndarray, residuals: np.ndarray) -> None:
+        if not len(residuals):
+            return
+        active = np.stack([
+            np.zeros_like(category_ids),
+            1 + category_ids,
+            1 + self.n_categories + storage_ids,
+        ], axis=1)
+
+        size = self.n_features
+        pairs = (active[:, :, None] * size + active[:, None, :]).ravel()
+        self.xtx += np.bincount(pairs, minlength=size * size).reshape(size, size)
+        for column in range(active.shape[1]):
+            self.xty += np.bincount(active[:, column], weights=residuals, minlength=size)
+        self.yty += float(residuals @ residuals)
+        self.samples += len(residuals)
+
+    def add_rows(self, rows: Iterable[tuple]) -> None:
+        """Add (category, storage_location, created_at, expiry_date) rows"""
+        category_ids, storage_ids, shelf_lives = [], [], []
+        for category, storage, created_at, expiry_date in rows:
+            shelf_life = (expiry_date - created_at.date()).days
+            if not MIN_SHELF_LIFE_DAYS <= shelf_life <= MAX_SHELF_LIFE_DAYS:
+                continue
+            category_id, storage_id, _, _ = self.rules.resolve(category, storage)
+            category_ids.append(category_id)
+            storage_ids.append(storage_id)
+            shelf_lives.append(shelf_life)
+
+        category_ids = np.array(category_ids, dtype=np.intp)
+        storage_ids = np.array(storage_ids, dtype=np.intp)
+        residuals = np.array(shelf_lives, dtype=np.float64) - self.rules.days[category_ids, storage_ids]
+        self.add(category_ids, storage_ids, residuals)
+
+    def solve(self, ridge: float) -> tuple[np.ndarray, float]:
+        """
+        Ridge solution (intercept unpenalized) and its training RMSE.
+        Features never seen get a zero coefficient.
+        """
+        penalty = np.full(self.n_features, ridge)
+        penalty[0] = 0.0
+        coefficients = np.linalg.lstsq(self.xtx + np.diag(penalty), self.xty, rcond=None)[0]
+        # Residual sum of squares from the accumulated moments
+        sse = self.yty - 2 * coefficients @ self.xty + coefficients @ self.xtx @ coefficients
+        rmse = float(np.sqrt(max(sse, 0.0) / self.samples)) if self.samples else 0.0
+        return coefficients, rmse
+
+    def support(self) -> np.ndarray:
+        """Training rows per feature (the diagonal of X^T X)"""
+        return np.diag(self.xtx).copy()
+
+
+def _feature_names(names: list[Optional[str]]) -> list[str]:
+    return [name or UNKNOWN_FEATURE for name in names]
+
+
+def _prune_versions(output: Path, keep: set[str]) -> None:
+    """Remove published model directories other than those in keep"""
+    for path in output.parent.glob(f"{output.name}.*"):
+        if path.is_dir() and not path.is_symlink() and path.name not in keep:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def check_output(output: Path) -> None:
+    """Raise FileExistsError unless output is free or a published model link"""
+    if output.exists() and not output.is_symlink():
+        raise FileExistsError(
+            f"{output} exists and is not a model symlink; move it away to publish there"
+        )
+
+
+def save_model(equations: NormalEquations, ridge: float, output: Path) -> dict:
+    """
+    Publish coefficients (.npy) and feature names (.json) as one version.
+
+    Both files are written into a new versioned directory, then the
+    output symlink is pointed at it with a single rename, so a worker
+    loading mid-write sees either the old pair or the new one. The
+    previous version is kept for workers that still have it mapped;
+    older ones are removed. If publishing fails, the new version is
+    removed and output is left as it was.
+    """
+    coefficients, rmse = equations.solve(ridge)
+    array = np.stack([coefficients, equations.support()])
+
+    metadata = {
+        "categories": _feature_names(equations.rules.categories.names),
+        "storages": _feature_names(equations.rules.storages.names),
+        "samples": equations.samples,
+        "rmse": rmse,
+        "ridge": ridge,
+        "rules_version": equations.rules.version,
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+    output = Path(output)
+    check_output(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    version = Path(tempfile.mkdtemp(dir=output.parent, prefix=f"{output.name}."))
+    link = output.parent / f".{version.name}.link"
+    try:
+        os.chmod(version, 0o755)
+        np.save(version / COEFFICIENTS_FILE, array)
+        (version / METADATA_FILE).write_text(json.dumps(metadata, indent=2))
+
+        previous = os.readlink(output) if output.is_symlink() else None
+        os.symlink(version.name, link)
+        os.replace(link, output)
+    except BaseException:
+        link.unlink(missing_ok=True)
+        shutil.rmtree(version, ignore_errors=True)
+        raise
+
+    _prune_versions(output, {version.name, previous and Path(previous).name})
+    return metadata
+
+
+async def accumulate_from_inventory(
+    rules: CompiledRules,
+    since: Optional[datetime] = None
+) -> NormalEquations:
+    """Stream confirmed inventory rows into the normal equations"""
+    equations = NormalEquations(rules)
+    query = select(
+        InventoryItem.category,
+        InventoryItem.storage_location,
+        InventoryItem.created_at,
+        InventoryItem.expiry_date,
+    )
+    if since is not None:
+        query = query.where(InventoryItem.created_at >= since)
+
+    async with session_scope(read_only=True) as db:
+        result = await db.stream(query)
+        async for partition in result.partitions(TRAINING_PARTITION_SIZE):
+            equations.add_rows(partition)
+    return equations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the regression expiry strategy")
+    parser.add_argument(
+        "--output", type=Path, default=Path(settings.expiry_model_path or DEFAULT_MODEL_PATH)
+    )
+    parser.add_argument(
+        "--rules", type=Path, default=settings.shelf_life_rules_path,
+        help="Rule file to train against (default: SHELF_LIFE_RULES_PATH, else the built-in rules)"
+    )
+    parser.add_argument("--ridge", type=float, default=10.0, help="L2 penalty on category/storage effects")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Only rows confirmed after this time")
+    args = parser.parse_args()
+
+    try:
+        rules = load_rules_file(args.rules) if args.rules else RuleBasedStrategy.builtin_rules()
+        # Checked before training too, so a bad --output fails fast
+        check_output(args.output)
+    except RuleFileError as e:
+        raise SystemExit(f"Invalid shelf-life rules: {e}")
+    except FileExistsError as e:
+        raise SystemExit(str(e))
+    equations = asyncio.run(accumulate_from_inventory(rules, args.since))
+    if not equations.samples:
+        raise SystemExit("No confirmed inventory rows to train on")
+
+    try:
+        metadata = save_model(equations, args.ridge, args.output)
+    except FileExistsError as e:
+        raise SystemExit(str(e))
+    print(
+        f"Trained on {metadata['samples']:,} rows against rules {metadata['rules_version']}, "
+        f"RMSE {metadata['rmse']:.2f} days -> {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+# Export services module
+from app.services.export.inventory_export import (
+    EXPORT_FORMATS,
+    stream_inventory_export
+)
+
+__all__ = ["EXPORT_FORMATS", "stream_inventory_export"]
@@ -0,0 +1,48 @@
+"""
+Expiry enrichment shared by every path that creates DraftItems.
+
+Drafts without an expiration date get a predicted one, with the
+prediction's confidence and reasoning recorded so the user can see
+where the date came from before confirming.
+"""
+from typing import Optional
+
+from app.services.expiry_prediction import (
+    ExpiryPrediction,
+    ExpiryPredictionInput,
+    expiry_prediction_service
+)
+from app.services.expiry_prediction.adjustments import UserAdjustments
+
+
+def apply_prediction(draft_data: dict, prediction: ExpiryPrediction) -> None:
+    """Enrich draft data with a predicted expiry date"""
+    draft_data["expiration_date"] = prediction.expiry_date
+
+    # Update confidence if not set or lower than prediction
+    if draft_data.get("confidence_score") is None:
+        draft_data["confidence_score"] = prediction.confidence
+
+    # Add prediction source to notes if not already present
+    if draft_data.get("notes"):
+        draft_data["notes"] += f"\n[Auto-predicted: {prediction.reasoning}]"
+    else:
+        draft_data["notes"] = f"[Auto-predicted: {prediction.reasoning}]"
+
+
+def predict_missing_expiry(rows: list[dict], adjustments: Optional[UserAdjustments] = None) -> None:
+    """Predict expiry for every draft row lacking one, in a single batch call"""
+    to_predict = [row for row in rows if row.get("expiration_date") is None]
+    if not to_predict:
+        return
+
+    predictions = expiry_prediction_service.predict_expiry_batch([
+        ExpiryPredictionInput(
+            name=row["name"],
+            category=row.get("category"),
+            storage_location=row.get("location")
+        )
+        for row in to_predict
+    ], adjustments)
+    for row, prediction in zip(to_predict, predictions):
+        apply_prediction(row, prediction)
@@ -0,0 +1,239 @@
+"""
+Bulk import of DraftItems from CSV or NDJSON files.
+
+Used to migrate households from other apps. The upload is parsed
+incrementally in fixed-size chunks; each chunk is validated row by row,
+enriched with one batched expiry prediction, and written in a single
+bulk operation:
+- Postgres: COPY draft_items FROM STDIN (psycopg2) or
+  copy_records_to_table (asyncpg)
+- Other databases (SQLite in tests): executemany INSERT
+
+Invalid rows are reported with their row number and skipped; they never
+abort the rest of the file. Each chunk is committed on its own so a large
+import does not hold one long transaction.
+"""
+import csv
+import io
+import json
+import uuid
+from dataclasses import dataclass, field
+from typing import BinaryIO, Iterator, Optional
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from starlette.concurrency import run_in_threadpool
+
+from app.core.versioning import DRAFTS, bump_versions
+from app.models.draft_item import DraftItem
+from app.schemas.draft_item import DraftItemCreate
+from app.services.expiry_prediction.personalization import user_adjustments
+from app.services.ingestion.draft_enrichment import predict_missing_expiry
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# Rows parsed, predicted and written per round-trip
+IMPORT_CHUNK_SIZE = 1000
+
+# Cap on errors echoed back; the total is always reported
+MAX_REPORTED_ERRORS = 500
+
+INVALID_UTF8 = "Row is not valid UTF-8"
+
+# Columns written by COPY; id is generated here, timestamps use server defaults
+COPY_COLUMNS = (
+    "id", "user_id", "name", "quantity", "unit", "expiration_date", "category",
+    "location", "notes", "source", "confidence_score",
+)
+
+
+@dataclass
+class ImportRowError:
+    """A rejected input row (1-based, excluding any CSV header)"""
+    row: int
+    detail: str
+
+
+@dataclass
+class ImportResult:
+    """Outcome of a file import"""
+    imported: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+
+    def add_error(self, row: int, detail: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(ImportRowError(row=row, detail=detail))
+
+
+def _undecodable(value) -> bool:
+    """True if decoding replaced invalid bytes in value"""
+    if isinstance(value, list):  # Extra CSV cells
+        return any(_undecodable(v) for v in value)
+    return isinstance(value, str) and "\ufffd" in value
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    """Guess the import format from the upload's name or content type"""
+    name = (filename or "").lower()
+    content_type = (content_type or "").lower()
+    if name.endswith(".csv") or "csv" in content_type:
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in content_type or "jsonl" in content_type:
+        return "ndjson"
+    return None
+
+
+def _iter_raw_rows(file: BinaryIO, import_format: str) -> Iterator[tuple[int, object]]:
+    """
+    Yield (row_number, raw_row) pairs without reading the whole file.
+    raw_row is a dict, or an error message string for unparseable lines.
+
+    Bytes that are not valid UTF-8 are decoded as U+FFFD and the rows
+    containing them rejected. A CSV the parser cannot continue past
+    (e.g. an oversized field) ends the import at that row; the
+    rows before it are still imported.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", errors="replace", newline="")
+
+    if import_format == "csv":
+        row_number = 0
+        try:
+            for row_number, row in enumerate(csv.DictReader(text), start=1):
+                if any(_undecodable(k) or _undecodable(v) for k, v in row.items()):
+                    yield row_number, INVALID_UTF8
+                    continue
+                # Empty CSV cells mean "not provided"
+                yield row_number, {k: (v if v != "" else None) for k, v in row.items() if k}
+        except csv.Error as e:
+            yield row_number + 1, f"Unreadable CSV, import stopped: {e}"
+        return
+
+    row_number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        row_number += 1
+        if _undecodable(line):
+            yield row_number, INVALID_UTF8
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield row_number, "Expected a JSON object"
+            continue
+        yield row_number, row
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}"
+        for e in error.errors()
+    )
+
+
+def _next_chunk(
+    rows: Iterator[tuple[int, object]],
+    user_id: UUID,
+    result: ImportResult
+) -> Optional[list[dict]]:
+    """
+    Parse and validate up to IMPORT_CHUNK_SIZE rows.
+    Returns None once the file is exhausted.
+    """
+    chunk = []
+    exhausted = True
+    for row_number, raw in rows:
+        exhausted = False
+        if isinstance(raw, str):
+            result.add_error(row_number, raw)
+        else:
+            try:
+                draft = DraftItemCreate.model_validate(raw)
+            except ValidationError as e:
+                result.add_error(row_number, _format_validation_error(e))
+            else:
+                data = draft.model_dump()
+                data["id"] = uuid.uuid4()
+                data["user_id"] = user_id
+                data["source"] = data.get("source") or "import"
+                chunk.append(data)
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            break
+
+    if exhausted and not chunk:
+        return None
+    return chunk
+
+
+def _copy_psycopg2(session, rows: list[dict]) -> None:
+    """COPY rows through psycopg2 using CSV format (unquoted empty = NULL)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if row.get(c) is None else row[c] for c in COPY_COLUMNS])
+    buffer.seek(0)
+
+    dbapi_connection = session.connection().connection.dbapi_connection
+    with dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY draft_items ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
+
+async def _write_chunk(db, rows: list[dict]) -> None:
+    dialect = db.get_bind().dialect
+
+    if dialect.name == "postgresql" and dialect.driver == "psycopg2":
+        await db.run_sync(_copy_psycopg2, rows)
+    elif dialect.name == "postgresql" and dialect.driver == "asyncpg":
+        connection = await db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            "draft_items",
+            records=[tuple(row.get(c) for c in COPY_COLUMNS) for row in rows],
+            columns=list(COPY_COLUMNS)
+        )
+    else:
+        await db.execute(insert(DraftItem), rows)
+
+
+async def import_drafts(
+    db,
+    user_id: UUID,
+    file: BinaryIO,
+    import_format: str,
+    predict_expiry: bool = True
+) -> ImportResult:
+    """
+    Stream a CSV/NDJSON file into the user's drafts.
+
+    Parsing runs in the threadpool (the upload is a spooled temp file);
+    each chunk commits independently.
+    """
+    result = ImportResult()
+    rows = _iter_raw_rows(file, import_format)
+    adjustments = await user_adjustments.load(db, user_id) if predict_expiry else None
+
+    while True:
+        chunk = await run_in_threadpool(_next_chunk, rows, user_id, result)
+        if chunk is None:
+            break
+        if not chunk:
+            continue
+
+        if predict_expiry:
+            predict_missing_expiry(chunk, adjustments)
+
+        await _write_chunk(db, chunk)
+        await bump_versions(db, user_id, DRAFTS)
+        await db.commit()
+        result.imported += len(chunk)
+
+    return result
@@ -0,0 +1,30 @@
+# Insights services module
+from app.services.insights.engine import (
+    CategoryInsight,
+    EventArrays,
+    category_insights_from_rows,
+    compute_category_insights,
+    events_to_arrays,
+    load_user_event_rows
+)
+from app.services.insights.events import (
+    ADJUSTED,
+    CONSUMED,
+    EVENT_REASONS,
+    WASTED,
+    record_event
+)
+
+__all__ = [
+    "CategoryInsight",
+    "EventArrays",
+    "category_insights_from_rows",
+    "compute_category_insights",
+    "events_to_arrays",
+    "load_user_event_rows",
+    "ADJUSTED",
+    "CONSUMED",
+    "EVENT_REASONS",
+    "WASTED",
+    "record_event",
+]
@@ -0,0 +1,53 @@
+"""
+Recording of inventory events.
+
+Mutations that change or remove inventory write their event before
+commit, so an event exists exactly when the change does.
+"""
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import insert
+
+from app.models.inventory_event import InventoryEvent
+
+CONSUMED = "consumed"
+WASTED = "wasted"
+ADJUSTED = "adjusted"
+
+EVENT_REASONS = (CONSUMED, WASTED, ADJUSTED)
+
+
+def _check_reason(reason: str) -> None:
+    if reason not in EVENT_REASONS:
+        raise ValueError(f"Unknown event reason '{reason}'")
+
+
+async def record_event(
+    db,
+    user_id: UUID,
+    item,
+    reason: str,
+    quantity_before: Decimal,
+    quantity_after: Decimal
+) -> None:
+    """
+    Append an event for an inventory item (call before commit).
+
+    `item` is anything exposing id, category, storage_location and
+    created_at: an ORM object or a RETURNING row.
+    """
+    _check_reason(reason)
+    await db.execute(
+        insert(InventoryEvent).values(
+            user_id=user_id,
+            item_id=item.id,
+            category=item.category,
+            storage_location=item.storage_location,
+            item_created_at=item.created_at,
+            reason=reason,
+            quantity_before=quantity_before,
+            quantity_after=quantity_after
+        )
+    )
+
@@ -0,0 +1,9 @@
+# Inventory summary services module
+# (reconciliation lives in .reconcile, which is also the CLI entry point)
+from app.services.inventory_summary.aggregates import (
+    apply_summary_deltas,
+    read_summary,
+    summary_deltas
+)
+
+__all__ = ["apply_summary_deltas", "read_summary", "summary_deltas"]
@@ -0,0 +1,108 @@
+"""
+Incrementally maintained inventory summary.
+
+Every inventory write turns the affected items into count deltas per
+(dimension, key) and applies them with a single multi-row upsert
+(INSERT ... ON CONFLICT DO UPDATE SET item_count = item_count + delta)
+in the same transaction as the write itself.
+
+Call apply_summary_deltas() after bump_versions(): the version bump locks
+the user row first, which serializes writers with reconcile_user() and
+keeps lock order consistent (users row, then summary rows).
+"""
+from collections import Counter
+from datetime import date
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+
+from app.core.database import dialect_insert
+from app.models.inventory_item import InventoryItem
+from app.models.inventory_summary import UserInventorySummary
+
+# Summary dimension -> InventoryItem attribute it counts
+DIMENSIONS = {
+    "category": "category",
+    "storage_location": "storage_location",
+}
+
+
+def summary_deltas(items: Iterable, sign: int = 1) -> Counter:
+    """
+    Count deltas for items being added (sign=1) or removed (sign=-1).
+
+    Items may be ORM objects, rows or anything exposing category and
+    storage_location attributes.
+    """
+    deltas = Counter()
+    for item in items:
+        for dimension, attribute in DIMENSIONS.items():
+            deltas[(dimension, getattr(item, attribute))] += sign
+    return deltas
+
+
+async def apply_summary_deltas(db, user_id: UUID, deltas: Counter) -> None:
+    """Apply count deltas with one upsert statement (call before commit)"""
+    # Sorted so concurrent writers touch summary rows in the same order
+    rows = [
+        {"user_id": user_id, "dimension": dimension, "key": key, "item_count": delta}
+        for (dimension, key), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return
+
+    insert = dialect_insert(db)
+    statement = insert(UserInventorySummary).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[
+            UserInventorySummary.user_id,
+            UserInventorySummary.dimension,
+            UserInventorySummary.key,
+        ],
+        set_={"item_count": UserInventorySummary.item_count + statement.excluded.item_count}
+    )
+    await db.execute(statement)
+
+
+async def earliest_expiry(db, user_id: UUID) -> Optional[date]:
+    """
+    Soonest expiry date in the user's inventory.
+
+    Not stored in the summary (a delete would force a rescan); MIN over the
+    (user_id, expiry_date, id) index is a single index probe instead.
+    """
+    return await db.scalar(
+        select(func.min(InventoryItem.expiry_date)).where(InventoryItem.user_id == user_id)
+    )
+
+
+async def read_summary(db, user_id: UUID) -> dict:
+    """
+    Dashboard summary for a user.
+
+    Cost depends on the number of distinct categories and locations, not
+    on the number of items.
+    """
+    rows = await db.execute(
+        select(
+            UserInventorySummary.dimension,
+            UserInventorySummary.key,
+            UserInventorySummary.item_count
+        ).where(
+            UserInventorySummary.user_id == user_id,
+            UserInventorySummary.item_count > 0
+        )
+    )
+
+    counts = {dimension: {} for dimension in DIMENSIONS}
+    for dimension, key, item_count in rows:
+        counts.setdefault(dimension, {})[key] = item_count
+
+    return {
+        "total_items": sum(counts["category"].values()),
+        "by_category": counts["category"],
+        "by_storage_location": counts["storage_location"],
+        "earliest_expiry": await earliest_expiry(db, user_id),
+    }
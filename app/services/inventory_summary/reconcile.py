@@ -0,0 +1,127 @@
+"""
+Reconciliation of the incremental inventory summary.
+
+Recomputes each user's counts with GROUP BY over inventory_items and
+compares them with user_inventory_summary. Intended to run periodically
+(cron) to detect drift, e.g. from rows written outside the API:
+
+    python -m app.services.inventory_summary.reconcile
+    python -m app.services.inventory_summary.reconcile --user-id <uuid> --fix
+
+Exits with status 1 if any mismatch is found and --fix was not given.
+"""
+import argparse
+import asyncio
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select
+
+from app.core.database import session_scope
+from app.models.inventory_item import InventoryItem
+from app.models.inventory_summary import UserInventorySummary
+from app.models.user import User
+from app.services.inventory_summary.aggregates import DIMENSIONS
+
+
+@dataclass
+class ReconcileReport:
+    """Differences between stored and recomputed counts for one user"""
+    user_id: UUID
+    # (dimension, key) -> (stored count, actual count)
+    mismatches: dict[tuple[str, str], tuple[int, int]] = field(default_factory=dict)
+    fixed: bool = False
+
+
+async def recompute_counts(db, user_id: UUID) -> Counter:
+    """Full recomputation of a user's summary from inventory_items"""
+    counts = Counter()
+    for dimension, attribute in DIMENSIONS.items():
+        column = getattr(InventoryItem, attribute)
+        rows = await db.execute(
+            select(column, func.count())
+            .where(InventoryItem.user_id == user_id)
+            .group_by(column)
+        )
+        for key, item_count in rows:
+            counts[(dimension, key)] = item_count
+    return counts
+
+
+async def stored_counts(db, user_id: UUID) -> Counter:
+    rows = await db.execute(
+        select(
+            UserInventorySummary.dimension,
+            UserInventorySummary.key,
+            UserInventorySummary.item_count
+        ).where(UserInventorySummary.user_id == user_id)
+    )
+    return Counter({(dimension, key): item_count for dimension, key, item_count in rows if item_count})
+
+
+async def reconcile_user(db, user_id: UUID, fix: bool = False) -> ReconcileReport:
+    """
+    Compare (and optionally rewrite) one user's summary.
+
+    The user row is locked first, the same lock inventory writes take via
+    the version bump, so the comparison never sees a half-applied write.
+    """
+    await db.execute(select(User.id).where(User.id == user_id).with_for_update())
+
+    stored = await stored_counts(db, user_id)
+    actual = await recompute_counts(db, user_id)
+
+    report = ReconcileReport(user_id=user_id)
+    for key in sorted(stored.keys() | actual.keys()):
+        if stored[key] != actual[key]:
+            report.mismatches[key] = (stored[key], actual[key])
+
+    if fix and report.mismatches:
+        await db.execute(
+            delete(UserInventorySummary).where(UserInventorySummary.user_id == user_id)
+        )
+        if actual:
+            await db.execute(insert(UserInventorySummary), [
+                {"user_id": user_id, "dimension": dimension, "key": key, "item_count": item_count}
+                for (dimension, key), item_count in sorted(actual.items())
+            ])
+        report.fixed = True
+
+    await db.commit()
+    return report
+
+
+async def reconcile_all(user_id: Optional[UUID] = None, fix: bool = False) -> list[ReconcileReport]:
+    """Reconcile one user, or every user, each in its own transaction"""
+    async with session_scope() as db:
+        if user_id is not None:
+            user_ids = [user_id]
+        else:
+            user_ids = (await db.scalars(select(User.id).order_by(User.id))).all()
+        return [await reconcile_user(db, uid, fix=fix) for uid in user_ids]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify user_inventory_summary against inventory_items")
+    parser.add_argument("--user-id", type=UUID, help="Only reconcile this user")
+    parser.add_argument("--fix", action="store_true", help="Rewrite summaries that differ")
+    args = parser.parse_args()
+
+    reports = asyncio.run(reconcile_all(args.user_id, fix=args.fix))
+
+    drifted = [report for report in reports if report.mismatches]
+    for report in drifted:
+        status = "fixed" if report.fixed else "mismatch"
+        for (dimension, key), (stored, actual) in report.mismatches.items():
+            print(f"{status}\t{report.user_id}\t{dimension}={key}\tstored={stored}\tactual={actual}")
+    print(f"Checked {len(reports)} users, {len(drifted)} with drift")
+
+    if drifted and not args.fix:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# Maintenance jobs module
+# (modules here double as CLI entry points, e.g. python -m app.services.maintenance.draft_purge)
@@ -0,0 +1,173 @@
+"""
+Batched purge of stale drafts.
+
+Drafts are disposable: ones nobody has touched for DRAFT_TTL_DAYS
+(abandoned barcode scans, auto-created drafts) are deleted by a
+background task. Each batch is
+
+    DELETE FROM draft_items WHERE id IN (
+        SELECT id FROM draft_items WHERE updated_at < :cutoff
+        ORDER BY updated_at LIMIT :n FOR UPDATE SKIP LOCKED
+    ) RETURNING user_id
+
+committed on its own, so locks are held for one small batch only and
+drafts a user is editing right now are skipped rather than waited on.
+The owners' drafts versions are bumped in the same transaction so their
+list ETags change.
+
+Can also be run once from the command line (e.g. cron):
+
+    python -m app.services.maintenance.draft_purge --ttl-days 14
+"""
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, select
+
+from app.core.config import settings
+from app.core.database import session_scope
+from app.core.versioning import DRAFTS, bump_versions_for_users
+from app.models.draft_item import DraftItem
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PurgeReport:
+    """Outcome of one purge run"""
+    cutoff: datetime
+    purged: int = 0
+    batches: int = 0
+    duration_seconds: float = 0.0
+
+
+async def purge_stale_drafts(
+    ttl_days: int,
+    batch_size: int,
+    max_batches: Optional[int] = None,
+    now: Optional[datetime] = None
+) -> PurgeReport:
+    """
+    Delete drafts not updated for ttl_days, batch_size rows per transaction.
+
+    Stops when a batch comes back short (nothing left) or after
+    max_batches, leaving the rest for the next run.
+    """
+    now = now or datetime.now(timezone.utc)
+    report = PurgeReport(cutoff=now - timedelta(days=ttl_days))
+    start = time.perf_counter()
+
+    async with session_scope() as db:
+        while max_batches is None or report.batches < max_batches:
+            stale = (
+                select(DraftItem.id)
+                .where(DraftItem.updated_at < report.cutoff)
+                .order_by(DraftItem.updated_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            owners = (await db.scalars(
+                delete(DraftItem)
+                .where(DraftItem.id.in_(stale.scalar_subquery()))
+                .returning(DraftItem.user_id)
+            )).all()
+
+            if owners:
+                await bump_versions_for_users(db, set(owners), DRAFTS)
+            await db.commit()
+
+            report.batches += 1
+            report.purged += len(owners)
+            if len(owners) < batch_size:
+                break
+            # Let request handlers in, between batches
+            await asyncio.sleep(0)
+
+    report.duration_seconds = time.perf_counter() - start
+    return report
+
+
+class DraftPurger:
+    """Runs purge_stale_drafts every interval as a background task"""
+
+    def __init__(self, ttl_days: int, batch_size: int, interval_seconds: int):
+        self.ttl_days = ttl_days
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+        self.last_report: Optional[PurgeReport] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_days > 0
+
+    async def run_once(self) -> PurgeReport:
+        report = await purge_stale_drafts(self.ttl_days, self.batch_size)
+        self.last_report = report
+        logger.info(
+            "Purged %d stale drafts in %d batches (%.2fs, cutoff %s)",
+            report.purged, report.batches, report.duration_seconds, report.cutoff.isoformat()
+        )
+        return report
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Stale draft purge failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "ttl_days": self.ttl_days,
+            "batch_size": self.batch_size,
+            "last_run": asdict(self.last_report) if self.last_report else None,
+        }
+
+
+draft_purger = DraftPurger(
+    ttl_days=settings.draft_ttl_days,
+    batch_size=settings.draft_purge_batch_size,
+    interval_seconds=settings.draft_purge_interval_seconds
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete drafts not updated for a number of days")
+    parser.add_argument("--ttl-days", type=int, default=settings.draft_ttl_days)
+    parser.add_argument("--batch-size", type=int, default=settings.draft_purge_batch_size)
+    parser.add_argument("--max-batches", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.ttl_days <= 0:
+        parser.error("--ttl-days must be positive")
+
+    report = asyncio.run(purge_stale_drafts(args.ttl_days, args.batch_size, args.max_batches))
+    print(
+        f"Purged {report.purged} drafts older than {report.cutoff.isoformat()} "
+        f"in {report.batches} batches ({report.duration_seconds:.2f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+# Recipe services module
+from app.services.recipes.index import (
+    PantryItem,
+    Recipe,
+    RecipeIndex,
+    RecipeMatch,
+    get_recipe_index,
+    normalize_ingredient
+)
+
+__all__ = [
+    "PantryItem",
+    "Recipe",
+    "RecipeIndex",
+    "RecipeMatch",
+    "get_recipe_index",
+    "normalize_ingredient",
+]
@@ -0,0 +1,207 @@
+"""
+Inventory-constrained recipe matching.
+
+The recipe corpus (JSON) is loaded once into an inverted index from
+normalized ingredient to the positions of the recipes using it. Scoring a
+user's inventory touches only the postings of ingredients they actually
+have: the matched posting lists are concatenated and summed per recipe
+with one np.bincount, so cost depends on the user's inventory and the
+posting lengths, not on the corpus size.
+
+Items are weighted by urgency (days to expiry), so recipes that use
+soon-to-expire food rank first. Pantry staples (salt, water, oil...)
+are dropped from recipes entirely: everyone is assumed to have them.
+"""
+import json
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+
+BUNDLED_CORPUS = Path(__file__).parent / "data" / "recipes.json"
+
+STAPLES = frozenset({
+    "salt", "pepper", "black pepper", "water", "oil", "olive oil", "vegetable oil",
+})
+
+# Items expiring within this many days get an urgency boost
+URGENCY_DAYS = 7
+# Extra weight for an item expiring today (linearly less up to URGENCY_DAYS)
+URGENCY_BOOST = 2.0
+# Score deducted per ingredient the user does not have
+MISSING_PENALTY = 0.5
+
+_NON_LETTERS = re.compile(r"[^a-z\s]+")
+
+
+def _singular(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith("oes"):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+@lru_cache(maxsize=8192)
+def normalize_ingredient(text: str) -> str:
+    """Lowercase, strip punctuation/digits and singularize each word"""
+    words = _NON_LETTERS.sub(" ", text.lower()).split()
+    return " ".join(_singular(word) for word in words)
+
+
+@dataclass(frozen=True)
+class Recipe:
+    id: str
+    title: str
+    ingredients: tuple[str, ...]  # Normalized, unique, staples removed
+
+
+@dataclass
+class RecipeMatch:
+    recipe_id: str
+    title: str
+    score: float
+    used_ingredients: list[str]
+    missing_ingredients: list[str]
+
+
+@dataclass
+class PantryItem:
+    """The parts of an InventoryItem used for matching"""
+    name: str
+    category: Optional[str]
+    expiry_date: date
+
+
+class RecipeIndex:
+    """Inverted index from normalized ingredient to recipe positions"""
+
+    def __init__(self, recipes: Sequence[Recipe]):
+        self.recipes = list(recipes)
+
+        postings = defaultdict(list)
+        for position, recipe in enumerate(self.recipes):
+            for ingredient in recipe.ingredients:
+                postings[ingredient].append(position)
+        self.postings = {
+            ingredient: np.array(positions, dtype=np.int32)
+            for ingredient, positions in postings.items()
+        }
+        self.ingredient_counts = np.array(
+            [len(recipe.ingredients) for recipe in self.recipes], dtype=np.float64
+        )
+        # Longest ingredient in words, bounds the n-grams tried per item
+        self.max_words = max((len(i.split()) for i in self.postings), default=1)
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "RecipeIndex":
+        recipes = []
+        for record in records:
+            ingredients = dict.fromkeys(
+                normalize_ingredient(ingredient) for ingredient in record["ingredients"]
+            )
+            recipes.append(Recipe(
+                id=str(record["id"]),
+                title=record["title"],
+                ingredients=tuple(i for i in ingredients if i and i not in STAPLES)
+            ))
+        return cls(recipes)
+
+    @classmethod
+    def from_json(cls, path: Path) -> "RecipeIndex":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_records(json.load(f)["recipes"])
+
+    def match_ingredients(self, text: str) -> set[str]:
+        """Indexed ingredients mentioned in an item name (any word n-gram)"""
+        words = normalize_ingredient(text).split()
+        found = set()
+        for size in range(1, min(self.max_words, len(words)) + 1):
+            for start in range(len(words) - size + 1):
+                candidate = " ".join(words[start:start + size])
+                if candidate in self.postings:
+                    found.add(candidate)
+        return found
+
+    def ingredient_weights(self, items: Iterable[PantryItem], today: date) -> dict[str, float]:
+        """
+        Weight per available ingredient: 1 plus an urgency boost for items
+        expiring soon. Expired items are not offered.
+        """
+        weights = {}
+        for item in items:
+            days_left = (item.expiry_date - today).days
+            if days_left < 0:
+                continue
+            weight = 1.0 + URGENCY_BOOST * max(0.0, 1.0 - days_left / URGENCY_DAYS)
+            ingredients = self.match_ingredients(item.name)
+            if item.category:
+                ingredients |= self.match_ingredients(item.category)
+            for ingredient in ingredients:
+                weights[ingredient] = max(weight, weights.get(ingredient, 0.0))
+        return weights
+
+    def score(self, weights: dict[str, float], limit: int = 10) -> list[RecipeMatch]:
+        """
+        Best recipes for the available ingredient weights.
+
+        score = sum(weights of used ingredients) - MISSING_PENALTY * missing.
+        Only recipes using at least one available ingredient are returned;
+        ties are broken by corpus order, so results are deterministic.
+        """
+        matched = [(self.postings[i], w) for i, w in weights.items() if i in self.postings]
+        if not matched:
+            return []
+        # One bincount over all matched postings instead of a scatter-add
+        # per ingredient: a single pass regardless of how many items match
+        positions = np.concatenate([p for p, _ in matched])
+        position_weights = np.repeat(
+            [w for _, w in matched], [len(p) for p, _ in matched]
+        )
+        n = len(self.recipes)
+        scores = np.bincount(positions, weights=position_weights, minlength=n)
+        used = np.bincount(positions, minlength=n)
+
+        candidates = np.flatnonzero(used)
+        final = scores[candidates] - MISSING_PENALTY * (
+            self.ingredient_counts[candidates] - used[candidates]
+        )
+
+        if len(candidates) > limit:
+            # Keep everything tied with the limit-th score so the tie-break
+            # below, not partition order, decides who makes the cut
+            cutoff = np.partition(-final, limit - 1)[limit - 1]
+            keep = -final <= cutoff
+            candidates, final = candidates[keep], final[keep]
+        order = np.lexsort((candidates, -final))[:limit]
+
+        matches = []
+        for i in order:
+            recipe = self.recipes[candidates[i]]
+            matches.append(RecipeMatch(
+                recipe_id=recipe.id,
+                title=recipe.title,
+                score=round(float(final[i]), 4),
+                used_ingredients=[x for x in recipe.ingredients if x in weights],
+                missing_ingredients=[x for x in recipe.ingredients if x not in weights],
+            ))
+        return matches
+
+    def suggest(self, items: Iterable[PantryItem], today: date, limit: int = 10) -> list[RecipeMatch]:
+        return self.score(self.ingredient_weights(items, today), limit)
+
+
+@lru_cache(maxsize=1)
+def get_recipe_index() -> RecipeIndex:
+    """The configured corpus (RECIPES_PATH, else the bundled sample), built once"""
+    path = Path(settings.recipes_path) if settings.recipes_path else BUNDLED_CORPUS
+    return RecipeIndex.from_json(path)
@@ -0,0 +1,117 @@
+"""
+Category inference: Aho-Corasick automaton against a naive keyword loop.
+
+The bundled dictionary is padded with --extra synthetic terms (default
+20k) to show how each approach scales with dictionary size, then both
+infer categories for --names generated item names and must agree. The
+naive loop checks every keyword with str.find, so its cost grows with the
+dictionary; the automaton scans each name once. Build time is reported
+too.
+
+Usage:
+    python -m benchmarks.bench_category_inference
+    python -m benchmarks.bench_category_inference --extra 0 --names 20000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='snapshelf-bench-')}/keywords.db")
+os.environ.setdefault("APP_ENV", "test")
+
+from app.services.expiry_prediction.category_inference import (  # noqa: E402
+    BUNDLED_KEYWORDS,
+    CategoryInferrer,
+    CategoryMatch,
+    normalize_text
+)
+
+
+def _synthetic_term(rng: random.Random) -> str:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return "".join(rng.choice(letters) for _ in range(rng.randint(5, 12)))
+
+
+def _padded_dictionary(extra: int, rng: random.Random, directory: Path) -> Path:
+    data = json.loads(BUNDLED_KEYWORDS.read_text())
+    categories = list(data["categories"])
+    for _ in range(extra):
+        data["categories"][rng.choice(categories)].append(_synthetic_term(rng))
+    path = directory / "keywords.json"
+    path.write_text(json.dumps(data))
+    return path
+
+
+def _naive_infer(inferrer: CategoryInferrer, name: str):
+    """Same selection rules as CategoryInferrer, one str.find scan per keyword"""
+    text = normalize_text(name)
+    best, best_rank = None, None  # Unclassified keywords match as category None
+    for keyword, category in zip(inferrer.keywords, inferrer.categories):
+        start = text.find(keyword)
+        while start != -1:
+            end = start + len(keyword)
+            before_ok = start == 0 or not text[start - 1].isalnum()
+            after_ok = end >= len(text) or not text[end].isalnum() or (
+                text[end] == "s" and (end + 1 >= len(text) or not text[end + 1].isalnum())
+            )
+            if before_ok and after_ok:
+                rank = (category in inferrer.modifiers, len(keyword), end - 1)
+                if best_rank is None or rank > best_rank:
+                    best, best_rank = CategoryMatch(category, keyword), rank
+            start = text.find(keyword, start + 1)
+    return best if best is not None and best.category is not None else None
+
+
+def _names(inferrer: CategoryInferrer, count: int, rng: random.Random) -> list[str]:
+    brands = ["Tesco", "Aldi", "Organic", "Value", "Finest", "Bio", ""]
+    sizes = ["500g", "1kg", "2L", "x6", "250ml", ""]
+    names = []
+    for _ in range(count):
+        words = [rng.choice(brands), rng.choice(inferrer.keywords[:1000]), rng.choice(sizes)]
+        if rng.random() < 0.2:
+            words[1] = _synthetic_term(rng)  # Unknown product
+        names.append(" ".join(word for word in words if word).title())
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--extra", type=int, default=20_000, help="Synthetic terms added to the dictionary")
+    parser.add_argument("--names", type=int, default=5_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    directory = Path(tempfile.mkdtemp(prefix="snapshelf-keywords-"))
+    path = _padded_dictionary(args.extra, rng, directory)
+
+    start = time.perf_counter()
+    inferrer = CategoryInferrer.from_file(path)
+    build_seconds = time.perf_counter() - start
+
+    names = _names(inferrer, args.names, rng)
+
+    start = time.perf_counter()
+    automaton_results = [inferrer._infer(name) for name in names]
+    automaton_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    naive_results = [_naive_infer(inferrer, name) for name in names]
+    naive_seconds = time.perf_counter() - start
+
+    assert automaton_results == naive_results
+
+    matched = sum(result is not None for result in automaton_results)
+    print(f"{len(inferrer.keywords):,} keywords, {len(inferrer.automaton.fail):,} automaton states, "
+          f"{args.names:,} names ({matched:,} matched)\n")
+    print(f"{'build automaton':<18}{build_seconds * 1000:>10.1f} ms")
+    for label, seconds in (("aho-corasick", automaton_seconds), ("naive loop", naive_seconds)):
+        print(f"{label:<18}{seconds / args.names * 1e6:>10.1f} us/name{args.names / seconds:>12,.0f} names/s")
+    print(f"\nspeedup {naive_seconds / automaton_seconds:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
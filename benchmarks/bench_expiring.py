@@ -0,0 +1,142 @@
+"""
+Latency of the expiring-soon endpoint against a full inventory listing.
+
+Seeds several users with --items inventory rows each (expiry dates spread
+over a year), then times sequential requests to
+GET /api/inventory/expiring?within_days=7 and, for comparison, the
+unpaginated GET /api/inventory the Home screen used to filter client-side.
+The query plan for the expiring query is printed so the index range scan
+on (user_id, expiry_date, id) can be confirmed.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_expiring
+    python -m benchmarks.bench_expiring --items 5000 --requests 500
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='snapshelf-bench-')}/expiring.db"
+os.environ.setdefault("APP_ENV", "test")
+
+USERS = 5
+
+
+def _seed(items_per_user: int) -> list:
+    from sqlalchemy import insert
+
+    from app.core.database import Base, engine, SessionLocal
+    from app.models.inventory_item import InventoryItem
+    from app.models.user import User
+
+    Base.metadata.create_all(bind=engine)
+
+    rng = random.Random(42)
+    today = date.today()
+    user_ids = [uuid.uuid4() for _ in range(USERS)]
+    db = SessionLocal()
+    for user_id in user_ids:
+        db.add(User(id=user_id, email=f"bench-{user_id}@example.com"))
+    db.flush()
+    for user_id in user_ids:
+        db.execute(insert(InventoryItem), [
+            {
+                "user_id": user_id,
+                "name": f"Item {i}",
+                "category": "pantry",
+                "quantity": 1,
+                "unit": "pcs",
+                "storage_location": "pantry",
+                "expiry_date": today + timedelta(days=rng.randint(-10, 365)),
+            }
+            for i in range(items_per_user)
+        ])
+    db.commit()
+    db.close()
+    return user_ids
+
+
+def _explain() -> str:
+    from sqlalchemy import select, text
+
+    from app.core.database import engine
+    from app.models.inventory_item import InventoryItem
+
+    query = (
+        select(InventoryItem)
+        .where(
+            InventoryItem.user_id == uuid.uuid4(),
+            InventoryItem.expiry_date <= date.today() + timedelta(days=7)
+        )
+        .order_by(InventoryItem.expiry_date, InventoryItem.id)
+    )
+    compiled = query.compile(engine, compile_kwargs={"literal_binds": True})
+    prefix = "EXPLAIN QUERY PLAN" if engine.dialect.name == "sqlite" else "EXPLAIN"
+    with engine.connect() as connection:
+        rows = connection.execute(text(f"{prefix} {compiled}")).all()
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+def _percentiles(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+    return f"p50 {p(0.50):7.2f} ms   p95 {p(0.95):7.2f} ms   p99 {p(0.99):7.2f} ms"
+
+
+async def _time_requests(client, path: str, params: dict, user_ids: list, n: int) -> list[float]:
+    samples = []
+    for i in range(n):
+        headers = {"X-User-Id": str(user_ids[i % len(user_ids)])}
+        start = time.perf_counter()
+        response = await client.get(path, params=params, headers=headers)
+        samples.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=2000, help="Inventory items per user")
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    import httpx
+    from fastapi import FastAPI
+
+    from app.core.database import Base, engine
+    from app.routers import inventory_items
+
+    app = FastAPI()
+    app.include_router(inventory_items.router, prefix="/api")
+
+    user_ids = _seed(args.items)
+    print(f"{USERS} users x {args.items} items\n")
+    print("Query plan:")
+    print(_explain())
+    print()
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            expiring = await _time_requests(
+                client, "/api/inventory/expiring", {"within_days": 7}, user_ids, args.requests
+            )
+            full_list = await _time_requests(
+                client, "/api/inventory", {}, user_ids, args.requests
+            )
+        print(f"{'expiring (7 days)':<20}{_percentiles(expiring)}   mean {statistics.mean(expiring) * 1000:.2f} ms")
+        print(f"{'full list':<20}{_percentiles(full_list)}   mean {statistics.mean(full_list) * 1000:.2f} ms")
+
+    asyncio.run(run())
+    Base.metadata.drop_all(bind=engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Speed and accuracy of every registered expiry strategy.
+
+Replays a dataset of (name, category, storage_location, purchase_date,
+actual_expiry) rows through each strategy in
+ExpiryPredictionService.strategies and reports:
+
+- throughput: items/s of the per-item predict() loop and of
+  predict_expiry_batch(), plus p50/p99 latency of a single predict()
+- accuracy: mean/median absolute error in days, bias (positive means
+  predicted later than the food actually went off) and the share of
+  predictions that were too late
+- calibration of confidence: a prediction counts as a hit when it is
+  within --tolerance of the actual shelf life (at least one day); hit
+  rate per confidence decile, expected calibration error and Brier score
+
+By default the dataset is generated from benchmarks/fixtures/
+expiry_products.json (products with observed shelf-life ranges);
+--dataset replays a CSV with the same columns instead, e.g. an export of
+confirmed inventory. Results are written as JSON (--output) so runs can
+be compared over time.
+
+Usage:
+    python -m benchmarks.bench_expiry_accuracy
+    python -m benchmarks.bench_expiry_accuracy --items 50000 --output results.json
+    python -m benchmarks.bench_expiry_accuracy --dataset confirmed.csv
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import random
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='snapshelf-bench-')}/accuracy.db")
+os.environ.setdefault("APP_ENV", "test")
+
+from app.services.expiry_prediction import ExpiryPredictionStrategy, expiry_prediction_service  # noqa: E402
+from app.services.expiry_prediction.strategies.base import ExpiryPredictionInput  # noqa: E402
+
+FIXTURE = Path(__file__).parent / "fixtures" / "expiry_products.json"
+
+DATASET_COLUMNS = ["name", "category", "storage_location", "purchase_date", "actual_expiry"]
+
+# Equal-width confidence bins for the calibration table
+CALIBRATION_BINS = 10
+
+
+@dataclass(frozen=True)
+class LabelledItem:
+    """A prediction input and the date the item actually expired"""
+    item: ExpiryPredictionInput
+    actual_expiry: date
+
+
+def generate_dataset(products: list[dict], count: int, rng: random.Random, start: date) -> list[LabelledItem]:
+    """Purchases spread over a year, each expiring within its product's observed range"""
+    rows = []
+    for _ in range(count):
+        product = rng.choice(products)
+        purchase_date = start + timedelta(days=rng.randrange(365))
+        low, high = product["shelf_life_days"]
+        rows.append(LabelledItem(
+            ExpiryPredictionInput(product["name"], product["category"], product["storage"], purchase_date),
+            purchase_date + timedelta(days=rng.randint(low, high))
+        ))
+    return rows
+
+
+def read_dataset(path: Path) -> list[LabelledItem]:
+    with open(path, newline="") as f:
+        return [
+            LabelledItem(
+                ExpiryPredictionInput(
+                    row["name"],
+                    row["category"] or None,
+                    row["storage_location"] or None,
+                    date.fromisoformat(row["purchase_date"])
+                ),
+                date.fromisoformat(row["actual_expiry"])
+            )
+            for row in csv.DictReader(f)
+        ]
+
+
+def write_dataset(rows: list[LabelledItem], path: Path) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(DATASET_COLUMNS)
+        for row in rows:
+            item = row.item
+            writer.writerow([
+                item.name, item.category or "", item.storage_location or "",
+                item.purchase_date.isoformat(), row.actual_expiry.isoformat()
+            ])
+
+
+def _dataset_digest(rows: list[LabelledItem]) -> str:
+    digest = hashlib.sha256()
+    for row in rows:
+        item = row.item
+        digest.update(
+            f"{item.name}\t{item.category}\t{item.storage_location}\t"
+            f"{item.purchase_date}\t{row.actual_expiry}\n".encode()
+        )
+    return digest.hexdigest()[:16]
+
+
+def _timed_predictions(strategy: ExpiryPredictionStrategy, items: list[ExpiryPredictionInput]):
+    latencies = np.empty(len(items), dtype=np.int64)
+    predictions = []
+    clock = time.perf_counter_ns
+    started = clock()
+    for index, item in enumerate(items):
+        before = clock()
+        predictions.append(strategy.predict(
+            name=item.name,
+            category=item.category,
+            storage_location=item.storage_location,
+            purchase_date=item.purchase_date
+        ))
+        latencies[index] = clock() - before
+    return predictions, latencies, (clock() - started) / 1e9
+
+
+def calibration(confidence: np.ndarray, hits: np.ndarray) -> dict:
+    """Hit rate per confidence bin, expected calibration error and Brier score"""
+    bins = np.minimum((confidence * CALIBRATION_BINS).astype(np.int64), CALIBRATION_BINS - 1)
+    table = []
+    ece = 0.0
+    for index in range(CALIBRATION_BINS):
+        in_bin = bins == index
+        count = int(in_bin.sum())
+        if not count:
+            continue
+        mean_confidence = float(confidence[in_bin].mean())
+        hit_rate = float(hits[in_bin].mean())
+        ece += count / len(confidence) * abs(mean_confidence - hit_rate)
+        table.append({
+            "bin": [index / CALIBRATION_BINS, (index + 1) / CALIBRATION_BINS],
+            "items": count,
+            "mean_confidence": round(mean_confidence, 4),
+            "hit_rate": round(hit_rate, 4),
+        })
+    return {
+        "expected_calibration_error": round(ece, 4),
+        "brier_score": round(float(np.mean((confidence - hits) ** 2)), 4),
+        "bins": table,
+    }
+
+
+def evaluate(strategy: ExpiryPredictionStrategy, rows: list[LabelledItem], tolerance: float) -> dict:
+    items = [row.item for row in rows]
+    predictions, latencies, seconds = _timed_predictions(strategy, items)
+
+    started = time.perf_counter()
+    batch = strategy.predict_expiry_batch(items)
+    batch_seconds = time.perf_counter() - started
+    assert batch == predictions, f"{strategy.name}: batch and per-item predictions differ"
+
+    actual_days = np.array([(row.actual_expiry - row.item.purchase_date).days for row in rows])
+    predicted_days = np.array([
+        (prediction.expiry_date - item.purchase_date).days
+        for prediction, item in zip(predictions, items)
+    ])
+    errors = predicted_days - actual_days
+    absolute = np.abs(errors)
+    hits = (absolute <= np.maximum(1, tolerance * actual_days)).astype(np.float64)
+    confidence = np.array([prediction.confidence for prediction in predictions])
+
+    return {
+        "throughput": {
+            "items_per_s": round(len(items) / seconds),
+            "batch_items_per_s": round(len(items) / batch_seconds),
+            "p50_us": round(float(np.percentile(latencies, 50)) / 1e3, 2),
+            "p99_us": round(float(np.percentile(latencies, 99)) / 1e3, 2),
+        },
+        "accuracy": {
+            "mae_days": round(float(absolute.mean()), 3),
+            "median_abs_error_days": float(np.median(absolute)),
+            "bias_days": round(float(errors.mean()), 3),
+            "late_rate": round(float((errors > 0).mean()), 4),
+            "hit_rate": round(float(hits.mean()), 4),
+        },
+        "calibration": calibration(confidence, hits),
+    }
+
+
+def _print_report(results: dict) -> None:
+    header = f"{'strategy':<16}{'items/s':>12}{'batch/s':>12}{'p50 us':>9}{'p99 us':>9}" \
+             f"{'MAE d':>9}{'bias d':>9}{'late':>7}{'hits':>7}{'ECE':>7}{'Brier':>7}"
+    print(header)
+    print("-" * len(header))
+    for name, result in results["strategies"].items():
+        speed, accuracy, calib = result["throughput"], result["accuracy"], result["calibration"]
+        print(
+            f"{name:<16}{speed['items_per_s']:>12,}{speed['batch_items_per_s']:>12,}"
+            f"{speed['p50_us']:>9.1f}{speed['p99_us']:>9.1f}"
+            f"{accuracy['mae_days']:>9.2f}{accuracy['bias_days']:>+9.2f}"
+            f"{accuracy['late_rate']:>7.1%}{accuracy['hit_rate']:>7.1%}"
+            f"{calib['expected_calibration_error']:>7.3f}{calib['brier_score']:>7.3f}"
+        )
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dataset", type=Path, help="CSV to replay instead of the generated dataset")
+    parser.add_argument("--items", type=int, default=20_000, help="Rows to generate from the fixture")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Hit if within this fraction of the actual shelf life")
+    parser.add_argument("--output", type=Path, default=Path("expiry_accuracy.json"))
+    parser.add_argument("--save-dataset", type=Path, help="Also write the replayed dataset as CSV")
+    args = parser.parse_args(argv)
+
+    if args.dataset:
+        rows = read_dataset(args.dataset)
+        source = str(args.dataset)
+    else:
+        products = json.loads(FIXTURE.read_text())["products"]
+        rows = generate_dataset(products, args.items, random.Random(args.seed), date(2024, 1, 1))
+        source = f"{FIXTURE.name} (seed {args.seed})"
+    if args.save_dataset:
+        write_dataset(rows, args.save_dataset)
+
+    results = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "dataset": {"source": source, "items": len(rows), "sha256": _dataset_digest(rows)},
+        "rules_version": expiry_prediction_service.rules_version,
+        "tolerance": args.tolerance,
+        "strategies": {
+            strategy.name: evaluate(strategy, rows, args.tolerance)
+            for strategy in expiry_prediction_service.strategies
+        },
+    }
+
+    print(f"{len(rows):,} items from {source}\n")
+    _print_report(results)
+    args.output.write_text(json.dumps(results, indent=2))
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Throughput of batch expiry prediction against the per-item loop.
+
+Generates --items synthetic inputs (default 10k) spread over every rule
+key plus unknown categories and missing fields, then times the default
+strategy's predict() loop and its predict_expiry_batch() path, checking
+that both return identical predictions.
+
+Usage:
+    python -m benchmarks.bench_expiry_batch
+    python -m benchmarks.bench_expiry_batch --items 100000 --rounds 10
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='snapshelf-bench-')}/expiry.db")
+os.environ.setdefault("APP_ENV", "test")
+
+from app.services.expiry_prediction import expiry_prediction_service  # noqa: E402
+from app.services.expiry_prediction.strategies.base import ExpiryPredictionInput  # noqa: E402
+from app.services.expiry_prediction.strategies.rule_based import RuleBasedStrategy  # noqa: E402
+
+
+def _synthetic_items(count: int, rng: random.Random) -> list[ExpiryPredictionInput]:
+    categories = sorted({c for c, _ in RuleBasedStrategy.SHELF_LIFE_RULES}) + ["Unknown", None]
+    storages = sorted(RuleBasedStrategy.STORAGE_DEFAULTS) + [None]
+    today = date.today()
+    return [
+        ExpiryPredictionInput(
+            name=f"item {i}",
+            category=rng.choice(categories),
+            storage_location=rng.choice(storages),
+            purchase_date=today - timedelta(days=rng.randint(0, 30)) if rng.random() < 0.8 else None
+        )
+        for i in range(count)
+    ]
+
+
+def _loop(strategy, items):
+    return [
+        strategy.predict(
+            name=item.name,
+            category=item.category,
+            storage_location=item.storage_location,
+            purchase_date=item.purchase_date
+        )
+        for item in items
+    ]
+
+
+def _time(fn, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    items = _synthetic_items(args.items, random.Random(42))
+    strategy = expiry_prediction_service.default_strategy
+
+    assert strategy.predict_expiry_batch(items) == _loop(strategy, items)
+
+    loop_seconds = _time(lambda: _loop(strategy, items), args.rounds)
+    batch_seconds = _time(lambda: strategy.predict_expiry_batch(items), args.rounds)
+
+    print(f"{args.items:,} items, median of {args.rounds} rounds\n")
+    for label, seconds in (("per-item loop", loop_seconds), ("batch", batch_seconds)):
+        print(f"{label:<16}{seconds * 1000:>10.2f} ms{args.items / seconds:>14,.0f} items/s")
+    print(f"\nspeedup {loop_seconds / batch_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Throughput of the vectorized category insights over synthetic events.
+
+Generates --events synthetic inventory events (default 1M) and times:
+- events_to_arrays: transposing DB-style row tuples into NumPy columns
+- compute_category_insights: the vectorized per-category pass
+- a pure-Python dict loop computing the same metrics, for comparison
+
+No database is involved; this isolates the in-process cost of an
+insights request for a very long event history.
+
+Usage:
+    python -m benchmarks.bench_insights
+    python -m benchmarks.bench_insights --events 200000 --categories 50
+"""
+import argparse
+import os
+import tempfile
+import time
+from collections import defaultdict
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='snapshelf-bench-')}/insights.db")
+os.environ.setdefault("APP_ENV", "test")
+
+import numpy as np  # noqa: E402
+
+from app.services.insights import compute_category_insights, events_to_arrays  # noqa: E402
+
+REASONS = ("consumed", "wasted", "adjusted")
+
+
+def _synthetic_rows(n: int, n_categories: int, seed: int = 42) -> list[tuple]:
+    rng = np.random.default_rng(seed)
+    categories = [f"category-{i}" for i in range(n_categories)]
+    category_idx = rng.integers(0, n_categories, n)
+    reason_idx = rng.choice(3, n, p=[0.6, 0.25, 0.15])
+    before = rng.integers(1, 5, n)
+    # Most removals finish the item; adjustments may go up or down
+    after = np.where(rng.random(n) < 0.7, 0, np.maximum(before - rng.integers(-1, 3, n), 0))
+    age_days = rng.integers(1, 24 * 30, n) / 24
+
+    # Same shape the database returns for event_columns()
+    return list(zip(
+        [categories[i] for i in category_idx],
+        [REASONS[i] for i in reason_idx],
+        before.astype(float).tolist(),
+        after.astype(float).tolist(),
+        age_days.tolist(),
+    ))
+
+
+def _python_insights(rows: list[tuple]) -> dict:
+    """Reference implementation: one dict update per event"""
+    stats = defaultdict(lambda: [0, 0, 0, 0.0])  # consumed, wasted, finished, age sum
+    for category, reason, before, after, age_days in rows:
+        if after >= before:
+            continue
+        entry = stats[category]
+        if reason == "consumed":
+            entry[0] += 1
+            if after == 0:
+                entry[2] += 1
+                entry[3] += age_days
+        elif reason == "wasted":
+            entry[1] += 1
+    return {
+        category: (
+            wasted / (consumed + wasted) if consumed + wasted else 0.0,
+            age_sum / finished if finished else None,
+        )
+        for category, (consumed, wasted, finished, age_sum) in stats.items()
+    }
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--categories", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = _synthetic_rows(args.events, args.categories)
+
+    arrays, load_seconds = _timed(events_to_arrays, rows)
+    insights, numpy_seconds = _timed(compute_category_insights, arrays)
+    reference, python_seconds = _timed(_python_insights, rows)
+
+    for insight in insights:
+        waste_rate, avg_days = reference[insight.category]
+        assert np.isclose(insight.waste_rate, waste_rate)
+        assert np.isclose(insight.avg_days_to_consume, avg_days)
+
+    print(f"{args.events:,} events, {args.categories} categories\n")
+    print(f"{'rows -> arrays':<24}{load_seconds * 1000:>10.1f} ms")
+    print(f"{'vectorized insights':<24}{numpy_seconds * 1000:>10.1f} ms")
+    print(f"{'python loop insights':<24}{python_seconds * 1000:>10.1f} ms")
+    print(f"\nspeedup (compute only): {python_seconds / numpy_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Show that inventory export memory stays flat as the row count grows.
+
+For each row count a fresh subprocess seeds one user's inventory, then
+streams GET /api/inventory/export through the in-process ASGI app while
+discarding the body. Peak RSS growth during the export is reported; it
+should stay roughly constant from 10k to 100k rows. For contrast the
+same is measured for the unpaginated GET /api/inventory list.
+
+Usage:
+    python -m benchmarks.bench_inventory_export
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_inventory_export --rows 10000 100000
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+
+
+def _max_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_worker(rows: int, endpoint: str, export_format: str) -> dict:
+    from fastapi import FastAPI
+    from sqlalchemy import insert
+
+    from app.core.database import Base, engine, SessionLocal
+    from app.models.inventory_item import InventoryItem
+    from app.models.user import User
+    from app.routers import inventory_items
+
+    Base.metadata.create_all(bind=engine)
+    user_id = uuid.uuid4()
+    with SessionLocal() as db:
+        db.add(User(id=user_id, email=f"bench-{user_id}@example.com"))
+        db.commit()
+        chunk = 10_000
+        for start in range(0, rows, chunk):
+            db.execute(insert(InventoryItem), [
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user_id,
+                    "name": f"Item {i}",
+                    "category": "dairy",
+                    "quantity": 1,
+                    "unit": "L",
+                    "storage_location": "fridge",
+                    "expiry_date": date.today() + timedelta(days=i % 365),
+                }
+                for i in range(start, min(start + chunk, rows))
+            ])
+        db.commit()
+
+    app = FastAPI()
+    app.include_router(inventory_items.router, prefix="/api")
+
+    async def consume() -> int:
+        # Drive the ASGI app directly: httpx's ASGITransport buffers the
+        # whole body, which would hide whether the server streams.
+        path = "/api/inventory/export" if endpoint == "export" else "/api/inventory"
+        query = f"format={export_format}" if endpoint == "export" else ""
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [(b"host", b"bench"), (b"x-user-id", str(user_id).encode())],
+            "client": ("127.0.0.1", 0),
+            "server": ("bench", 80),
+        }
+        received = 0
+        status = None
+        request_sent = False
+        response_done = asyncio.Event()
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # Starlette polls for client disconnect while streaming
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal received, status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                received += len(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_done.set()
+
+        await app(scope, receive, send)
+        if status != 200:
+            raise RuntimeError(f"{path} returned {status}")
+        return received
+
+    baseline = _max_rss_mb()
+    start = time.perf_counter()
+    received = asyncio.run(consume())
+    elapsed = time.perf_counter() - start
+
+    return {
+        "rows": rows,
+        "bytes": received,
+        "seconds": elapsed,
+        "rss_growth_mb": _max_rss_mb() - baseline,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    parser.add_argument("--format", dest="export_format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--worker", choices=["export", "list"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(_run_worker(args.rows[0], args.worker, args.export_format)))
+        return
+
+    print(f"{'endpoint':<10}{'rows':>10}{'MB sent':>10}{'seconds':>10}{'RSS growth MB':>16}")
+    for endpoint in ("export", "list"):
+        for rows in args.rows:
+            env = dict(os.environ, APP_ENV=os.environ.get("APP_ENV", "test"))
+            if "DATABASE_URL" not in os.environ:
+                env["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='snapshelf-bench-')}/export.db"
+
+            output = subprocess.run(
+                [
+                    sys.executable, "-m", "benchmarks.bench_inventory_export",
+                    "--worker", endpoint, "--rows", str(rows), "--format", args.export_format,
+                ],
+                env=env,
+                capture_output=True,
+                text=True
+            )
+            if output.returncode != 0:
+                sys.exit(f"{endpoint} worker failed for {rows} rows:\n{output.stderr}")
+            result = json.loads(output.stdout.strip().splitlines()[-1])
+            print(
+                f"{endpoint:<10}{result['rows']:>10}{result['bytes'] / 1e6:>10.1f}"
+                f"{result['seconds']:>10.2f}{result['rss_growth_mb']:>16.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
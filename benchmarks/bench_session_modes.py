@@ -0,0 +1,145 @@
+"""
+Compare requests/sec of the sync and async session modes.
+
+Runs the list and confirm endpoints in-process (ASGI transport, no network)
+under concurrent load, once per DB_SESSION_MODE. Each mode runs in its own
+subprocess because the engine is chosen at import time.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_session_modes
+    python -m benchmarks.bench_session_modes --requests 2000 --concurrency 64
+
+Without DATABASE_URL a temporary SQLite file is used, which is fine for a
+smoke run but not representative of Postgres latency.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+
+
+def _run_worker(total_requests: int, concurrency: int) -> dict:
+    import httpx
+    from fastapi import FastAPI
+
+    from app.core.database import Base, engine, SessionLocal
+    from app.models.user import User
+    from app.routers import draft_items, inventory_items
+
+    Base.metadata.create_all(bind=engine)
+
+    app = FastAPI()
+    app.include_router(draft_items.router, prefix="/api")
+    app.include_router(inventory_items.router, prefix="/api")
+
+    db = SessionLocal()
+    user_id = uuid.uuid4()
+    db.add(User(id=user_id, email=f"bench-{user_id}@example.com"))
+    db.commit()
+    db.close()
+
+    headers = {"X-User-Id": str(user_id)}
+    confirmation = {
+        "name": "Milk",
+        "category": "dairy",
+        "quantity": 1,
+        "unit": "L",
+        "storage_location": "fridge",
+        "expiry_date": (date.today() + timedelta(days=7)).isoformat(),
+    }
+
+    async def run_load(client, make_request, n: int) -> float:
+        queue = asyncio.Queue()
+        for i in range(n):
+            queue.put_nowait(i)
+
+        async def worker():
+            while not queue.empty():
+                i = queue.get_nowait()
+                response = await make_request(client, i)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return n / (time.perf_counter() - start)
+
+    async def main() -> dict:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            # Seed drafts to confirm (and to give the list endpoint some rows)
+            draft_ids = []
+            for _ in range(total_requests):
+                response = await client.post(
+                    "/api/draft-items",
+                    json={"name": "Milk", "category": "dairy", "location": "fridge"},
+                    headers=headers
+                )
+                draft_ids.append(response.json()["id"])
+
+            confirm_rps = await run_load(
+                client,
+                lambda c, i: c.post(
+                    f"/api/draft-items/{draft_ids[i]}/confirm",
+                    json=confirmation,
+                    headers=headers
+                ),
+                total_requests
+            )
+            list_rps = await run_load(
+                client,
+                lambda c, i: c.get("/api/inventory", headers=headers),
+                total_requests
+            )
+
+        return {"list_rps": list_rps, "confirm_rps": confirm_rps}
+
+    results = asyncio.run(main())
+    Base.metadata.drop_all(bind=engine)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(_run_worker(args.requests, args.concurrency)))
+        return
+
+    env = dict(os.environ)
+    env.setdefault("APP_ENV", "test")
+    tmp_dir = None
+    if "DATABASE_URL" not in env:
+        tmp_dir = tempfile.mkdtemp(prefix="snapshelf-bench-")
+
+    print(f"{'mode':<8}{'list req/s':>14}{'confirm req/s':>16}")
+    for mode in ("sync", "async"):
+        mode_env = dict(env, DB_SESSION_MODE=mode)
+        if tmp_dir:
+            mode_env["DATABASE_URL"] = f"sqlite:///{tmp_dir}/{mode}.db"
+
+        output = subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.bench_session_modes", "--worker",
+                "--requests", str(args.requests), "--concurrency", str(args.concurrency),
+            ],
+            env=mode_env,
+            check=True,
+            capture_output=True,
+            text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{mode:<8}{result['list_rps']:>14.1f}{result['confirm_rps']:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Shared fixtures for API tests.
+
+Routers are exercised against a throwaway SQLite database so the suite
+runs without Postgres. DATABASE_URL must be set before app modules are
+imported, because the engine is created at import time.
+"""
+import os
+import tempfile
+import uuid
+
+_TEST_DB_DIR = tempfile.mkdtemp(prefix="snapshelf-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_TEST_DB_DIR}/snapshelf_test.db")
+os.environ.setdefault("APP_ENV", "test")
+
+import pytest  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.core.database import Base, engine, async_engine, SessionLocal  # noqa: E402
+from app.models import user, draft_item, inventory_item, inventory_summary, inventory_event, shelf_life_adjustment  # noqa: E402,F401
+from app.models.user import User  # noqa: E402
+from app.routers import alerts, draft_items, expiry_prediction, inventory_items, insights, recipes  # noqa: E402
+
+
+@pytest.fixture
+def db_tables():
+    """Create all tables for one test and drop them afterwards"""
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def user_id(db_tables):
+    """Insert a user and return its id"""
+    db = SessionLocal()
+    try:
+        db_user = User(id=uuid.uuid4(), email=f"{uuid.uuid4()}@example.com")
+        db.add(db_user)
+        db.commit()
+        return db_user.id
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def client(db_tables):
+    """
+    TestClient over the database routers.
+
+    app.main is not imported because the barcode scanner requires Java
+    at import time; the routers under test do not depend on it.
+    """
+    app = FastAPI()
+    app.include_router(draft_items.router, prefix="/api")
+    app.include_router(inventory_items.router, prefix="/api")
+    app.include_router(insights.router, prefix="/api")
+    app.include_router(alerts.router, prefix="/api")
+    app.include_router(recipes.router, prefix="/api")
+    app.include_router(expiry_prediction.router, prefix="/api")
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def auth_headers(user_id):
+    return {"X-User-Id": str(user_id)}
+
+
+@pytest.fixture
+def statements():
+    """
+    Record every SQL statement sent to the database used by the routers.
+
+    Transaction control (BEGIN/COMMIT) is not a cursor execute and is
+    therefore not recorded.
+    """
+    target = async_engine.sync_engine if async_engine is not None else engine
+    recorded = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append(statement)
+
+    event.listen(target, "before_cursor_execute", record)
+    yield recorded
+    event.remove(target, "before_cursor_execute", record)
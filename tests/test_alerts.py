@@ -0,0 +1,255 @@
+"""
+Tests for the expiry alert scheduler and alert settings.
+"""
+import asyncio
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.database import SessionLocal
+from app.models.inventory_item import InventoryItem
+from app.services.alerts import AlertScheduler, Notifier, alert_scheduler
+from tests.test_inventory_items import _seed_inventory
+
+NOW = datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class RecordingNotifier(Notifier):
+    def __init__(self):
+        self.batches = []
+
+    async def send(self, alerts):
+        self.batches.append(alerts)
+
+
+def _scheduler(clock=lambda: NOW, days=(3, 1, 0)):
+    scheduler = AlertScheduler(
+        notifier=RecordingNotifier(),
+        default_days=days,
+        alert_hour_utc=9,
+        resync_seconds=3600,
+        clock=clock
+    )
+    scheduler.active = True
+    return scheduler
+
+
+def _item(expiry_date, user_id=None, name="Milk"):
+    return SimpleNamespace(
+        id=uuid.uuid4(), user_id=user_id or uuid.uuid4(), name=name, expiry_date=expiry_date
+    )
+
+
+def _at(day, hour=9):
+    return datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc) + timedelta(hours=hour)
+
+
+class TestAlertHeap:
+
+    def test_thresholds_fire_in_order(self):
+        scheduler = _scheduler()
+        item = _item(date(2024, 6, 10))
+        scheduler.item_added(item)
+
+        assert scheduler.pop_due(_at(date(2024, 6, 6))) == []
+        [three_days] = scheduler.pop_due(_at(date(2024, 6, 7)))
+        [one_day] = scheduler.pop_due(_at(date(2024, 6, 9)))
+        [same_day] = scheduler.pop_due(_at(date(2024, 6, 10)))
+
+        assert [a.days_before for a in (three_days, one_day, same_day)] == [3, 1, 0]
+        assert same_day.item_id == item.id
+        assert scheduler.snapshot()["tracked_items"] == 0
+
+    def test_passed_thresholds_are_skipped(self):
+        scheduler = _scheduler()
+        # Expires in two days: the 3-day alert time is already in the past
+        scheduler.item_added(_item(date(2024, 6, 3)))
+
+        assert scheduler.snapshot()["pending_alerts"] == 2
+
+    def test_removed_item_never_fires(self):
+        scheduler = _scheduler()
+        item = _item(date(2024, 6, 10))
+        scheduler.item_added(item)
+
+        scheduler.item_removed(item.id)
+
+        assert scheduler.pop_due(_at(date(2024, 6, 30))) == []
+
+    def test_only_most_urgent_threshold_of_an_item_is_sent(self):
+        scheduler = _scheduler()
+        scheduler.item_added(_item(date(2024, 6, 10)))
+
+        [alert] = scheduler.pop_due(_at(date(2024, 6, 30)))
+
+        assert alert.days_before == 0
+
+    def test_stale_entries_are_compacted(self):
+        scheduler = _scheduler()
+        item = _item(date(2024, 6, 20))
+        for _ in range(100):
+            scheduler.item_added(item)
+
+        snapshot = scheduler.snapshot()
+        assert snapshot["pending_alerts"] == 3
+        assert snapshot["heap_entries"] < 100
+
+    def test_user_thresholds_reschedule_tracked_items(self):
+        scheduler = _scheduler()
+        item = _item(date(2024, 6, 10))
+        scheduler.item_added(item)
+
+        scheduler.set_user_thresholds(item.user_id, (5,))
+
+        [alert] = scheduler.pop_due(_at(date(2024, 6, 30)))
+        assert alert.days_before == 5
+        assert scheduler.thresholds(uuid.uuid4()) == (3, 1, 0)
+
+    def test_hooks_are_ignored_when_inactive(self):
+        scheduler = _scheduler()
+        scheduler.active = False
+
+        scheduler.item_added(_item(date(2024, 6, 10)))
+
+        assert scheduler.snapshot()["pending_alerts"] == 0
+
+
+class TestAlertLoop:
+
+    def test_due_alerts_are_delivered_in_a_batch(self, db_tables):
+        now = [NOW]
+        scheduler = _scheduler(clock=lambda: now[0])
+        scheduler.active = False
+        items = [_item(date(2024, 6, 5), name=name) for name in ("Milk", "Eggs")]
+
+        async def scenario():
+            await scheduler.start()
+            for item in items:
+                scheduler.item_added(item)
+            now[0] = _at(date(2024, 6, 2))
+            scheduler._wakeup.set()
+            await asyncio.sleep(0.05)
+            await scheduler.stop()
+
+        asyncio.run(scenario())
+
+        [batch] = scheduler.notifier.batches
+        assert {a.item_name for a in batch} == {"Milk", "Eggs"}
+        assert scheduler.stats["fired"] == 2
+
+    def test_resync_loads_items_and_user_thresholds(self, client, auth_headers, user_id):
+        client.put(
+            "/api/alerts/settings", json={"expiry_alert_days": [2]}, headers=auth_headers
+        )
+        _seed_inventory(user_id, 3, expiry_date=date.today() + timedelta(days=5))
+        # Beyond the alert horizon: picked up by a later resync
+        _seed_inventory(user_id, 1, expiry_date=date.today() + timedelta(days=90))
+        scheduler = _scheduler(clock=lambda: datetime.now(timezone.utc))
+
+        asyncio.run(scheduler.resync())
+
+        assert scheduler.thresholds(user_id) == (2,)
+        assert scheduler.snapshot()["pending_alerts"] == 3
+
+    def test_resync_sends_missed_alerts_once(self, user_id):
+        today = date.today()
+        now = _at(today, hour=12)
+        created = now - timedelta(days=5)
+        [missed] = _seed_inventory(
+            user_id, 1, expiry_date=today + timedelta(days=1), created_at=created
+        )
+        # Already alerted one day ahead: only the same-day alert is left
+        _seed_inventory(
+            user_id, 1, expiry_date=today + timedelta(days=1), created_at=created,
+            alerted_days_before=1
+        )
+        scheduler = _scheduler(clock=lambda: now)
+
+        asyncio.run(scheduler.resync())
+        [alert] = scheduler.pop_due(now)
+        asyncio.run(scheduler._deliver([alert]))
+
+        # The 3-day and 1-day times passed unseen: only the most urgent is sent
+        assert (alert.item_id, alert.days_before) == (missed, 1)
+        assert scheduler.snapshot()["pending_alerts"] == 2
+        db = SessionLocal()
+        try:
+            assert db.get(InventoryItem, missed).alerted_days_before == 1
+        finally:
+            db.close()
+
+        # After a restart the sent alert is not repeated
+        restarted = _scheduler(clock=lambda: now)
+        asyncio.run(restarted.resync())
+        assert restarted.pop_due(now) == []
+        assert restarted.snapshot()["pending_alerts"] == 2
+
+    def test_items_confirmed_after_alert_time_are_not_alerted(self, user_id):
+        today = date.today()
+        now = _at(today, hour=12)
+        _seed_inventory(
+            user_id, 1, expiry_date=today + timedelta(days=1), created_at=now - timedelta(hours=1)
+        )
+        scheduler = _scheduler(clock=lambda: now)
+
+        asyncio.run(scheduler.resync())
+
+        assert scheduler.pop_due(now) == []
+        assert scheduler.snapshot()["pending_alerts"] == 1
+
+
+@pytest.fixture
+def active_scheduler():
+    """Let the routers' hooks reach the shared scheduler for one test"""
+    alert_scheduler.active = True
+    yield alert_scheduler
+    alert_scheduler.active = False
+    for item_id in list(alert_scheduler._items):
+        alert_scheduler.item_removed(item_id)
+
+
+class TestAlertHooks:
+
+    def test_confirm_and_delete_update_schedule(self, client, auth_headers, active_scheduler):
+        draft = client.post("/api/draft-items", json={"name": "Milk"}, headers=auth_headers).json()
+        item = client.post(
+            f"/api/draft-items/{draft['id']}/confirm",
+            json={
+                "name": "Milk", "category": "dairy", "quantity": 1, "unit": "L",
+                "storage_location": "fridge",
+                "expiry_date": (date.today() + timedelta(days=10)).isoformat(),
+            },
+            headers=auth_headers
+        ).json()
+        assert active_scheduler.snapshot()["pending_alerts"] == 3
+
+        client.delete(f"/api/inventory/{item['id']}", headers=auth_headers)
+
+        assert active_scheduler.snapshot()["pending_alerts"] == 0
+
+
+class TestAlertSettings:
+
+    def test_defaults(self, client, auth_headers):
+        response = client.get("/api/alerts/settings", headers=auth_headers)
+
+        assert response.json() == {"expiry_alert_days": [3, 1, 0], "is_default": True}
+
+    def test_update_and_reset(self, client, auth_headers):
+        response = client.put(
+            "/api/alerts/settings", json={"expiry_alert_days": [1, 7, 1]}, headers=auth_headers
+        )
+        assert response.json() == {"expiry_alert_days": [7, 1], "is_default": False}
+
+        client.put("/api/alerts/settings", json={"expiry_alert_days": None}, headers=auth_headers)
+
+        assert client.get("/api/alerts/settings", headers=auth_headers).json()["is_default"]
+
+    def test_out_of_range_days_are_rejected(self, client, auth_headers):
+        response = client.put(
+            "/api/alerts/settings", json={"expiry_alert_days": [90]}, headers=auth_headers
+        )
+
+        assert response.status_code == 422
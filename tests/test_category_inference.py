@@ -0,0 +1,132 @@
+"""
+Tests for keyword-based category inference from item names.
+"""
+import json
+from datetime import date
+
+import pytest
+
+from app.services.expiry_prediction import ExpiryPredictionInput, ExpiryPredictionService
+from app.services.expiry_prediction.category_inference import (
+    AhoCorasick,
+    BUNDLED_KEYWORDS,
+    CategoryInferrer,
+    normalize_text
+)
+
+
+@pytest.fixture(scope="module")
+def inferrer():
+    return CategoryInferrer.from_file(BUNDLED_KEYWORDS)
+
+
+class TestAhoCorasick:
+
+    def test_finds_overlapping_keywords(self):
+        keywords = ["he", "she", "his", "hers"]
+        automaton = AhoCorasick.build(keywords)
+
+        matches = sorted((end, keywords[k]) for end, k in automaton.iter_matches("ushers"))
+
+        assert matches == [(3, "he"), (3, "she"), (5, "hers")]
+
+
+class TestCategoryInferrer:
+
+    @pytest.mark.parametrize("name,category", [
+        ("Semi-skimmed Milk 2L", "dairy"),
+        ("Hähnchenbrust", "poultry"),
+        ("Crème fraîche", "dairy"),
+        ("Free range eggs x12", "eggs"),
+        ("Tesco bananas", "fruits"),
+        ("Pommes de terre", "vegetables"),
+        ("Peanut butter", "condiments"),
+        ("Chocolate milk", "dairy"),
+        ("Carrot cake", "bakery"),
+        ("Apple pie", "bakery"),
+        ("Tomato sauce", "condiments"),
+        ("Frozen orange juice", "frozen"),
+        ("Cream crackers", "bakery"),
+        ("Strawberry yogurt 4x125g", "dairy"),
+        ("Garlic bread", "bread"),
+        ("Mince pies x6", "bakery"),
+        ("Chicken stock", "condiments"),
+        ("Butter beans", "canned"),
+    ])
+    def test_infers_category(self, inferrer, name, category):
+        assert inferrer.infer(name).category == category
+
+    @pytest.mark.parametrize("name", [
+        "Milk chocolate 100g", "Apple juice 1L", "Orange juice", "Chocolat au lait", "Egg noodles",
+        "Pineapple juice", "Milk chocolate bar", "Cheese and onion crisps", "Ginger beer",
+    ])
+    def test_compound_terms_override_their_first_word(self, inferrer, name):
+        assert inferrer.infer(name) is None
+
+    def test_respects_word_boundaries(self, inferrer):
+        assert inferrer.infer("Eggplant").category == "vegetables"
+        assert inferrer.infer("Hammer") is None
+
+    def test_modifier_beats_noun(self, inferrer):
+        assert inferrer.infer("Frozen salmon fillets").category == "frozen"
+        assert inferrer.infer("Tinned sweetcorn").category == "canned"
+
+    def test_unknown_names(self, inferrer):
+        assert inferrer.infer("Dish soap") is None
+        assert inferrer.infer("") is None
+
+    def test_unclassified_keyword_wins_over_categories(self, tmp_path):
+        keywords = tmp_path / "keywords.json"
+        keywords.write_text(json.dumps({
+            "unclassified": ["milk chocolate"],
+            "categories": {"dairy": ["milk", "milk chocolate"]},
+        }))
+
+        inferrer = CategoryInferrer.from_file(keywords)
+
+        assert inferrer.infer("Milk chocolate") is None
+        assert inferrer.infer("Milk").category == "dairy"
+
+    def test_normalize_text(self):
+        assert normalize_text("  Crème-FRAÎCHE 30% ") == "creme fraiche 30"
+
+
+class TestServiceInference:
+
+    def test_name_only_prediction_uses_inferred_category(self):
+        service = ExpiryPredictionService(cache_size=10)
+
+        prediction = service.predict_expiry("Whole milk", None, "fridge", date(2024, 1, 1))
+
+        assert prediction.expiry_date == date(2024, 1, 8)
+        assert prediction.confidence == round(0.85 * service.INFERRED_CONFIDENCE_FACTOR, 2)
+        assert "inferred from 'whole milk'" in prediction.reasoning
+
+    def test_explicit_category_is_not_overridden(self):
+        service = ExpiryPredictionService(cache_size=10)
+
+        prediction = service.predict_expiry("Whole milk", "frozen", "freezer", date(2024, 1, 1))
+
+        assert "inferred" not in prediction.reasoning
+        assert prediction.confidence == 0.85
+
+    def test_batch_matches_single_predictions(self):
+        service = ExpiryPredictionService(cache_size=0)
+        items = [
+            ExpiryPredictionInput("Chicken thighs", None, "fridge", date(2024, 1, 1)),
+            ExpiryPredictionInput("Chicken thighs", "meat", "fridge", date(2024, 1, 1)),
+            ExpiryPredictionInput("Mystery box", None, "pantry", date(2024, 1, 1)),
+        ]
+
+        assert service.predict_expiry_batch(items) == [
+            service.predict_expiry(item.name, item.category, item.storage_location, item.purchase_date)
+            for item in items
+        ]
+
+    def test_strategy_comparison_infers_category(self):
+        service = ExpiryPredictionService(cache_size=0)
+
+        [compared] = service.predict_multiple_strategies("Whole milk", None, "fridge", date(2024, 1, 1))
+
+        assert compared == service.predict_expiry("Whole milk", None, "fridge", date(2024, 1, 1))
+        assert service.get_best_prediction("Whole milk", None, "fridge", date(2024, 1, 1)) == compared
@@ -0,0 +1,54 @@
+"""
+Tests for settings read from the environment.
+"""
+import pytest
+
+from app.core.config import ENGINE_PROFILES, Settings
+from app.core.database import engine_kwargs
+
+
+class TestEnvironmentOverrides:
+
+    def test_explicit_zero_is_kept(self, monkeypatch):
+        monkeypatch.setenv("APP_ENV", "prod")
+        monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+        monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "0")
+        monkeypatch.setenv("REPLICA_READ_YOUR_WRITES_SECONDS", "0")
+        monkeypatch.setenv("EXPIRY_PREDICTION_CACHE_SIZE", "0")
+        monkeypatch.setenv("USER_ADJUSTMENT_REFRESH_SECONDS", "0")
+
+        settings = Settings.from_env()
+
+        assert settings.engine_profile.max_overflow == 0
+        assert settings.engine_profile.statement_timeout_ms == 0
+        assert settings.replica_read_your_writes_seconds == 0
+        assert settings.expiry_prediction_cache_size == 0
+        assert settings.user_adjustment_refresh_seconds == 0
+        kwargs = engine_kwargs("postgresql+psycopg2://db/app", settings.engine_profile)
+        assert kwargs["connect_args"] == {"options": "-c statement_timeout=0"}
+
+    def test_unset_uses_defaults(self, monkeypatch):
+        monkeypatch.setenv("APP_ENV", "prod")
+        monkeypatch.delenv("DB_MAX_OVERFLOW", raising=False)
+        monkeypatch.delenv("REPLICA_READ_YOUR_WRITES_SECONDS", raising=False)
+
+        settings = Settings.from_env()
+
+        assert settings.engine_profile.max_overflow == ENGINE_PROFILES["prod"].max_overflow
+        assert settings.replica_read_your_writes_seconds == 5.0
+
+    def test_zero_interval_is_rejected(self, monkeypatch):
+        monkeypatch.setenv("DRAFT_PURGE_INTERVAL_SECONDS", "0")
+
+        with pytest.raises(RuntimeError, match="DRAFT_PURGE_INTERVAL_SECONDS"):
+            Settings.from_env()
+
+
+class TestAlertScheduling:
+
+    def test_scheduler_is_opt_in(self, monkeypatch):
+        monkeypatch.delenv("ALERTS_ENABLED", raising=False)
+        assert Settings.from_env().alerts_enabled is False
+
+        monkeypatch.setenv("ALERTS_ENABLED", "true")
+        assert Settings.from_env().alerts_enabled is True
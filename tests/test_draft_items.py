@@ -0,0 +1,278 @@
+"""
+API tests for the draft -> inventory workflow.
+"""
+import csv
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from app.core.database import SessionLocal
+from app.models.draft_item import DraftItem
+
+
+def _create_draft(client, headers, **overrides):
+    payload = {"name": "Milk", "category": "dairy", "location": "fridge"}
+    payload.update(overrides)
+    response = client.post("/api/draft-items", json=payload, headers=headers)
+    assert response.status_code == 201
+    return response.json()
+
+
+def _confirmation(**overrides):
+    payload = {
+        "name": "Milk",
+        "category": "dairy",
+        "quantity": 1,
+        "unit": "L",
+        "storage_location": "fridge",
+        "expiry_date": (date.today() + timedelta(days=7)).isoformat(),
+    }
+    payload.update(overrides)
+    return payload
+
+
+class TestDraftItems:
+    """CRUD on untrusted draft items"""
+
+    def test_create_predicts_expiry(self, client, auth_headers):
+        """Drafts without an expiration date get one from the prediction service"""
+        draft = _create_draft(client, auth_headers)
+
+        assert draft["expiration_date"] == (date.today() + timedelta(days=7)).isoformat()
+        assert draft["confidence_score"] == 0.85
+        assert "[Auto-predicted:" in draft["notes"]
+
+    def test_list_only_returns_own_drafts(self, client, auth_headers):
+        """Drafts are scoped to the requesting user"""
+        _create_draft(client, auth_headers)
+
+        other = {"X-User-Id": "00000000-0000-0000-0000-000000000001"}
+        assert client.get("/api/draft-items", headers=other).json() == []
+        assert len(client.get("/api/draft-items", headers=auth_headers).json()) == 1
+
+    def test_paginated_list(self, client, auth_headers, user_id):
+        """Drafts are paged oldest-first with an opaque cursor"""
+        created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        db = SessionLocal()
+        db.add_all([
+            DraftItem(id=uuid.uuid4(), user_id=user_id, name=f"Draft {i}", created_at=created)
+            for i in range(3)
+        ])
+        db.commit()
+        db.close()
+
+        first = client.get("/api/draft-items", params={"limit": 2}, headers=auth_headers)
+        second = client.get(
+            "/api/draft-items",
+            params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]},
+            headers=auth_headers
+        )
+
+        assert len(first.json()) == 2
+        assert len(second.json()) == 1
+        assert "X-Next-Cursor" not in second.headers
+        ids = {d["id"] for d in first.json()} | {d["id"] for d in second.json()}
+        assert len(ids) == 3
+
+    def test_confirm_invalidates_both_list_etags(self, client, auth_headers):
+        draft = _create_draft(client, auth_headers)
+        drafts_etag = client.get("/api/draft-items", headers=auth_headers).headers["ETag"]
+        inventory_etag = client.get("/api/inventory", headers=auth_headers).headers["ETag"]
+
+        client.post(
+            f"/api/draft-items/{draft['id']}/confirm", json=_confirmation(), headers=auth_headers
+        )
+
+        drafts = client.get("/api/draft-items", headers={**auth_headers, "If-None-Match": drafts_etag})
+        inventory = client.get("/api/inventory", headers={**auth_headers, "If-None-Match": inventory_etag})
+        assert drafts.status_code == 200
+        assert inventory.status_code == 200
+
+    def test_update_draft(self, client, auth_headers):
+        """PATCH only changes provided fields"""
+        draft = _create_draft(client, auth_headers)
+
+        response = client.patch(
+            f"/api/draft-items/{draft['id']}", json={"quantity": 2}, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["quantity"] == 2
+        assert response.json()["name"] == "Milk"
+
+    def test_delete_missing_draft_returns_404(self, client, auth_headers):
+        response = client.delete(
+            "/api/draft-items/00000000-0000-0000-0000-000000000000", headers=auth_headers
+        )
+        assert response.status_code == 404
+
+
+class TestConfirmDraft:
+    """The sacred draft -> inventory promotion"""
+
+    def test_confirm_moves_draft_to_inventory(self, client, auth_headers):
+        draft = _create_draft(client, auth_headers)
+
+        response = client.post(
+            f"/api/draft-items/{draft['id']}/confirm",
+            json=_confirmation(),
+            headers=auth_headers
+        )
+
+        assert response.status_code == 201
+        assert client.get("/api/draft-items", headers=auth_headers).json() == []
+        inventory = client.get("/api/inventory", headers=auth_headers).json()
+        assert [item["id"] for item in inventory] == [response.json()["id"]]
+
+    def test_confirm_other_users_draft_returns_404(self, client, auth_headers):
+        draft = _create_draft(client, auth_headers)
+        other = {"X-User-Id": "00000000-0000-0000-0000-000000000001"}
+
+        response = client.post(
+            f"/api/draft-items/{draft['id']}/confirm", json=_confirmation(), headers=other
+        )
+
+        assert response.status_code == 404
+
+
+class TestBatchCreate:
+    """Bulk draft creation"""
+
+    def test_batch_create_preserves_order_and_predicts(self, client, auth_headers):
+        payload = [
+            {"name": "Milk", "category": "dairy", "location": "fridge"},
+            {"name": "Bread", "category": "bread", "location": "pantry"},
+            {"name": "Jam", "expiration_date": "2030-01-01"},
+        ]
+
+        response = client.post("/api/draft-items/batch", json=payload, headers=auth_headers)
+
+        assert response.status_code == 201
+        drafts = response.json()
+        assert [d["name"] for d in drafts] == ["Milk", "Bread", "Jam"]
+        assert drafts[1]["expiration_date"] == (date.today() + timedelta(days=5)).isoformat()
+        assert drafts[2]["expiration_date"] == "2030-01-01"
+        assert drafts[2]["notes"] is None
+        assert len(client.get("/api/draft-items", headers=auth_headers).json()) == 3
+
+    def test_empty_batch_is_rejected(self, client, auth_headers):
+        response = client.post("/api/draft-items/batch", json=[], headers=auth_headers)
+        assert response.status_code == 422
+
+
+class TestBatchConfirm:
+    """Bulk draft -> inventory promotion"""
+
+    def test_confirms_valid_drafts_and_reports_errors(self, client, auth_headers):
+        drafts = [_create_draft(client, auth_headers, name=f"Milk {i}") for i in range(2)]
+        missing = "00000000-0000-0000-0000-000000000000"
+        payload = [
+            {"draft_id": drafts[0]["id"], "confirmation": _confirmation(name="Milk 0")},
+            {"draft_id": missing, "confirmation": _confirmation()},
+            {"draft_id": drafts[1]["id"], "confirmation": _confirmation(name="Milk 1")},
+            {"draft_id": drafts[1]["id"], "confirmation": _confirmation(name="Milk 1")},
+        ]
+
+        response = client.post(
+            "/api/draft-items/confirm-batch", json=payload, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [item["name"] for item in body["confirmed"]] == ["Milk 0", "Milk 1"]
+        assert sorted(e["draft_id"] for e in body["errors"]) == sorted([drafts[1]["id"], missing])
+        assert client.get("/api/draft-items", headers=auth_headers).json() == []
+        assert len(client.get("/api/inventory", headers=auth_headers).json()) == 2
+
+    def test_other_users_drafts_are_not_promoted(self, client, auth_headers):
+        draft = _create_draft(client, auth_headers)
+        other = {"X-User-Id": "00000000-0000-0000-0000-000000000001"}
+
+        response = client.post(
+            "/api/draft-items/confirm-batch",
+            json=[{"draft_id": draft["id"], "confirmation": _confirmation()}],
+            headers=other
+        )
+
+        assert response.json()["confirmed"] == []
+        assert len(client.get("/api/draft-items", headers=auth_headers).json()) == 1
+
+
+class TestImport:
+    """Bulk CSV/NDJSON import"""
+
+    def test_csv_import_reports_bad_rows(self, client, auth_headers):
+        content = (
+            "name,category,location,quantity\n"
+            "Milk,dairy,fridge,1\n"
+            ",dairy,fridge,1\n"
+            "Bread,bread,pantry,not-a-number\n"
+            "Eggs,eggs,fridge,12\n"
+        )
+
+        response = client.post(
+            "/api/draft-items/import",
+            files={"file": ("export.csv", content, "text/csv")},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["imported"] == 2
+        assert body["failed"] == 2
+        assert [e["row"] for e in body["errors"]] == [2, 3]
+        drafts = client.get("/api/draft-items", headers=auth_headers).json()
+        assert sorted(d["name"] for d in drafts) == ["Eggs", "Milk"]
+        assert all(d["source"] == "import" for d in drafts)
+        assert all(d["expiration_date"] for d in drafts)
+
+    def test_invalid_utf8_rows_are_rejected(self, client, auth_headers):
+        content = b"name,category\nMilk,dairy\nCaf\xe9,dairy\nEggs,eggs\n"
+
+        response = client.post(
+            "/api/draft-items/import",
+            files={"file": ("export.csv", content, "text/csv")},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["imported"] == 2
+        assert body["errors"] == [{"row": 2, "detail": "Row is not valid UTF-8"}]
+
+    def test_unparseable_csv_stops_with_partial_result(self, client, auth_headers):
+        oversized = "x" * (csv.field_size_limit() + 1)
+        content = f"name,category\nMilk,dairy\n{oversized},bread\nEggs,eggs\n"
+
+        response = client.post(
+            "/api/draft-items/import",
+            files={"file": ("export.csv", content, "text/csv")},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["imported"] == 1
+        assert body["errors"][0]["row"] == 2
+        assert body["errors"][0]["detail"].startswith("Unreadable CSV")
+
+    def test_ndjson_import(self, client, auth_headers):
+        content = '{"name": "Milk", "category": "dairy"}\n{not json}\n\n{"name": "Jam"}\n'
+
+        response = client.post(
+            "/api/draft-items/import",
+            params={"format": "ndjson"},
+            files={"file": ("export.txt", content)},
+            headers=auth_headers
+        )
+
+        body = response.json()
+        assert body["imported"] == 2
+        assert body["errors"][0]["row"] == 2
+
+    def test_unknown_format_is_rejected(self, client, auth_headers):
+        response = client.post(
+            "/api/draft-items/import",
+            files={"file": ("export.xlsx", b"binary")},
+            headers=auth_headers
+        )
+        assert response.status_code == 400
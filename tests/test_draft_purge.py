@@ -0,0 +1,70 @@
+"""
+Tests for the batched stale draft purge.
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.core.database import SessionLocal
+from app.models.draft_item import DraftItem
+from app.services.maintenance.draft_purge import purge_stale_drafts
+
+NOW = datetime.now(timezone.utc)
+
+
+def _seed_drafts(user_id, count, age_days):
+    db = SessionLocal()
+    try:
+        stamp = NOW - timedelta(days=age_days)
+        db.add_all([
+            DraftItem(
+                id=uuid.uuid4(), user_id=user_id, name=f"Draft {i}",
+                created_at=stamp, updated_at=stamp
+            )
+            for i in range(count)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def _remaining(user_id):
+    db = SessionLocal()
+    try:
+        return db.query(DraftItem).filter_by(user_id=user_id).count()
+    finally:
+        db.close()
+
+
+class TestDraftPurge:
+
+    def test_purges_only_stale_drafts_in_batches(self, user_id):
+        _seed_drafts(user_id, 5, age_days=40)
+        _seed_drafts(user_id, 2, age_days=3)
+
+        report = asyncio.run(purge_stale_drafts(ttl_days=30, batch_size=2, now=NOW))
+
+        assert report.purged == 5
+        assert report.batches == 3
+        assert report.duration_seconds >= 0
+        assert _remaining(user_id) == 2
+
+    def test_max_batches_leaves_the_rest_for_later(self, user_id):
+        _seed_drafts(user_id, 5, age_days=40)
+
+        report = asyncio.run(
+            purge_stale_drafts(ttl_days=30, batch_size=2, max_batches=1, now=NOW)
+        )
+
+        assert report.purged == 2
+        assert _remaining(user_id) == 3
+
+    def test_purge_changes_the_drafts_etag(self, client, auth_headers, user_id):
+        _seed_drafts(user_id, 1, age_days=40)
+        etag = client.get("/api/draft-items", headers=auth_headers).headers["ETag"]
+
+        asyncio.run(purge_stale_drafts(ttl_days=30, batch_size=10, now=NOW))
+
+        response = client.get("/api/draft-items", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json() == []
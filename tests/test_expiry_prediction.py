@@ -3,9 +3,16 @@ Unit tests for expiry prediction service.
 
 Tests the core academic requirement: deterministic, transparent predictions.
 """
+import threading
+
 import pytest
 from datetime import date, timedelta
 
+from app.services.expiry_prediction.strategies.base import (
+    ExpiryPrediction,
+    ExpiryPredictionInput,
+    ExpiryPredictionStrategy
+)
 from app.services.expiry_prediction.strategies.rule_based import RuleBasedStrategy
 from app.services.expiry_prediction import ExpiryPredictionService
 
@@ -127,6 +134,96 @@ class TestRuleBasedStrategy:
         assert prediction1.expiry_date == prediction2.expiry_date
         assert prediction1.confidence == prediction2.confidence
 
+    @pytest.mark.parametrize("category,storage,expected", [
+        ("dairy", "Refrigerator", ("dairy", "fridge")),
+        ("veg", "fridge ", ("vegetables", "fridge")),
+        ("Chicken", "deep freezer", ("poultry", "freezer")),
+        ("en:fermented-milk-products", "fridge", ("dairy", "fridge")),
+        ("frozen chicken breasts", "freezer", ("poultry", "freezer")),
+        ("Cheeses", "cupboard", ("dairy", "pantry")),
+    ])
+    def test_aliases_resolve_to_rules(self, category, storage, expected):
+        """Synonyms and Open Food Facts strings hit the canonical rule"""
+        prediction = self.strategy.predict(
+            name="Item",
+            category=category,
+            storage_location=storage,
+            purchase_date=date(2024, 1, 1)
+        )
+
+        days, confidence = RuleBasedStrategy.SHELF_LIFE_RULES[expected]
+        assert prediction.expiry_date == date(2024, 1, 1) + timedelta(days=days)
+        assert prediction.confidence == confidence
+        assert f"category '{expected[0]}' stored in '{expected[1]}'" in prediction.reasoning
+
+    def test_unknown_category_keeps_input_in_reasoning(self):
+        """Unmatched categories fall back to the storage default"""
+        prediction = self.strategy.predict(
+            name="Item",
+            category="Widgets",
+            storage_location="pantry"
+        )
+
+        assert prediction.confidence == RuleBasedStrategy.STORAGE_DEFAULTS["pantry"][1]
+        assert "category 'widgets'" in prediction.reasoning
+
+
+class TestRuleBasedBatch:
+    """Batch prediction must match per-item predict() exactly"""
+
+    def setup_method(self):
+        self.strategy = RuleBasedStrategy()
+
+    def test_matches_single_predictions(self):
+        """Rule hits, storage fallbacks, unknown keys and mixed case"""
+        items = [
+            ExpiryPredictionInput("Milk", "dairy", "fridge", date(2024, 1, 1)),
+            ExpiryPredictionInput("Beef", " MEAT ", "Freezer", date(2024, 2, 28)),
+            ExpiryPredictionInput("Mystery", "unknown", "fridge", date(2024, 3, 1)),
+            ExpiryPredictionInput("Thing", None, "pantry", None),
+            ExpiryPredictionInput("Other", "dairy", None, None),
+            ExpiryPredictionInput("Nothing", None, None, None),
+            ExpiryPredictionInput("Milk again", "dairy", "fridge", date(2024, 12, 31)),
+        ]
+
+        batch = self.strategy.predict_expiry_batch(items)
+
+        assert batch == [
+            self.strategy.predict(
+                name=item.name,
+                category=item.category,
+                storage_location=item.storage_location,
+                purchase_date=item.purchase_date
+            )
+            for item in items
+        ]
+        assert all(type(p.expiry_date) is date for p in batch)
+
+    def test_empty_batch(self):
+        assert self.strategy.predict_expiry_batch([]) == []
+
+
+class TestBatchEndpoint:
+    """POST /api/expiry-prediction/batch"""
+
+    def test_returns_predictions_in_order(self, client):
+        response = client.post("/api/expiry-prediction/batch", json=[
+            {"name": "Milk", "category": "dairy", "storage_location": "fridge",
+             "purchase_date": "2024-01-01"},
+            {"name": "Steak", "category": "meat", "storage_location": "freezer",
+             "purchase_date": "2024-01-01"},
+        ])
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [p["expiry_date"] for p in body] == ["2024-01-08", "2024-03-31"]
+        assert all(p["strategy_name"] == "rule_based" for p in body)
+
+    def test_rejects_invalid_item(self, client):
+        response = client.post("/api/expiry-prediction/batch", json=[{"name": ""}])
+
+        assert response.status_code == 422
+
 
 class TestExpiryPredictionService:
     """Test the service orchestrator"""
@@ -171,5 +268,133 @@ class TestExpiryPredictionService:
         assert best.confidence > 0.0
 
 
+class _StubStrategy(ExpiryPredictionStrategy):
+    """Fixed-confidence strategy that can block or fail on demand"""
+
+    def __init__(self, name, confidence, release=None, fail=False, budget_ms=None):
+        self._name = name
+        self.confidence = confidence
+        self.release = release
+        self.fail = fail
+        self.latency_budget_ms = budget_ms
+
+    def predict(self, name, category=None, storage_location=None, purchase_date=None):
+        if self.release is not None:
+            self.release.wait(5)
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        return ExpiryPrediction(date(2024, 1, 1), self.confidence, self._name, "stub")
+
+    @property
+    def name(self):
+        return self._name
+
+
+class TestStrategyBudgets:
+    """Strategies run concurrently; late or failing ones are dropped"""
+
+    def test_slow_strategy_is_dropped(self):
+        release = threading.Event()
+        service = ExpiryPredictionService(strategy_budget_ms=1000)
+        service.strategies = [
+            RuleBasedStrategy(),
+            _StubStrategy("slow", 0.99, release=release, budget_ms=20),
+        ]
+        try:
+            predictions = service.predict_multiple_strategies("Milk", "dairy", "fridge")
+        finally:
+            release.set()
+
+        assert [p.strategy_name for p in predictions] == ["rule_based"]
+        assert service.strategy_stats()["slow"]["timeouts"] == 1
+
+    def test_failing_strategy_is_dropped(self):
+        service = ExpiryPredictionService()
+        service.strategies = [_StubStrategy("broken", 0.99, fail=True), RuleBasedStrategy()]
+
+        best = service.get_best_prediction("Milk", "dairy", "fridge")
+
+        assert best.strategy_name == "rule_based"
+        assert service.strategy_stats()["broken"]["errors"] == 1
+
+    def test_best_prediction_across_strategies(self):
+        service = ExpiryPredictionService()
+        service.strategies = [RuleBasedStrategy(), _StubStrategy("confident", 0.99)]
+
+        assert service.get_best_prediction("Milk", "dairy", "fridge").strategy_name == "confident"
+        assert service.strategy_stats()["rule_based"]["calls"] == 1
+
+    def test_falls_back_to_default_strategy(self):
+        service = ExpiryPredictionService()
+        service.strategies = [_StubStrategy("broken", 0.99, fail=True)]
+
+        best = service.get_best_prediction("Milk", "dairy", "fridge")
+
+        assert best.strategy_name == "rule_based"
+
+
+class TestPredictionCache:
+    """LRU cache in front of the default strategy"""
+
+    def test_equivalent_inputs_share_an_entry(self):
+        service = ExpiryPredictionService(cache_size=10)
+
+        first = service.predict_expiry("Milk", "Dairy", "Refrigerator", date(2024, 1, 1))
+        second = service.predict_expiry("Oat milk", "dairy ", "fridge", date(2024, 1, 1))
+
+        assert second is first
+        assert service.cache_stats()["hits"] == 1
+        assert service.cache_stats()["misses"] == 1
+
+    def test_matches_uncached_strategy(self):
+        service = ExpiryPredictionService(cache_size=10)
+        strategy = RuleBasedStrategy()
+
+        for _ in range(2):
+            cached = service.predict_expiry("Ham", "Widgets", "pantry", date(2024, 1, 1))
+            assert cached == strategy.predict("Ham", "Widgets", "pantry", date(2024, 1, 1))
+
+    def test_purchase_date_is_part_of_the_key(self):
+        service = ExpiryPredictionService(cache_size=10)
+
+        a = service.predict_expiry("Milk", "dairy", "fridge", date(2024, 1, 1))
+        b = service.predict_expiry("Milk", "dairy", "fridge", date(2024, 1, 2))
+
+        assert b.expiry_date == a.expiry_date + timedelta(days=1)
+
+    def test_evicts_least_recently_used(self):
+        service = ExpiryPredictionService(cache_size=2)
+
+        service.predict_expiry("Milk", "dairy", "fridge", date(2024, 1, 1))
+        service.predict_expiry("Beef", "meat", "fridge", date(2024, 1, 1))
+        service.predict_expiry("Milk", "dairy", "fridge", date(2024, 1, 1))
+        service.predict_expiry("Fish", "fish", "fridge", date(2024, 1, 1))
+        service.predict_expiry("Milk", "dairy", "fridge", date(2024, 1, 1))
+
+        stats = service.cache_stats()
+        assert stats["size"] == 2
+        assert stats["hits"] == 2
+
+    def test_rule_version_change_invalidates(self):
+        service = ExpiryPredictionService(cache_size=10)
+        service.predict_expiry("Milk", "dairy", "fridge", date(2024, 1, 1))
+
+        service.default_strategy.rules.version = "v2"
+        service.predict_expiry("Milk", "dairy", "fridge", date(2024, 1, 1))
+
+        stats = service.cache_stats()
+        assert stats["hits"] == 0
+        assert stats["invalidations"] == 1
+
+    def test_disabled_cache(self):
+        service = ExpiryPredictionService(cache_size=0)
+
+        service.predict_expiry("Milk", "dairy", "fridge")
+        service.predict_expiry("Milk", "dairy", "fridge")
+
+        assert service.cache_stats()["size"] == 0
+        assert service.cache_stats()["hits"] == 0
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
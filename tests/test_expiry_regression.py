@@ -0,0 +1,247 @@
+"""
+Tests for the regression expiry strategy and its offline trainer.
+"""
+import asyncio
+import os
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from app.core.database import SessionLocal
+from app.models.inventory_item import InventoryItem
+from app.services.expiry_prediction import ExpiryPredictionInput, ExpiryPredictionService
+from app.services.expiry_prediction.strategies.ml_regression import (
+    COEFFICIENTS_FILE,
+    MLRegressionStrategy,
+    RegressionModel,
+    load_regression_strategy
+)
+from app.services.expiry_prediction.rules_file import export_builtin_rules, parse_rules
+from app.services.expiry_prediction.strategies.rule_based import RuleBasedStrategy
+from app.services.expiry_prediction.training import (
+    NormalEquations,
+    accumulate_from_inventory,
+    save_model
+)
+
+CONFIRMED = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def _rows(category, storage, shelf_life, count):
+    return [
+        (category, storage, CONFIRMED, CONFIRMED.date() + timedelta(days=shelf_life))
+    ] * count
+
+
+@pytest.fixture
+def rule_based():
+    return RuleBasedStrategy()
+
+
+@pytest.fixture
+def model_path(tmp_path, rule_based):
+    """Model trained on dairy lasting 10 days in the fridge (rules say 7)"""
+    equations = NormalEquations(rule_based.rules)
+    equations.add_rows(_rows("dairy", "fridge", 10, 200))
+    equations.add_rows(_rows("meat", "fridge", 3, 200))
+    path = tmp_path / "model"
+    save_model(equations, ridge=0.1, output=path)
+    return path
+
+
+class TestNormalEquations:
+
+    def test_matches_dense_least_squares(self, rule_based):
+        rng = np.random.default_rng(0)
+        equations = NormalEquations(rule_based.rules)
+        n_categories = len(rule_based.rules.categories.names)
+        n_storages = len(rule_based.rules.storages.names)
+
+        category_ids = rng.integers(0, n_categories, 500)
+        storage_ids = rng.integers(0, n_storages, 500)
+        residuals = rng.normal(size=500)
+        for chunk in np.array_split(np.arange(500), 7):
+            equations.add(category_ids[chunk], storage_ids[chunk], residuals[chunk])
+
+        X = np.zeros((500, equations.n_features))
+        X[:, 0] = 1
+        X[np.arange(500), 1 + category_ids] = 1
+        X[np.arange(500), 1 + n_categories + storage_ids] = 1
+        np.testing.assert_allclose(equations.xtx, X.T @ X)
+        np.testing.assert_allclose(equations.xty, X.T @ residuals)
+
+    def test_skips_implausible_shelf_lives(self, rule_based):
+        equations = NormalEquations(rule_based.rules)
+        equations.add_rows(_rows("dairy", "fridge", -3, 5) + _rows("dairy", "fridge", 5000, 5))
+
+        assert equations.samples == 0
+
+
+class TestMLRegressionStrategy:
+
+    def test_learns_correction_from_confirmed_dates(self, model_path, rule_based):
+        strategy = MLRegressionStrategy(RegressionModel(model_path), rule_based)
+
+        dairy = strategy.predict("Milk", "dairy", "fridge", date(2024, 1, 1))
+        meat = strategy.predict("Beef", "meat", "fridge", date(2024, 1, 1))
+
+        assert dairy.expiry_date == date(2024, 1, 11)
+        assert meat.expiry_date == date(2024, 1, 4)
+        assert dairy.confidence > RuleBasedStrategy.SHELF_LIFE_RULES[("dairy", "fridge")][1]
+        assert "3 days longer" in dairy.reasoning
+        assert dairy.strategy_name == "ml_regression"
+
+    def test_coefficients_are_memory_mapped(self, model_path, rule_based):
+        model = RegressionModel(model_path)
+
+        assert isinstance(model.coefficients, np.memmap)
+
+    def test_batch_matches_single_predictions(self, model_path, rule_based):
+        strategy = MLRegressionStrategy(RegressionModel(model_path), rule_based)
+        items = [
+            ExpiryPredictionInput("Milk", "dairy", "fridge", date(2024, 1, 1)),
+            ExpiryPredictionInput("Bread", "bread", "pantry", None),
+            ExpiryPredictionInput("Thing", None, None, date(2024, 3, 1)),
+        ]
+
+        assert strategy.predict_expiry_batch(items) == [
+            strategy.predict(item.name, item.category, item.storage_location, item.purchase_date)
+            for item in items
+        ]
+
+    def test_rebuilds_table_when_rules_change(self, model_path, rule_based):
+        strategy = MLRegressionStrategy(RegressionModel(model_path), rule_based)
+        strategy.predict("Milk", "dairy", "fridge", date(2024, 1, 1))
+
+        rule_based.rules = RuleBasedStrategy().rules
+
+        assert strategy.predict("Milk", "dairy", "fridge", date(2024, 1, 1)).expiry_date == date(2024, 1, 11)
+
+
+class TestRegistration:
+
+    def test_not_registered_without_model(self, tmp_path):
+        service = ExpiryPredictionService(model_path=tmp_path / "missing.npy")
+
+        assert [s.name for s in service.strategies] == ["rule_based"]
+        assert load_regression_strategy(tmp_path / "missing.npy", RuleBasedStrategy()) is None
+
+    def test_unreadable_model_falls_back_to_rules(self, model_path, caplog):
+        (model_path / COEFFICIENTS_FILE).write_bytes(b"\x93NUMPY truncated")
+
+        service = ExpiryPredictionService(model_path=model_path)
+
+        assert [s.name for s in service.strategies] == ["rule_based"]
+        assert "Ignoring regression model" in caplog.text
+
+    def test_republishing_swaps_the_whole_version(self, model_path, rule_based):
+        first = model_path.resolve()
+        equations = NormalEquations(rule_based.rules)
+        equations.add_rows(_rows("dairy", "fridge", 12, 200))
+        save_model(equations, ridge=0.1, output=model_path)
+        save_model(equations, ridge=0.1, output=model_path)
+
+        versions = sorted(p.name for p in model_path.parent.glob("model.*"))
+        assert first.name not in versions and len(versions) == 2
+        strategy = MLRegressionStrategy(RegressionModel(model_path), rule_based)
+        assert strategy.predict("Milk", "dairy", "fridge", date(2024, 1, 1)).expiry_date == date(2024, 1, 13)
+
+    def test_refuses_to_replace_a_real_directory(self, tmp_path, rule_based):
+        output = tmp_path / "model"
+        output.mkdir()
+        equations = NormalEquations(rule_based.rules)
+        equations.add_rows(_rows("dairy", "fridge", 12, 10))
+
+        with pytest.raises(FileExistsError, match="not a model symlink"):
+            save_model(equations, ridge=0.1, output=output)
+
+        assert [p.name for p in tmp_path.iterdir()] == ["model"]
+
+    def test_failed_swap_keeps_the_published_version(self, model_path, rule_based, monkeypatch):
+        published = model_path.resolve()
+        equations = NormalEquations(rule_based.rules)
+        equations.add_rows(_rows("dairy", "fridge", 12, 10))
+
+        def fail(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(os, "replace", fail)
+        with pytest.raises(OSError, match="disk full"):
+            save_model(equations, ridge=0.1, output=model_path)
+
+        assert model_path.resolve() == published
+        assert sorted(p.name for p in model_path.parent.iterdir()) == sorted(["model", published.name])
+
+    def test_registered_as_default_when_trained(self, model_path):
+        service = ExpiryPredictionService(model_path=model_path)
+
+        assert [s.name for s in service.strategies] == ["rule_based", "ml_regression"]
+        assert service.predict_expiry("Milk", "dairy", "fridge").strategy_name == "ml_regression"
+
+
+class TestRulesVersion:
+
+    @pytest.fixture
+    def file_rules(self):
+        data = export_builtin_rules()
+        data["rules"]["dairy"]["fridge"]["days"] = 9
+        return parse_rules(data)
+
+    def test_model_records_the_rules_it_was_trained_on(self, model_path, file_rules):
+        model = RegressionModel(model_path)
+
+        assert model.rules_version == "builtin"
+        assert not MLRegressionStrategy(model, RuleBasedStrategy(file_rules)).trained_on(file_rules)
+
+    def test_withdrawn_while_other_rules_are_loaded(self, model_path, file_rules, caplog):
+        service = ExpiryPredictionService(model_path=model_path)
+
+        service.swap_rules(file_rules)
+
+        assert [s.name for s in service.strategies] == ["rule_based"]
+        prediction = service.predict_expiry("Milk", "dairy", "fridge", date(2024, 1, 1))
+        assert prediction.strategy_name == "rule_based"
+        assert prediction.expiry_date == date(2024, 1, 10)
+        assert "predicting from the rules until it is retrained" in caplog.text
+
+        service.swap_rules(RuleBasedStrategy.builtin_rules())
+
+        assert service.predict_expiry("Milk", "dairy", "fridge").strategy_name == "ml_regression"
+
+    def test_model_trained_on_file_rules_waits_for_them(self, tmp_path, file_rules):
+        equations = NormalEquations(file_rules)
+        equations.add_rows(_rows("dairy", "fridge", 10, 200))
+        save_model(equations, ridge=0.1, output=tmp_path / "model")
+
+        service = ExpiryPredictionService(model_path=tmp_path / "model")
+        assert service.default_strategy.name == "rule_based"
+
+        service.swap_rules(file_rules)
+        prediction = service.predict_expiry("Milk", "dairy", "fridge", date(2024, 1, 1))
+        assert prediction.strategy_name == "ml_regression"
+        assert prediction.expiry_date == date(2024, 1, 11)
+
+
+class TestTrainingFromInventory:
+
+    def test_streams_confirmed_items(self, user_id, rule_based):
+        db = SessionLocal()
+        try:
+            db.add_all([
+                InventoryItem(
+                    id=uuid.uuid4(), user_id=user_id, name="Milk", category="dairy",
+                    quantity=1, unit="l", storage_location="fridge",
+                    expiry_date=CONFIRMED.date() + timedelta(days=9), created_at=CONFIRMED
+                )
+                for _ in range(3)
+            ])
+            db.commit()
+        finally:
+            db.close()
+
+        equations = asyncio.run(accumulate_from_inventory(rule_based.rules))
+
+        assert equations.samples == 3
+        assert equations.xty[0] == pytest.approx(3 * (9 - 7))
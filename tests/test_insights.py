@@ -0,0 +1,98 @@
+"""
+Tests for the inventory event log and category insights.
+"""
+import numpy as np
+
+from app.core.database import SessionLocal
+from app.models.inventory_event import InventoryEvent
+from app.services.insights import compute_category_insights, events_to_arrays
+from tests.test_inventory_items import _seed_inventory
+
+
+def _events(user_id):
+    db = SessionLocal()
+    try:
+        return db.query(InventoryEvent).filter_by(user_id=user_id).all()
+    finally:
+        db.close()
+
+
+class TestEventLog:
+
+    def test_delete_records_removal_with_reason(self, client, auth_headers, user_id):
+        [item_id] = _seed_inventory(user_id, 1, quantity=2)
+
+        response = client.delete(
+            f"/api/inventory/{item_id}", params={"reason": "wasted"}, headers=auth_headers
+        )
+
+        assert response.status_code == 204
+        [event] = _events(user_id)
+        assert event.item_id == item_id
+        assert event.reason == "wasted"
+        assert (event.quantity_before, event.quantity_after) == (2, 0)
+
+    def test_quantity_update_records_previous_quantity(self, client, auth_headers, user_id):
+        [item_id] = _seed_inventory(user_id, 1, quantity=3)
+
+        response = client.patch(
+            f"/api/inventory/{item_id}/quantity",
+            params={"reason": "consumed"},
+            json={"quantity": 1},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert float(response.json()["quantity"]) == 1
+        [event] = _events(user_id)
+        assert event.reason == "consumed"
+        assert (event.quantity_before, event.quantity_after) == (3, 1)
+
+    def test_unknown_reason_is_rejected(self, client, auth_headers, user_id):
+        [item_id] = _seed_inventory(user_id, 1)
+
+        response = client.delete(
+            f"/api/inventory/{item_id}", params={"reason": "adjusted"}, headers=auth_headers
+        )
+
+        assert response.status_code == 422
+        assert _events(user_id) == []
+
+
+class TestCategoryInsights:
+
+    def test_waste_rate_and_days_to_consume(self):
+        rows = [
+            # category, reason, quantity_before, quantity_after, age_days
+            ("dairy", "consumed", 1.0, 0.0, 2.0),
+            ("dairy", "consumed", 1.0, 0.0, 4.0),
+            ("dairy", "wasted", 1.0, 0.0, 9.0),
+            ("produce", "wasted", 2.0, 1.0, 5.0),
+            ("produce", "adjusted", 1.0, 2.0, 1.0),
+        ]
+
+        produce, dairy = compute_category_insights(events_to_arrays(rows))
+
+        assert (produce.category, produce.wasted, produce.consumed) == ("produce", 1, 0)
+        assert produce.waste_rate == 1.0
+        assert produce.avg_days_to_consume is None
+        assert dairy.waste_rate == 1 / 3
+        assert np.isclose(dairy.avg_days_to_consume, 3.0)
+
+    def test_no_events(self):
+        assert compute_category_insights(events_to_arrays([])) == []
+
+    def test_endpoint_ranks_most_wasted_first(self, client, auth_headers, user_id):
+        dairy = _seed_inventory(user_id, 2)
+        [bread] = _seed_inventory(user_id, 1, category="bakery")
+        client.delete(f"/api/inventory/{dairy[0]}", headers=auth_headers)
+        client.delete(f"/api/inventory/{dairy[1]}", params={"reason": "wasted"}, headers=auth_headers)
+        client.delete(f"/api/inventory/{bread}", params={"reason": "wasted"}, headers=auth_headers)
+
+        response = client.get("/api/insights/categories", headers=auth_headers)
+
+        assert response.status_code == 200
+        categories = response.json()["categories"]
+        assert [c["category"] for c in categories] == ["bakery", "dairy"]
+        assert categories[1]["waste_rate"] == 0.5
+        assert categories[1]["avg_days_to_consume"] is not None
@@ -0,0 +1,182 @@
+"""
+API tests for trusted inventory items.
+"""
+import csv
+import io
+import json
+import uuid
+from datetime import date, timedelta
+
+from app.core.database import SessionLocal
+from app.models.inventory_item import InventoryItem
+
+
+def _seed_inventory(user_id, count, **overrides):
+    """Insert inventory items expiring on consecutive days, return their ids"""
+    db = SessionLocal()
+    try:
+        items = []
+        for i in range(count):
+            fields = {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "name": f"Item {i}",
+                "category": "dairy",
+                "quantity": 1,
+                "unit": "L",
+                "storage_location": "fridge",
+                "expiry_date": date.today() + timedelta(days=i),
+            }
+            fields.update(overrides)
+            items.append(InventoryItem(**fields))
+        db.add_all(items)
+        db.commit()
+        return [item.id for item in items]
+    finally:
+        db.close()
+
+
+class TestListInventory:
+    """Listing and keyset pagination"""
+
+    def test_unpaginated_list_is_ordered_by_expiry(self, client, auth_headers, user_id):
+        ids = _seed_inventory(user_id, 3)
+
+        response = client.get("/api/inventory", headers=auth_headers)
+
+        assert [item["id"] for item in response.json()] == [str(i) for i in ids]
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_cursor_walks_every_item_once(self, client, auth_headers, user_id):
+        # Same expiry date everywhere: the id tiebreaker must keep pages disjoint
+        ids = _seed_inventory(user_id, 5, expiry_date=date.today())
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/api/inventory", params=params, headers=auth_headers)
+            page = response.json()
+            assert len(page) <= 2
+            seen.extend(item["id"] for item in page)
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert sorted(seen) == sorted(str(i) for i in ids)
+        assert len(seen) == len(set(seen))
+
+    def test_invalid_cursor_returns_400(self, client, auth_headers):
+        response = client.get(
+            "/api/inventory", params={"cursor": "not-a-cursor"}, headers=auth_headers
+        )
+        assert response.status_code == 400
+
+
+class TestInventoryETag:
+    """Conditional GET on the inventory list"""
+
+    def test_matching_etag_returns_304(self, client, auth_headers, user_id):
+        _seed_inventory(user_id, 2)
+        first = client.get("/api/inventory", headers=auth_headers)
+
+        second = client.get(
+            "/api/inventory", headers={**auth_headers, "If-None-Match": first.headers["ETag"]}
+        )
+
+        assert second.status_code == 304
+        assert second.content == b""
+
+    def test_write_changes_etag(self, client, auth_headers, user_id):
+        item_id = _seed_inventory(user_id, 1)[0]
+        etag = client.get("/api/inventory", headers=auth_headers).headers["ETag"]
+
+        client.patch(f"/api/inventory/{item_id}/quantity", json={"quantity": 2}, headers=auth_headers)
+        response = client.get("/api/inventory", headers={**auth_headers, "If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json()[0]["quantity"] == 2
+
+
+class TestInventoryMutations:
+    """Quantity updates and deletion"""
+
+    def test_update_quantity(self, client, auth_headers, user_id):
+        item_id = _seed_inventory(user_id, 1)[0]
+
+        response = client.patch(
+            f"/api/inventory/{item_id}/quantity", json={"quantity": 0.5}, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["quantity"] == 0.5
+
+    def test_delete_item(self, client, auth_headers, user_id):
+        item_id = _seed_inventory(user_id, 1)[0]
+
+        assert client.delete(f"/api/inventory/{item_id}", headers=auth_headers).status_code == 204
+        assert client.get(f"/api/inventory/{item_id}", headers=auth_headers).status_code == 404
+
+    def test_cannot_touch_other_users_item(self, client, user_id):
+        item_id = _seed_inventory(user_id, 1)[0]
+        other = {"X-User-Id": "00000000-0000-0000-0000-000000000001"}
+
+        assert client.delete(f"/api/inventory/{item_id}", headers=other).status_code == 404
+
+
+class TestInventoryExport:
+    """Streaming NDJSON/CSV export"""
+
+    def test_ndjson_export(self, client, auth_headers, user_id):
+        ids = _seed_inventory(user_id, 3)
+
+        response = client.get("/api/inventory/export", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["id"] for line in lines] == [str(i) for i in ids]
+        assert lines[0]["quantity"] == 1.0
+
+    def test_csv_export(self, client, auth_headers, user_id):
+        _seed_inventory(user_id, 2)
+
+        response = client.get(
+            "/api/inventory/export", params={"format": "csv"}, headers=auth_headers
+        )
+
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 2
+        assert rows[0]["name"] == "Item 0"
+        assert rows[1]["expiry_date"] == (date.today() + timedelta(days=1)).isoformat()
+
+    def test_unknown_format_is_rejected(self, client, auth_headers):
+        response = client.get(
+            "/api/inventory/export", params={"format": "xml"}, headers=auth_headers
+        )
+        assert response.status_code == 422
+
+
+class TestExpiringItems:
+    """Urgent items grouped into day buckets"""
+
+    def test_items_are_bucketed_by_days_left(self, client, auth_headers, user_id):
+        for offset in (-2, 0, 1, 3, 7, 10, 30):
+            _seed_inventory(user_id, 1, expiry_date=date.today() + timedelta(days=offset))
+
+        response = client.get(
+            "/api/inventory/expiring", params={"within_days": 14}, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        counts = {bucket: len(items) for bucket, items in response.json().items()}
+        assert counts == {"expired": 1, "today": 1, "tomorrow": 1, "this_week": 2, "later": 1}
+
+    def test_default_window_is_one_week(self, client, auth_headers, user_id):
+        _seed_inventory(user_id, 1, expiry_date=date.today() + timedelta(days=8))
+
+        body = client.get("/api/inventory/expiring", headers=auth_headers).json()
+
+        assert all(items == [] for items in body.values())
@@ -0,0 +1,113 @@
+"""
+Tests for the incrementally maintained inventory summary.
+"""
+import asyncio
+import uuid
+from datetime import date, timedelta
+
+from app.core.database import SessionLocal
+from app.models.inventory_item import InventoryItem
+from app.services.inventory_summary.reconcile import reconcile_all
+
+
+def _confirm(client, headers, **overrides):
+    draft = client.post("/api/draft-items", json={"name": "Milk"}, headers=headers).json()
+    confirmation = {
+        "name": "Milk",
+        "category": "dairy",
+        "quantity": 1,
+        "unit": "L",
+        "storage_location": "fridge",
+        "expiry_date": (date.today() + timedelta(days=7)).isoformat(),
+    }
+    confirmation.update(overrides)
+    response = client.post(
+        f"/api/draft-items/{draft['id']}/confirm", json=confirmation, headers=headers
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+class TestInventorySummary:
+
+    def test_empty_inventory(self, client, auth_headers):
+        response = client.get("/api/inventory/summary", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "total_items": 0,
+            "by_category": {},
+            "by_storage_location": {},
+            "earliest_expiry": None,
+        }
+
+    def test_confirm_and_delete_update_counts(self, client, auth_headers):
+        soon = (date.today() + timedelta(days=2)).isoformat()
+        milk = _confirm(client, auth_headers, expiry_date=soon)
+        _confirm(client, auth_headers, name="Cheese")
+        _confirm(client, auth_headers, name="Rice", category="grains", storage_location="pantry")
+
+        client.delete(f"/api/inventory/{milk['id']}", headers=auth_headers)
+        summary = client.get("/api/inventory/summary", headers=auth_headers).json()
+
+        assert summary["total_items"] == 2
+        assert summary["by_category"] == {"dairy": 1, "grains": 1}
+        assert summary["by_storage_location"] == {"fridge": 1, "pantry": 1}
+        assert summary["earliest_expiry"] == (date.today() + timedelta(days=7)).isoformat()
+
+    def test_batch_confirm_updates_counts(self, client, auth_headers):
+        drafts = client.post(
+            "/api/draft-items/batch",
+            json=[{"name": "Apple"}, {"name": "Pear"}],
+            headers=auth_headers
+        ).json()
+        confirmation = {
+            "name": "Fruit",
+            "category": "produce",
+            "quantity": 1,
+            "unit": "pcs",
+            "storage_location": "fridge",
+            "expiry_date": date.today().isoformat(),
+        }
+
+        client.post(
+            "/api/draft-items/confirm-batch",
+            json=[{"draft_id": d["id"], "confirmation": confirmation} for d in drafts],
+            headers=auth_headers
+        )
+        summary = client.get("/api/inventory/summary", headers=auth_headers).json()
+
+        assert summary["by_category"] == {"produce": 2}
+        assert summary["total_items"] == 2
+
+
+class TestReconcile:
+
+    def test_consistent_summary_has_no_mismatches(self, client, auth_headers, user_id):
+        _confirm(client, auth_headers)
+
+        [report] = asyncio.run(reconcile_all(user_id))
+
+        assert report.mismatches == {}
+
+    def test_drift_is_reported_and_fixed(self, client, auth_headers, user_id):
+        _confirm(client, auth_headers)
+        # Written behind the API's back, so the summary does not know about it
+        db = SessionLocal()
+        db.add(InventoryItem(
+            id=uuid.uuid4(), user_id=user_id, name="Beans", category="canned",
+            quantity=1, unit="pcs", storage_location="pantry", expiry_date=date.today()
+        ))
+        db.commit()
+        db.close()
+
+        [report] = asyncio.run(reconcile_all(user_id, fix=True))
+
+        assert report.mismatches == {
+            ("category", "canned"): (0, 1),
+            ("storage_location", "pantry"): (0, 1),
+        }
+        assert report.fixed
+        summary = client.get("/api/inventory/summary", headers=auth_headers).json()
+        assert summary["total_items"] == 2
+        assert asyncio.run(reconcile_all(user_id))[0].mismatches == {}
@@ -0,0 +1,230 @@
+"""
+Tests for per-user shelf-life adjustments learned at confirm time.
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.core.database import SessionLocal, session_scope
+from app.core.versioning import SHELF_LIFE, bump_versions
+from app.models.shelf_life_adjustment import UserShelfLifeAdjustment
+from app.models.user import User
+from app.services.expiry_prediction import ExpiryPredictionInput, ExpiryPredictionService
+from app.services.expiry_prediction.personalization import (
+    ShelfLifeObservation,
+    UserAdjustments,
+    UserAdjustmentStore
+)
+from app.services.expiry_prediction.strategies.rule_based import RuleBasedStrategy
+from app.services.expiry_prediction.training import NormalEquations, save_model
+
+
+def _create_draft(client, headers, **overrides):
+    payload = {"name": "Milk", "category": "dairy", "location": "Refrigerator"}
+    payload.update(overrides)
+    response = client.post("/api/draft-items", json=payload, headers=headers)
+    assert response.status_code == 201
+    return response.json()
+
+
+def _confirmation(expiry_date, **overrides):
+    payload = {
+        "name": "Milk", "category": "dairy", "quantity": 1, "unit": "L",
+        "storage_location": "fridge", "expiry_date": expiry_date.isoformat(),
+    }
+    payload.update(overrides)
+    return payload
+
+
+def _confirm_after(client, headers, days):
+    """Create a draft and confirm it as expiring `days` after it was drafted"""
+    draft = _create_draft(client, headers)
+    drafted = date.fromisoformat(draft["created_at"][:10])
+    response = client.post(
+        f"/api/draft-items/{draft['id']}/confirm",
+        json=_confirmation(drafted + timedelta(days=days)),
+        headers=headers
+    )
+    assert response.status_code == 201
+
+
+def _adjustment_rows(user_id):
+    db = SessionLocal()
+    try:
+        return {
+            (row.category, row.storage_location): (row.mean_offset_days, row.samples)
+            for row in db.query(UserShelfLifeAdjustment).filter_by(user_id=user_id)
+        }
+    finally:
+        db.close()
+
+
+def _shelf_life_version(user_id):
+    db = SessionLocal()
+    try:
+        return db.get(User, user_id).shelf_life_version
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def other_headers(db_tables):
+    db = SessionLocal()
+    try:
+        other = User(id=uuid.uuid4(), email=f"{uuid.uuid4()}@example.com")
+        db.add(other)
+        db.commit()
+        return {"X-User-Id": str(other.id)}
+    finally:
+        db.close()
+
+
+class TestConfirmUpdatesAdjustments:
+
+    def test_later_confirmations_shift_next_prediction(self, client, auth_headers, other_headers):
+        baseline = date.fromisoformat(_create_draft(client, auth_headers)["expiration_date"])
+        for _ in range(3):
+            _confirm_after(client, auth_headers, days=13)  # rules say 7
+
+        draft = _create_draft(client, auth_headers)
+
+        # Mean offset +6 over 3 samples, shrunk by the 2-sample prior
+        assert date.fromisoformat(draft["expiration_date"]) == baseline + timedelta(days=4)
+        assert "shifted +4 days" in draft["notes"]
+        assert _create_draft(client, other_headers)["expiration_date"] == baseline.isoformat()
+
+    def test_batch_confirm_folds_into_running_mean(self, client, auth_headers, user_id):
+        _confirm_after(client, auth_headers, days=13)
+        drafts = [_create_draft(client, auth_headers) for _ in range(2)]
+        drafted = date.fromisoformat(drafts[0]["created_at"][:10])
+
+        response = client.post("/api/draft-items/confirm-batch", json=[
+            {"draft_id": drafts[0]["id"], "confirmation": _confirmation(drafted + timedelta(days=8))},
+            {"draft_id": drafts[1]["id"], "confirmation": _confirmation(drafted + timedelta(days=12))},
+        ], headers=auth_headers)
+
+        assert response.status_code == 200
+        assert _adjustment_rows(user_id) == {("dairy", "fridge"): (pytest.approx(4.0), 3)}
+
+    def test_keeping_the_shown_date_records_nothing(self, client, auth_headers, user_id):
+        _confirm_after(client, auth_headers, days=13)
+        draft = _create_draft(client, auth_headers)
+        version = _shelf_life_version(user_id)
+
+        response = client.post(
+            f"/api/draft-items/{draft['id']}/confirm",
+            json=_confirmation(date.fromisoformat(draft["expiration_date"])),
+            headers=auth_headers
+        )
+
+        assert response.status_code == 201
+        assert _adjustment_rows(user_id) == {("dairy", "fridge"): (pytest.approx(6.0), 1)}
+        assert _shelf_life_version(user_id) == version
+
+    def test_implausible_dates_are_ignored(self, client, auth_headers, user_id):
+        _confirm_after(client, auth_headers, days=-2)
+        _confirm_after(client, auth_headers, days=5000)
+
+        assert _adjustment_rows(user_id) == {}
+
+
+class TestUserAdjustmentStore:
+
+    def test_cached_entry_revalidated_through_version(self, user_id):
+        now = [0.0]
+        store = UserAdjustmentStore(maxsize=10, refresh_seconds=30, clock=lambda: now[0])
+        other_worker = UserAdjustmentStore(maxsize=10, refresh_seconds=30, clock=lambda: now[0])
+
+        async def load(worker):
+            async with session_scope() as db:
+                return await worker.load(db, user_id)
+
+        async def confirm():
+            async with session_scope() as db:
+                await bump_versions(db, user_id, SHELF_LIFE)
+                await store.record(db, user_id, [ShelfLifeObservation("dairy", "fridge", 8)])
+                await db.commit()
+            store.invalidate(user_id)
+
+        assert not asyncio.run(load(other_worker))
+        asyncio.run(confirm())
+
+        assert asyncio.run(load(store)).offset_days("dairy", "fridge") == 3
+        # The other worker trusts its copy until the refresh window ends
+        assert not asyncio.run(load(other_worker))
+        now[0] = 31
+        assert asyncio.run(load(other_worker)).offset_days("dairy", "fridge") == 3
+        now[0] = 62
+        asyncio.run(load(other_worker))
+        assert other_worker.snapshot() == {
+            "users": 1, "maxsize": 10, "hits": 1, "revalidations": 1, "loads": 2
+        }
+
+
+class TestServiceAdjustments:
+
+    def test_applied_after_cache_to_single_and_batch(self, tmp_path):
+        service = ExpiryPredictionService(model_path=tmp_path / "missing.npy")
+        adjustments = UserAdjustments(1, {("dairy", "fridge"): (-3.0, 8)})
+        shared = service.predict_expiry("Milk", "dairy", "fridge", date(2024, 1, 1))
+
+        personal = service.predict_expiry("Milk", "Dairy", "Refrigerator", date(2024, 1, 1), adjustments)
+
+        assert personal.expiry_date == shared.expiry_date - timedelta(days=2)
+        assert service.predict_expiry("Milk", "dairy", "fridge", date(2024, 1, 1)) == shared
+        assert service.predict_expiry_batch(
+            [ExpiryPredictionInput("Milk", "dairy", "fridge", date(2024, 1, 1))], adjustments
+        ) == [personal]
+
+    def test_applied_to_strategy_comparison(self, tmp_path):
+        service = ExpiryPredictionService(model_path=tmp_path / "missing.npy")
+        adjustments = UserAdjustments(1, {("dairy", "fridge"): (-3.0, 8)})
+        personal = service.predict_expiry("Milk", "dairy", "fridge", date(2024, 1, 1), adjustments)
+
+        assert service.predict_multiple_strategies(
+            "Milk", "dairy", "fridge", date(2024, 1, 1), adjustments
+        ) == [personal]
+        assert service.get_best_prediction("Milk", "dairy", "fridge", date(2024, 1, 1), adjustments) == personal
+
+
+    def test_offsets_are_relative_to_the_rules(self, tmp_path):
+        # Regression model: dairy keeps 10 days in the fridge (rules say 7)
+        equations = NormalEquations(RuleBasedStrategy().rules)
+        equations.add_rows([
+            ("dairy", "fridge", datetime(2024, 1, 1, tzinfo=timezone.utc), date(2024, 1, 11))
+        ] * 200)
+        save_model(equations, ridge=0.1, output=tmp_path / "model")
+        rules_only = ExpiryPredictionService(model_path=tmp_path / "missing.npy")
+        regression = ExpiryPredictionService(model_path=tmp_path / "model")
+        purchase = date(2024, 1, 1)
+
+        # Observed against the rules' date whichever strategy is the default
+        for service in (rules_only, regression):
+            assert service.observe_confirmation(
+                "Milk", "dairy", "fridge", purchase, date(2024, 1, 11)
+            ) == ShelfLifeObservation("dairy", "fridge", 3)
+
+        # A user 3 days past the rules gets nothing extra from the model's
+        # own 3-day correction, and is pulled toward it with few samples
+        adjustments = UserAdjustments(1, {("dairy", "fridge"): (3.0, 8)})
+        assert regression.predict_expiry(
+            "Milk", "dairy", "fridge", purchase, adjustments
+        ).expiry_date == date(2024, 1, 11)
+        assert rules_only.predict_expiry(
+            "Milk", "dairy", "fridge", purchase, adjustments
+        ).expiry_date == date(2024, 1, 10)
+
+
+def test_prediction_service_imports_without_a_database():
+    env = {k: v for k, v in os.environ.items() if k != "DATABASE_URL"}
+    result = subprocess.run(
+        [sys.executable, "-c", "import app.services.expiry_prediction"],
+        env=env, capture_output=True, text=True
+    )
+
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,121 @@
+"""
+Round-trip regression tests for ownership-checked mutations.
+
+Each mutation must be a single UPDATE/DELETE ... RETURNING statement,
+with ownership enforced in the WHERE clause, followed only by the
+collection version bump (used for ETags), derived writes (inventory
+summary, event log) and the commit.
+"""
+import uuid
+from datetime import date
+
+from app.core.database import SessionLocal
+from app.models.draft_item import DraftItem
+from app.models.inventory_item import InventoryItem
+
+
+def _seed(user_id):
+    """Insert one inventory item and one draft, return their ids"""
+    db = SessionLocal()
+    try:
+        item = InventoryItem(
+            id=uuid.uuid4(), user_id=user_id, name="Milk", category="dairy",
+            quantity=1, unit="L", storage_location="fridge", expiry_date=date.today()
+        )
+        draft = DraftItem(id=uuid.uuid4(), user_id=user_id, name="Bread")
+        db.add_all([item, draft])
+        db.commit()
+        return item.id, draft.id
+    finally:
+        db.close()
+
+
+def _only_statement(statements):
+    assert len(statements) == 1, statements
+    return statements[0].lstrip().upper()
+
+
+def _mutation_statement(statements, *followups):
+    """
+    The mutation itself; the only other statements are the version bump
+    and the given follow-up writes (e.g. summary upsert, event log insert).
+    """
+    assert len(statements) == 2 + len(followups), statements
+    assert statements[1].lstrip().upper().startswith("UPDATE USERS")
+    for statement, prefix in zip(statements[2:], followups):
+        assert statement.lstrip().upper().startswith(prefix)
+    return statements[0].lstrip().upper()
+
+
+class TestSingleStatementMutations:
+
+    def test_update_inventory_quantity(self, client, auth_headers, user_id, statements):
+        item_id, _ = _seed(user_id)
+        statements.clear()
+
+        response = client.patch(
+            f"/api/inventory/{item_id}/quantity", json={"quantity": 3}, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        # The update returns the previous quantity (read in a CTE) for the event log
+        mutation = _mutation_statement(statements, "INSERT INTO INVENTORY_EVENTS")
+        assert mutation.startswith("WITH")
+        assert "UPDATE INVENTORY_ITEMS" in mutation
+
+    def test_delete_inventory_item(self, client, auth_headers, user_id, statements):
+        item_id, _ = _seed(user_id)
+        statements.clear()
+
+        response = client.delete(f"/api/inventory/{item_id}", headers=auth_headers)
+
+        assert response.status_code == 204
+        assert _mutation_statement(
+            statements, "INSERT INTO USER_INVENTORY_SUMMARY", "INSERT INTO INVENTORY_EVENTS"
+        ).startswith("DELETE FROM INVENTORY_ITEMS")
+
+    def test_update_draft_item(self, client, auth_headers, user_id, statements):
+        _, draft_id = _seed(user_id)
+        statements.clear()
+
+        response = client.patch(
+            f"/api/draft-items/{draft_id}", json={"name": "Rye bread"}, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["name"] == "Rye bread"
+        assert _mutation_statement(statements).startswith("UPDATE DRAFT_ITEMS")
+
+    def test_delete_draft_item(self, client, auth_headers, user_id, statements):
+        _, draft_id = _seed(user_id)
+        statements.clear()
+
+        response = client.delete(f"/api/draft-items/{draft_id}", headers=auth_headers)
+
+        assert response.status_code == 204
+        assert _mutation_statement(statements).startswith("DELETE FROM DRAFT_ITEMS")
+
+    def test_missing_row_is_404_after_one_statement(self, client, auth_headers, user_id, statements):
+        missing = "00000000-0000-0000-0000-000000000000"
+
+        response = client.patch(
+            f"/api/inventory/{missing}/quantity", json={"quantity": 3}, headers=auth_headers
+        )
+
+        assert response.status_code == 404
+        assert "UPDATE INVENTORY_ITEMS" in _only_statement(statements)
+
+
+class TestConditionalGet:
+
+    def test_not_modified_list_is_one_lookup(self, client, auth_headers, user_id, statements):
+        _seed(user_id)
+        etag = client.get("/api/inventory", headers=auth_headers).headers["ETag"]
+        statements.clear()
+
+        response = client.get(
+            "/api/inventory", headers={**auth_headers, "If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert _only_statement(statements).startswith("SELECT USERS.INVENTORY_VERSION")
@@ -0,0 +1,72 @@
+"""
+Read-replica routing for list/get endpoints.
+
+A second SQLite file stands in for the replica. Nothing replicates into
+it, so which database answered a read is visible from the data returned.
+"""
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.database import Base, read_routing
+from app.models.draft_item import DraftItem
+from app.models.user import User
+
+
+@pytest.fixture
+def replica(tmp_path, db_tables):
+    """Route reads to a replica file; yields a sync engine for seeding it"""
+    url = f"sqlite:///{tmp_path}/replica.db"
+    seed_engine = create_engine(url)
+    Base.metadata.create_all(bind=seed_engine)
+    read_routing.configure(url)
+    yield seed_engine
+    read_routing.configure(None)
+    seed_engine.dispose()
+
+
+def _seed_replica_draft(replica_engine, user_id, name):
+    with Session(replica_engine) as db:
+        db.add(User(id=user_id, email=f"{user_id}@example.com"))
+        db.add(DraftItem(id=uuid.uuid4(), user_id=user_id, name=name))
+        db.commit()
+
+
+class TestReadReplica:
+
+    def test_reads_are_served_by_replica(self, client, auth_headers, user_id, replica):
+        _seed_replica_draft(replica, user_id, "Replica only")
+
+        drafts = client.get("/api/draft-items", headers=auth_headers).json()
+
+        assert [d["name"] for d in drafts] == ["Replica only"]
+
+    def test_reads_pin_to_primary_after_own_write(self, client, auth_headers, user_id, replica):
+        _seed_replica_draft(replica, user_id, "Replica only")
+
+        created = client.post(
+            "/api/draft-items", json={"name": "Fresh"}, headers=auth_headers
+        ).json()
+        drafts = client.get("/api/draft-items", headers=auth_headers).json()
+
+        assert [d["id"] for d in drafts] == [created["id"]]
+
+    def test_write_window_is_per_user(self, client, auth_headers, replica):
+        other_user = uuid.uuid4()
+        _seed_replica_draft(replica, other_user, "Other user")
+
+        client.post("/api/draft-items", json={"name": "Fresh"}, headers=auth_headers)
+        drafts = client.get("/api/draft-items", headers={"X-User-Id": str(other_user)}).json()
+
+        assert [d["name"] for d in drafts] == ["Other user"]
+
+    def test_window_expiry_returns_reads_to_replica(self, client, auth_headers, user_id, replica, monkeypatch):
+        _seed_replica_draft(replica, user_id, "Replica only")
+        client.post("/api/draft-items", json={"name": "Fresh"}, headers=auth_headers)
+
+        monkeypatch.setattr(read_routing, "window_seconds", 0)
+        drafts = client.get("/api/draft-items", headers=auth_headers).json()
+
+        assert [d["name"] for d in drafts] == ["Replica only"]
@@ -0,0 +1,84 @@
+"""
+Tests for inventory-constrained recipe matching.
+"""
+from datetime import date, timedelta
+
+from app.services.recipes import PantryItem, RecipeIndex, normalize_ingredient
+from tests.test_inventory_items import _seed_inventory
+
+TODAY = date(2024, 6, 1)
+
+CORPUS = [
+    {"id": "omelette", "title": "Omelette", "ingredients": ["Eggs", "cheese", "salt"]},
+    {"id": "caprese", "title": "Caprese", "ingredients": ["tomatoes", "mozzarella", "basil"]},
+    {"id": "stir-fry", "title": "Stir-fry", "ingredients": ["chicken breast", "rice", "onion"]},
+]
+
+
+def _item(name, days_left, category=None):
+    return PantryItem(name=name, category=category, expiry_date=TODAY + timedelta(days=days_left))
+
+
+class TestNormalization:
+
+    def test_plural_case_and_punctuation(self):
+        assert normalize_ingredient("Tomatoes") == "tomato"
+        assert normalize_ingredient("Free-range EGGS (12)") == "free range egg"
+        assert normalize_ingredient("Berries") == "berry"
+
+    def test_staples_are_not_indexed(self):
+        index = RecipeIndex.from_records(CORPUS)
+
+        assert index.recipes[0].ingredients == ("egg", "cheese")
+
+
+class TestScoring:
+
+    def test_reports_used_and_missing_ingredients(self):
+        index = RecipeIndex.from_records(CORPUS)
+
+        [match] = index.suggest([_item("Cherry tomatoes", 20)], TODAY)
+
+        assert match.recipe_id == "caprese"
+        assert match.used_ingredients == ["tomato"]
+        assert match.missing_ingredients == ["mozzarella", "basil"]
+
+    def test_multi_word_ingredients_match_item_names(self):
+        index = RecipeIndex.from_records(CORPUS)
+
+        [match] = index.suggest([_item("Organic chicken breast fillets", 20)], TODAY)
+
+        assert match.recipe_id == "stir-fry"
+
+    def test_soon_expiring_items_rank_first(self):
+        index = RecipeIndex.from_records(CORPUS)
+        items = [_item("Eggs", 30), _item("Tomatoes", 0)]
+
+        matches = index.suggest(items, TODAY)
+
+        assert [m.recipe_id for m in matches] == ["caprese", "omelette"]
+
+    def test_expired_items_are_ignored(self):
+        index = RecipeIndex.from_records(CORPUS)
+
+        assert index.suggest([_item("Eggs", -1)], TODAY) == []
+
+    def test_limit(self):
+        index = RecipeIndex.from_records(CORPUS)
+        items = [_item("Eggs", 1), _item("Tomatoes", 2), _item("Rice", 3)]
+
+        assert len(index.suggest(items, TODAY, limit=2)) == 2
+
+
+class TestSuggestionsEndpoint:
+
+    def test_uses_bundled_corpus(self, client, auth_headers, user_id):
+        _seed_inventory(user_id, 1, name="Eggs", category="dairy")
+        _seed_inventory(user_id, 1, name="Cheddar cheese", category="dairy")
+
+        response = client.get("/api/recipes/suggestions", params={"limit": 3}, headers=auth_headers)
+
+        assert response.status_code == 200
+        top = response.json()[0]
+        assert top["recipe_id"] == "omelette"
+        assert set(top["used_ingredients"]) == {"egg", "cheese"}
@@ -0,0 +1,153 @@
+"""
+Tests for external shelf-life rule files and their hot reload.
+"""
+import json
+import os
+from dataclasses import replace
+from datetime import date
+
+import pytest
+
+from app.core import auth
+from app.routers import expiry_prediction as expiry_router
+from app.services.expiry_prediction import ExpiryPredictionService
+from app.services.expiry_prediction.rules_file import (
+    RuleFileError,
+    RulesReloader,
+    export_builtin_rules,
+    load_rules_file,
+    parse_rules
+)
+
+ADMIN_TOKEN = "s3cret"
+
+
+def _write(path, data, mtime_ns=None):
+    path.write_text(json.dumps(data))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _with_dairy_days(days):
+    data = export_builtin_rules()
+    data["rules"]["dairy"]["fridge"]["days"] = days
+    return data
+
+
+@pytest.fixture
+def service(tmp_path):
+    return ExpiryPredictionService(model_path=tmp_path / "missing.npy")
+
+
+@pytest.fixture
+def rules_path(tmp_path):
+    path = tmp_path / "rules.json"
+    _write(path, _with_dairy_days(12), mtime_ns=1_000_000_000)
+    return path
+
+
+class TestParseRules:
+
+    def test_builtin_export_round_trips(self, service):
+        rules = parse_rules(export_builtin_rules())
+
+        builtin = service.rule_based.rules
+        assert rules.cells == builtin.cells
+        assert rules.resolve("Refrigerator milk", "Refrigerator") == builtin.resolve("Refrigerator milk", "Refrigerator")
+
+    @pytest.mark.parametrize("mutate, message", [
+        (lambda d: d.pop("version"), "missing 'version'"),
+        (lambda d: d["rules"]["dairy"].update(fridge={"days": -1, "confidence": 0.5}), "rules.dairy.fridge"),
+        (lambda d: d["rules"]["dairy"].update(fridge={"days": 7, "confidence": 1.5}), "confidence"),
+        (lambda d: d["rules"]["dairy"].update(cellar={"days": 7, "confidence": 0.5}), "no storage_defaults"),
+        (lambda d: d.update(category_aliases={"sweets": ["candy"]}), "sweets"),
+        (lambda d: d.update(default=[7, 0.3]), "default"),
+    ])
+    def test_rejects_invalid_files(self, mutate, message):
+        data = export_builtin_rules()
+        mutate(data)
+
+        with pytest.raises(RuleFileError, match=message):
+            parse_rules(data)
+
+    def test_version_includes_content_digest(self, tmp_path):
+        first, second = tmp_path / "a.json", tmp_path / "b.json"
+        _write(first, _with_dairy_days(12))
+        _write(second, _with_dairy_days(13))
+
+        assert load_rules_file(first).version.startswith("1@")
+        assert load_rules_file(first).version != load_rules_file(second).version
+
+
+class TestRulesReloader:
+
+    def test_reload_swaps_rules_and_invalidates_cache(self, service, rules_path):
+        reloader = RulesReloader(service, str(rules_path), interval_seconds=30)
+        before = service.predict_expiry("Milk", "dairy", "fridge", date(2024, 1, 1))
+
+        assert reloader.reload() is True
+
+        after = service.predict_expiry("Milk", "dairy", "fridge", date(2024, 1, 1))
+        assert before.expiry_date == date(2024, 1, 8)
+        assert after.expiry_date == date(2024, 1, 13)
+        assert service.cache_stats()["invalidations"] == 1
+
+    def test_unchanged_file_is_not_reloaded(self, service, rules_path):
+        reloader = RulesReloader(service, str(rules_path), interval_seconds=30)
+        reloader.reload()
+        rules = service.rule_based.rules
+
+        assert reloader.reload() is False
+        assert service.rule_based.rules is rules
+
+        _write(rules_path, _with_dairy_days(20), mtime_ns=2_000_000_000)
+        assert reloader.reload() is True
+        assert service.rule_based.rules is not rules
+
+    def test_invalid_file_keeps_current_rules(self, service, rules_path):
+        reloader = RulesReloader(service, str(rules_path), interval_seconds=30)
+        reloader.reload()
+        rules = service.rule_based.rules
+
+        rules_path.write_text("{not json")
+        with pytest.raises(RuleFileError):
+            reloader.reload()
+
+        assert service.rule_based.rules is rules
+        assert reloader.snapshot()["failures"] == 1
+        assert reloader.snapshot()["version"] == rules.version
+
+
+class TestReloadEndpoint:
+
+    @pytest.fixture
+    def reloader(self, monkeypatch, service, rules_path):
+        reloader = RulesReloader(service, str(rules_path), interval_seconds=30)
+        monkeypatch.setattr(expiry_router, "rules_reloader", reloader)
+        monkeypatch.setattr(auth, "settings", replace(auth.settings, admin_token=ADMIN_TOKEN))
+        return reloader
+
+    def test_requires_admin_token(self, client, reloader):
+        for headers in ({}, {"X-Admin-Token": "wrong"}):
+            response = client.post("/api/expiry-prediction/rules/reload", headers=headers)
+            assert response.status_code == 403
+        assert reloader.reloads == 0
+
+    def test_reloads_file(self, client, reloader, service):
+        response = client.post(
+            "/api/expiry-prediction/rules/reload", headers={"X-Admin-Token": ADMIN_TOKEN}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["version"] == service.rules_version
+        assert reloader.reloads == 1
+
+    def test_rejects_invalid_file(self, client, reloader, rules_path):
+        _write(rules_path, {"version": 2})
+
+        response = client.post(
+            "/api/expiry-prediction/rules/reload", headers={"X-Admin-Token": ADMIN_TOKEN}
+        )
+
+        assert response.status_code == 422
+        assert "missing 'rules'" in response.json()["detail"]